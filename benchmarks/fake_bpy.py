@@ -0,0 +1,432 @@
+"""
+A lightweight stand-in for the parts of bpy that Tell Me Why uses, so the addon can be imported and run under plain
+CPython. Data (node trees, sockets, scenes) are simple Python objects, and UI layouts accept and discard everything
+drawn into them.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+
+class Collection(list):
+    """bpy_prop_collection stand-in: a list that can also be indexed by name"""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self:
+                if getattr(item, "name", None) == key:
+                    return item
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(getattr(item, "name", None) == key for item in self)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def keys(self):
+        return [item.name for item in self]
+
+    def items(self):
+        return [(item.name, item) for item in self]
+
+
+class PropertyCollection(Collection):
+    """A CollectionProperty stand-in that creates items with add()"""
+
+    def __init__(self, item_type, *args):
+        super().__init__(*args)
+        self.item_type = item_type
+
+    def add(self):
+        self.append(self.item_type())
+        return self[-1]
+
+    def remove(self, index):
+        del self[index]
+
+    def clear(self):
+        del self[:]
+
+
+class IDPropertyMixin:
+    """Dict-style access for custom properties"""
+
+    def _custom(self) -> dict:
+        if "_custom_props" not in self.__dict__:
+            self.__dict__["_custom_props"] = {}
+        return self.__dict__["_custom_props"]
+
+    def __getitem__(self, key):
+        return self._custom()[key]
+
+    def __setitem__(self, key, value):
+        self._custom()[key] = value
+
+    def __delitem__(self, key):
+        del self._custom()[key]
+
+    def __contains__(self, key):
+        return key in self._custom()
+
+    def get(self, key, default=None):
+        return self._custom().get(key, default)
+
+    def keys(self):
+        return self._custom().keys()
+
+    def property_unset(self, name):
+        setattr(self, name, type(getattr(self, name))())
+
+
+class Component(IDPropertyMixin):
+    def __init__(self, use_formula=False, formula="", description="", type="float"):
+        self.use_formula = use_formula
+        self.formula = formula
+        self.description = description
+        self.type = type
+        self.length = 1
+
+
+class Explanation(IDPropertyMixin):
+    def __init__(self):
+        self.active = False
+        self.description = ""
+        self.components = PropertyCollection(Component)
+        self.variables = Collection()
+        self.split_components = True
+
+
+class Socket(IDPropertyMixin):
+    def __init__(self, node, name, type="VALUE", default_value=0.0, identifier=None):
+        self.node = node
+        self.name = name
+        self.identifier = identifier or name
+        self.type = type
+        self.bl_idname = {"VALUE": "NodeSocketFloat", "INT": "NodeSocketInt", "VECTOR": "NodeSocketVector",
+                          "RGBA": "NodeSocketColor", "BOOLEAN": "NodeSocketBool"}.get(type, "NodeSocket")
+        self.default_value = default_value
+        self.enabled = True
+        self.hide_value = False
+        self.is_linked = False
+        self.tmy_explanation = Explanation()
+
+    @property
+    def id_data(self):
+        return self.node.id_data
+
+    def as_pointer(self):
+        return id(self)
+
+    def path_from_id(self, prop=None):
+        path = f'nodes["{self.node.name}"].inputs[{self.node.inputs.index(self)}]'
+        return f"{path}.{prop}" if prop else path
+
+
+class Node:
+    def __init__(self, tree, name, bl_idname="ShaderNodeMath"):
+        self.id_data = tree
+        self.name = name
+        self.label = ""
+        self.bl_idname = bl_idname
+        self.type = "MATH"
+        self.select = False
+        self.inputs = Collection()
+        self.outputs = Collection()
+        self.location = (0.0, 0.0)
+        self.node_tree = None
+
+    def add_input(self, name, type="VALUE", default_value=0.0):
+        self.inputs.append(Socket(self, name, type, default_value))
+        return self.inputs[-1]
+
+    def as_pointer(self):
+        return id(self)
+
+
+class AnimationData:
+    def __init__(self):
+        self.action = None
+        self.drivers = Collection()
+
+
+class ID(IDPropertyMixin):
+    def __init__(self, name):
+        self.name = name
+        self.library = None
+        self.override_library = None
+        self.is_embedded_data = False
+
+    def as_pointer(self):
+        return id(self)
+
+    def update_tag(self):
+        pass
+
+
+class NodeTree(ID):
+    def __init__(self, name, bl_idname="ShaderNodeTree"):
+        super().__init__(name)
+        self.bl_idname = bl_idname
+        self.nodes = Collection()
+        self.animation_data = None
+
+    @property
+    def id_data(self):
+        return self
+
+    def add_node(self, name, bl_idname="ShaderNodeMath"):
+        self.nodes.append(Node(self, name, bl_idname))
+        return self.nodes[-1]
+
+
+class TreeOwner(ID):
+    """Materials, Lights, Worlds, etc., which own an embedded node tree"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.node_tree = NodeTree(f"{name} Nodetree")
+        self.node_tree.is_embedded_data = True
+        self.use_nodes = True
+
+
+class Variable(IDPropertyMixin):
+    def __init__(self, name="var", formula="0", derived=False):
+        self.name = name
+        self.formula = formula
+        self.derived = derived
+
+
+class Render:
+    fps = 24
+    fps_base = 1.0
+
+
+class Scene(TreeOwner):
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.node_tree = None
+        self.tmy_variables = PropertyCollection(Variable)
+        self.render = Render()
+        self.frame_current = 1
+        self.frame_subframe = 0.0
+        self.frame_start = 1
+        self.frame_end = 250
+
+
+class SocketState(IDPropertyMixin):
+    def __init__(self):
+        self.edit_mode = False
+
+
+class Globals:
+    def __init__(self):
+        self.socket_states = PropertyCollection(SocketState)
+        self.show_unexplained = False
+        self.variable_selected_index = 0
+        self.variable_selected_index_prefs = 0
+        self.profile_entries = PropertyCollection(types.SimpleNamespace)
+        self.profile_selected_index = 0
+        self.search_query = ""
+        self.show_variable_uses = False
+
+
+class Preferences:
+    start_expanded = False
+    n_panel_location = "Tell Me Why"
+    formula_timeout = 5.0
+    save_results = True
+    parallel_apply_all = False
+    enable_diagnostics = False
+
+    def __init__(self):
+        self.global_variables_library = PropertyCollection(Variable)
+
+
+class Layout:
+    """A UILayout stand-in that accepts everything and counts the calls it gets"""
+    calls = 0
+
+    def __init__(self):
+        self.scale_y = 1.0
+        self.operator_context = "EXEC_DEFAULT"
+        self.enabled = True
+        self.active = True
+        self.alert = False
+
+    def _sub(self, *args, **kwargs):
+        Layout.calls += 1
+        return Layout()
+
+    row = column = box = split = column_flow = grid_flow = _sub
+
+    def operator(self, *args, **kwargs):
+        Layout.calls += 1
+        return types.SimpleNamespace()
+
+    def _draw(self, *args, **kwargs):
+        Layout.calls += 1
+
+    label = prop = menu = popover = separator = template_list = context_pointer_set = operator_menu_enum = _draw
+
+
+class Region:
+    width = 300
+
+
+class Context:
+    def __init__(self, data):
+        self.scene = data.scenes[0]
+        self.window_manager = types.SimpleNamespace(tell_me_why_globals=Globals(), windows=[])
+        self.preferences = types.SimpleNamespace(addons={})
+        self.region = Region()
+        self.active_node = None
+        self.space_data = None
+        self.area = None
+        self.view_layer = None
+
+
+class BlendData:
+    def __init__(self):
+        self.node_groups = Collection()
+        self.materials = Collection()
+        self.lights = Collection()
+        self.worlds = Collection()
+        self.linestyles = Collection()
+        self.textures = Collection()
+        self.scenes = Collection([Scene()])
+        self.actions = Collection()
+        self.libraries = Collection()
+        self.filepath = ""
+
+
+class _Struct:
+    """Base for registerable bpy.types classes"""
+    bl_rna = None
+
+    def report(self, level, message):
+        self.reports = getattr(self, "reports", []) + [(level, message)]
+
+
+class _Timers:
+    def __init__(self):
+        self.registered = set()
+
+    def register(self, fn, first_interval=0, persistent=False):
+        self.registered.add(fn)
+
+    def unregister(self, fn):
+        self.registered.discard(fn)
+
+    def is_registered(self, fn):
+        return fn in self.registered
+
+
+class _Previews(dict):
+    def load(self, name, path, kind):
+        self[name] = types.SimpleNamespace(icon_id=len(self) + 1000)
+        return self[name]
+
+
+def _prop(*args, **kwargs):
+    return None
+
+
+def install() -> types.ModuleType:
+    """Create the fake bpy module (and submodules) and put it in sys.modules"""
+    bpy = types.ModuleType("bpy")
+    bpy_types = types.ModuleType("bpy.types")
+    bpy_props = types.ModuleType("bpy.props")
+    bpy_utils = types.ModuleType("bpy.utils")
+    bpy_previews = types.ModuleType("bpy.utils.previews")
+    bpy_app = types.ModuleType("bpy.app")
+    bpy_path = types.ModuleType("bpy.path")
+    bpy_handlers = types.ModuleType("bpy.app.handlers")
+    bpy_extras = types.ModuleType("bpy_extras")
+    io_utils = types.ModuleType("bpy_extras.io_utils")
+
+    for name in ("Operator", "Panel", "PropertyGroup", "UIList", "Menu", "AddonPreferences", "NodeSocket", "Node",
+                 "NodeTree", "NodeInternal", "AnyType", "Scene", "Action", "FCurve", "Keyframe", "Context", "ID",
+                 "WindowManager", "SpaceNodeEditor", "Material", "Object", "Library", "Text"):
+        setattr(bpy_types, name, type(name, (_Struct,), {}))
+    icon_items = [types.SimpleNamespace(name=name, value=i) for i, name in enumerate(
+        ("NONE", "ADD", "CHECKMARK", "INFO", "GREASEPENCIL", "ERROR", "NODE", "X", "DECORATE_LOCKED", "SORTTIME"))]
+    bpy_types.UILayout = type("UILayout", (), {"bl_rna": types.SimpleNamespace(functions={
+        "prop": types.SimpleNamespace(parameters={"icon": types.SimpleNamespace(enum_items=icon_items)})})})
+
+    for name in ("StringProperty", "BoolProperty", "FloatProperty", "IntProperty", "EnumProperty",
+                 "CollectionProperty", "PointerProperty", "FloatVectorProperty", "IntVectorProperty"):
+        setattr(bpy_props, name, _prop)
+
+    bpy_utils.register_class = lambda cls: None
+    bpy_utils.unregister_class = lambda cls: None
+    bpy_previews.new = _Previews
+    bpy_previews.remove = lambda previews: None
+    bpy_utils.previews = bpy_previews
+
+    io_utils.ExportHelper = type("ExportHelper", (), {"filepath": ""})
+    io_utils.ImportHelper = type("ImportHelper", (), {"filepath": ""})
+    bpy_extras.io_utils = io_utils
+
+    bpy_handlers.persistent = lambda fn: fn
+    for name in ("frame_change_post", "load_post", "save_pre", "save_post", "undo_post", "redo_post",
+                 "depsgraph_update_post"):
+        setattr(bpy_handlers, name, [])
+    bpy_app.handlers = bpy_handlers
+    bpy_app.timers = _Timers()
+    bpy_app.version = (3, 4, 0)
+
+    bpy_path.abspath = lambda path, start=None, library=None: path
+
+    bpy.types = bpy_types
+    bpy.path = bpy_path
+    bpy.props = bpy_props
+    bpy.utils = bpy_utils
+    bpy.app = bpy_app
+    bpy.ops = types.SimpleNamespace()
+    bpy.data = BlendData()
+    bpy.context = Context(bpy.data)
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.types": bpy_types,
+        "bpy.props": bpy_props,
+        "bpy.utils": bpy_utils,
+        "bpy.utils.previews": bpy_previews,
+        "bpy.app": bpy_app,
+        "bpy.path": bpy_path,
+        "bpy.app.handlers": bpy_handlers,
+        "bpy_extras": bpy_extras,
+        "bpy_extras.io_utils": io_utils,
+    })
+    return bpy
+
+
+def reset_data(bpy: types.ModuleType) -> None:
+    """Start over with an empty file, keeping the preferences"""
+    preferences = bpy.context.preferences
+    bpy.data = BlendData()
+    bpy.context = Context(bpy.data)
+    bpy.context.preferences = preferences
+
+
+def load_addon(bpy: types.ModuleType, package: str = "tell_me_why") -> types.ModuleType:
+    """Import the addon from src/ as the given package name, and set up its preferences and icons"""
+    import importlib.util
+
+    src = Path(__file__).parents[1] / "src"
+    spec = importlib.util.spec_from_file_location(package, src / "__init__.py", submodule_search_locations=[str(src)])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[package] = addon
+    spec.loader.exec_module(addon)
+
+    bpy.context.preferences.addons[package] = types.SimpleNamespace(preferences=Preferences())
+    sys.modules[f"{package}.lib.icons"].register_icons()
+    return addon
@@ -0,0 +1,201 @@
+"""
+Benchmarks Tell Me Why under plain CPython, with a stub bpy and synthetic files.
+
+    python benchmarks/run.py --trees 20 --sockets 50 --variables 30 --output bench_output.json
+
+Measures formula evaluation throughput (cold and warm cache), Apply All latency, N-panel draw cost, and memory, and
+writes the results as JSON so runs can be compared.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fake_bpy  # noqa: E402
+import synthetic  # noqa: E402
+
+PACKAGE = "tell_me_why"
+
+
+def _timed(fn, repeat: int) -> dict:
+    """Run fn repeat times and summarise the wall-clock durations in seconds"""
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "max": max(durations),
+        "repeat": repeat,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_eval(modules, formulas: list[str], repeat: int) -> dict:
+    formula_lib = modules["lib.formula"]
+
+    def evaluate():
+        for formula in formulas:
+            formula_lib.eval_formula(formula)
+
+    def cold():
+        formula_lib.reset_variable_cache()
+        evaluate()
+
+    results = {"cold": _timed(cold, repeat), "warm": _timed(evaluate, repeat)}
+    for result in results.values():
+        result["formulas_per_second"] = len(formulas) / result["median"] if result["median"] else None
+    return results
+
+
+def _apply_all_operator(explanation_op):
+    # The stub doesn't fill in operator property defaults
+    op = explanation_op.ApplyAllFormulas()
+    op.scope = "FILE"
+    return op
+
+
+def bench_apply_all(bpy, modules, repeat: int) -> dict:
+    explanation_op = modules["operator.explanation"]
+    formula_lib = modules["lib.formula"]
+
+    def apply_all(cold: bool):
+        if cold:
+            formula_lib.reset_variable_cache()
+        _apply_all_operator(explanation_op).execute(bpy.context)
+
+    return {
+        "cold": _timed(lambda: apply_all(True), repeat),
+        "warm": _timed(lambda: apply_all(False), repeat),
+    }
+
+
+def bench_draw(bpy, modules, nodes: list, repeat: int) -> dict:
+    n_panel = modules["panel.n_panel"]
+    panel = n_panel.NODE_PT_TellMeWhy()
+
+    def draw_all():
+        for node in nodes:
+            node.select = True
+            bpy.context.active_node = node
+            panel.layout = fake_bpy.Layout()
+            panel.draw(bpy.context)
+
+    fake_bpy.Layout.calls = 0
+    result = _timed(draw_all, repeat)
+    result["nodes"] = len(nodes)
+    result["per_node_ms"] = result["median"] / len(nodes) * 1000 if nodes else None
+    result["layout_calls_per_node"] = fake_bpy.Layout.calls / repeat / len(nodes) if nodes else None
+    return result
+
+
+def bench_memory(bpy, modules, spec: synthetic.Spec) -> dict:
+    """Memory held by the synthetic file, and the extra held and peaked by evaluating it"""
+    formula_lib = modules["lib.formula"]
+    explanation_op = modules["operator.explanation"]
+
+    fake_bpy.reset_data(bpy)
+    formula_lib.reset_variable_cache()
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    synthetic.populate(bpy, spec)
+    data, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    _apply_all_operator(explanation_op).execute(bpy.context)
+    evaluated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "data_bytes": data - base,
+        "cache_bytes": evaluated - data,
+        "apply_all_peak_bytes": peak - data,
+    }
+
+
+def run(spec: synthetic.Spec, repeat: int, instrument: bool = False) -> dict:
+    bpy = fake_bpy.install()
+    # Keep the addon's own logging out of the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        fake_bpy.load_addon(bpy, PACKAGE)
+    modules = {name[len(PACKAGE) + 1:]: module for name, module in sys.modules.items()
+               if name.startswith(f"{PACKAGE}.")}
+
+    modules["core.instrument"].set_enabled(instrument)
+
+    nodes = synthetic.populate(bpy, spec)
+    formulas = [c.formula for node in nodes for s in node.inputs for c in s.tmy_explanation.components
+                if c.use_formula]
+
+    results = {
+        "eval": bench_eval(modules, formulas, repeat),
+        "apply_all": bench_apply_all(bpy, modules, repeat),
+        "draw": bench_draw(bpy, modules, nodes, repeat),
+    }
+    modules["lib.async_eval"].shutdown()
+    if instrument:
+        # Memory is measured without timing, since counters would skew it
+        results["instrument"] = modules["core.instrument"].snapshot()
+        modules["core.instrument"].set_enabled(False)
+    results["memory"] = bench_memory(bpy, modules, spec)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "spec": {
+            "trees": spec.trees,
+            "sockets_per_tree": spec.sockets,
+            "variables": spec.variables,
+            "seed": spec.seed,
+            "formulas": len(formulas),
+            "unique_formulas": len(set(formulas)),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--trees", type=int, default=20, help="Number of node trees")
+    parser.add_argument("-m", "--sockets", type=int, default=50, help="Annotated sockets per node tree")
+    parser.add_argument("-v", "--variables", type=int, default=30, help="Number of Scene variables")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for the synthetic file")
+    parser.add_argument("-i", "--instrument", action="store_true",
+                        help="Collect the addon's diagnostics timers and counters and include them in the output")
+    parser.add_argument("-o", "--output", type=Path, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(synthetic.Spec(args.trees, args.sockets, args.variables, args.seed), args.repeat, args.instrument)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
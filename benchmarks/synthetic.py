@@ -0,0 +1,86 @@
+"""
+Generates synthetic files for the benchmarks: node trees full of annotated sockets, and a set of Scene variables for
+their formulas to use.
+"""
+
+import random
+from dataclasses import dataclass
+
+# (socket type, default value, number of components)
+SOCKET_KINDS = (
+    ("VALUE", 0.0, 1),
+    ("INT", 0, 1),
+    ("VECTOR", (0.0, 0.0, 0.0), 3),
+    ("RGBA", (0.0, 0.0, 0.0, 1.0), 4),
+)
+
+FORMULA_TEMPLATES = (
+    "{var} * {k}",
+    "{var} + {k} / 2",
+    "sin({var}) * {k}",
+    "sqrt(abs({var})) + {k}",
+    "max({var}, {k}) - min({var}, {k})",
+    "round({var} * {k}, 2)",
+    "{var} ** 2 / ({k} + 1)",
+    "pi * {k} + {var}",
+)
+
+SOCKETS_PER_NODE = 4
+
+
+@dataclass(frozen=True)
+class Spec:
+    trees: int
+    sockets: int
+    variables: int
+    seed: int = 0
+
+    @property
+    def formula_count(self) -> int:
+        return self.trees * self.sockets
+
+
+def _formula(rng: random.Random, variables: int) -> str:
+    var = f"var{rng.randrange(variables)}" if variables else str(rng.randrange(10))
+    return rng.choice(FORMULA_TEMPLATES).format(var=var, k=rng.randrange(1, 100))
+
+
+def populate(bpy, spec: Spec) -> list:
+    """Fill bpy.data with spec.trees node trees (half node groups, half materials), each with spec.sockets annotated
+    sockets, and give the Scene spec.variables variables. Returns the annotated nodes."""
+    import fake_bpy
+
+    rng = random.Random(spec.seed)
+    scene = bpy.data.scenes[0]
+    for v in range(spec.variables):
+        variable = scene.tmy_variables.add()
+        variable.name = f"var{v}"
+        variable.formula = f"{rng.uniform(-10, 10):.3f}"
+
+    nodes = []
+    for t in range(spec.trees):
+        if t % 2:
+            owner = fake_bpy.TreeOwner(f"Material.{t:04}")
+            bpy.data.materials.append(owner)
+            tree = owner.node_tree
+        else:
+            tree = fake_bpy.NodeTree(f"NodeGroup.{t:04}")
+            bpy.data.node_groups.append(tree)
+
+        for s in range(spec.sockets):
+            if s % SOCKETS_PER_NODE == 0:
+                node = tree.add_node(f"Math.{s // SOCKETS_PER_NODE:04}")
+                nodes.append(node)
+            kind, default, length = SOCKET_KINDS[rng.randrange(len(SOCKET_KINDS))]
+            socket = node.add_input(f"Input_{s % SOCKETS_PER_NODE}", kind,
+                                    list(default) if length > 1 else default)
+            explanation = socket.tmy_explanation
+            explanation.active = True
+            explanation.description = f"Synthetic {kind.lower()} input {s} of {tree.name}"
+            explanation.split_components = length > 1 and rng.random() < 0.5
+            for c in range(length):
+                component = explanation.components.add()
+                component.type = "int" if kind == "INT" else "float"
+                component.use_formula = c == 0 or explanation.split_components
+                component.formula = _formula(rng, spec.variables) if component.use_formula else ""
+    return nodes
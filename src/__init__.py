@@ -2,18 +2,27 @@ from typing import Callable
 
 import bpy
 
-from .lib import addon, icons as icons_lib
-from .operator import explanation, variable as variable_operators
-from .panel import preferences as preferences_panel, n_panel, variables as variables_panel, ul_variables
+from .lib import addon, icons as icons_lib, async_eval as async_eval_lib, stale_check as stale_check_lib
+from .operator import explanation, variable as variable_operators, bake as bake_operators, driver as driver_operators, \
+    diagnostics as diagnostics_operators, profile as profile_operators, navigate as navigate_operators, \
+    search as search_operators, export as export_operators, bulk_import as bulk_import_operators, \
+    clipboard as clipboard_operators
+from .panel import preferences as preferences_panel, n_panel, variables as variables_panel, ul_variables, \
+    diagnostics as diagnostics_panel, profile as profile_panel, ul_profile, search as search_panel
 from .props import wm_props, explanation as explanation_props, variable as variable_props
 from .header import node_editor
+from .handler import frame_change, tree_changes, saved_results as saved_results_handler
 
 if "_LOADED" in locals():
     import importlib
 
     for mod in (
             wm_props, addon, explanation, variable_operators, variable_props, n_panel, variables_panel,
-            explanation_props, ul_variables, preferences_panel, node_editor):
+            explanation_props, ul_variables, preferences_panel, node_editor, bake_operators, frame_change,
+            driver_operators, async_eval_lib, diagnostics_operators, diagnostics_panel, profile_operators,
+            profile_panel, ul_profile, navigate_operators, search_operators, search_panel, tree_changes,
+            export_operators, bulk_import_operators, clipboard_operators, stale_check_lib,
+            saved_results_handler):
         importlib.reload(mod)
 
 _LOADED = True
@@ -36,6 +45,12 @@ bl_info = {
 
 menus: list[tuple[str, Callable]] = [
     ("TOPBAR_MT_file", addon.menuitem(explanation.ApplyAllFormulas)),
+    ("TOPBAR_MT_file", addon.menuitem(bake_operators.BakeFormulasToKeyframes, "INVOKE_DEFAULT")),
+    ("TOPBAR_MT_file", addon.menuitem(driver_operators.ConvertFormulasToDrivers)),
+    ("TOPBAR_MT_file_export", addon.menuitem(export_operators.ExportAnnotations, "INVOKE_DEFAULT",
+                                             "Tell Me Why Annotations (.jsonl/.csv/.md)")),
+    ("TOPBAR_MT_file_import", addon.menuitem(bulk_import_operators.ImportAnnotations, "INVOKE_DEFAULT",
+                                             "Tell Me Why Annotations (.json/.jsonl)")),
     ("NODE_HT_header", node_editor.annotations_indicator)
 ]
 
@@ -43,17 +58,34 @@ menus: list[tuple[str, Callable]] = [
 registerable_modules = [
     variable_props,
     ul_variables,
+    ul_profile,
     # preferences_panel MUST be registered before n_panel
     preferences_panel,
     wm_props,
     explanation_props,
     explanation,
     variable_operators,
+    bake_operators,
+    driver_operators,
+    diagnostics_operators,
+    profile_operators,
+    navigate_operators,
+    search_operators,
+    export_operators,
+    bulk_import_operators,
+    clipboard_operators,
     n_panel,
+    # Sub-panels MUST be registered after their parent panels
+    search_panel,
+    profile_panel,
+    diagnostics_panel,
     variables_panel
 ]
 
-registerable_handler_modules = []
+registerable_handler_modules = [frame_change, tree_changes, saved_results_handler]
+
+# Modules with REGISTER_FUNCTIONS or UNREGISTER_FUNCTIONS lists of functions to call on register/unregister
+registerable_function_modules = [async_eval_lib, stale_check_lib, diagnostics_panel]
 
 def register() -> None:
     icons_lib.register_icons()
@@ -87,10 +119,18 @@ def register() -> None:
         PropDefClass = prop_def[0]
         setattr(bpy.types.WindowManager, prop_name, PropDefClass(**prop_def[1]))
 
+    for m in registerable_function_modules:
+        for f in getattr(m, "REGISTER_FUNCTIONS", []):
+            f()
+
     addon.register_menus(menus)
 
 
 def unregister() -> None:
+    for m in registerable_function_modules[::-1]:
+        for f in getattr(m, "UNREGISTER_FUNCTIONS", []):
+            f()
+
     for prop_name, prop_def in wm_props.WM_PROPS.items():
         delattr(bpy.types.WindowManager, prop_name)
 
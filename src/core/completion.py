@@ -0,0 +1,116 @@
+from collections.abc import Iterable, Sequence
+
+"""
+Name lookups for formula autocompletion: a prefix trie of the names formulas can use (functions, built-in names, and
+variables), for completing names as they're typed and for suggesting close matches for unknown names. This must not
+import bpy.
+"""
+
+# Key in a trie node holding the name that ends there. Other keys are single characters, so it can't clash with them.
+_END = ""
+
+
+class NameTrie:
+    """A prefix trie of names. Lookups cost about as much as the length of the name (and the number of results), not
+    the number of names, so they stay quick with thousands of variables."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        # char: child node, and _END: name
+        self._root: dict[str, dict | str] = {}
+        self._count = 0
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            node[_END] = name
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, name: str) -> bool:
+        node = self._find(name)
+        return node is not None and _END in node
+
+    def _find(self, prefix: str) -> dict | None:
+        node = self._root
+        for char in prefix:
+            if (node := node.get(char, None)) is None:
+                return None
+        return node
+
+    def with_prefix(self, prefix: str, limit: int = None) -> list[str]:
+        """Names starting with prefix (including prefix itself, if it's a name), in alphabetical order. Only the
+        first limit names are looked at, if given."""
+        names = []
+        if (node := self._find(prefix)) is None:
+            return names
+        # Children are pushed in reverse, so they're popped in order
+        nodes = [node]
+        while nodes and (limit is None or len(names) < limit):
+            node = nodes.pop()
+            if _END in node:
+                names.append(node[_END])
+            nodes.extend(node[char] for char in sorted(node, reverse=True) if char != _END)
+        return names
+
+    def close_matches(self, word: str, max_distance: int = 2, limit: int = 3) -> list[str]:
+        """Names within max_distance edits (insertions, deletions, or substitutions) of word, closest first, e.g., to
+        suggest what an unknown name was meant to be. Branches of the trie that are already too far from word are
+        skipped, so this doesn't compare word with every name."""
+        matches: list[tuple[int, str]] = []
+        too_far = max_distance + 1
+        # Each node's row holds the edit distances between the node's prefix and each prefix of word. Only prefixes of
+        # word within max_distance of the node's length can be close enough, so the rest are left at too_far.
+        first = [min(column, too_far) for column in range(len(word) + 1)]
+        nodes: list[tuple[dict, int, list[int]]] = [(self._root, 0, first)]
+        while nodes:
+            node, depth, previous = nodes.pop()
+            if _END in node and previous[-1] <= max_distance:
+                matches.append((previous[-1], node[_END]))
+            depth += 1
+            start, end = max(1, depth - max_distance), min(len(word), depth + max_distance)
+            for char, child in node.items():
+                if char == _END:
+                    continue
+                row = [too_far] * (len(word) + 1)
+                row[0] = min(depth, too_far)
+                for column in range(start, end + 1):
+                    row[column] = min(row[column - 1] + 1, previous[column] + 1,
+                                      previous[column - 1] + (word[column - 1] != char), too_far)
+                if min(row[start - 1:end + 1]) <= max_distance:
+                    nodes.append((child, depth, row))
+        return [name for _, name in sorted(matches)[:limit]]
+
+
+def did_you_mean(word: str, trie: NameTrie) -> str:
+    """A suggestion to add to an error message about an unknown name, e.g., "Did you mean "sqrt"?", or "" if nothing
+    is close"""
+    # Allow fewer edits for short words, which would otherwise be close to most short names
+    matches = trie.close_matches(word, max_distance=1 if len(word) < 6 else 2)
+    # Names differing only in case are the likeliest
+    matches.sort(key=lambda name: name.lower() != word.lower())
+    if not matches:
+        return ""
+    quoted = [f"\"{name}\"" for name in matches]
+    options = f"{', '.join(quoted[:-1])} or {quoted[-1]}" if len(quoted) > 1 else quoted[0]
+    return f"Did you mean {options}?"
+
+
+class TrieCache:
+    """Keeps a NameTrie of a set of names, and rebuilds it only when the names change"""
+
+    def __init__(self):
+        self._names: tuple[str, ...] | None = None
+        self._trie = NameTrie()
+
+    def get(self, names: Sequence[str]) -> NameTrie:
+        names = tuple(names)
+        if names != self._names:
+            self._names = names
+            self._trie = NameTrie(names)
+        return self._trie
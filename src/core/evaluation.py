@@ -0,0 +1,197 @@
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+
+from . import formula as formula_core, socket_types, util
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (formula_core, socket_types, util):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Evaluation of a socket's formulas against its current value, on plain data. This must not import bpy. See
+lib/evaluation for building these from sockets.
+"""
+
+# (formula, expect_len, extend_to_expected, expect_number) -> result
+EvalFormula = Callable[..., tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class Component:
+    """The parts of a ComponentValueExplanation needed to evaluate it"""
+    use_formula: bool = False
+    formula: str = ""
+
+
+class ValueErrorException(Exception):
+    pass
+
+
+class Evaluation:
+    _values: tuple = tuple()
+    _results: tuple[float, ...] = tuple()
+    _formulas: tuple[str, ...] = tuple()
+    _matches: tuple[bool, ...] = tuple()
+    _errors: tuple[bool, ...] = tuple()
+    _pending: tuple[bool, ...] = tuple()
+    # result index: error message, for results with errors
+    _error_messages: dict[int, str] = None
+    _split_components: bool = False
+    _eval_formula: EvalFormula = None
+    # Relative tolerance when comparing values with results (see core/socket_types)
+    tolerance: float = socket_types.FLOAT_PRECISION
+
+    def __init__(self, values: tuple, components: Sequence[Component], split_components: bool,
+                 variables: formula_core.Variables = None, eval_formula: EvalFormula = None,
+                 tolerance: float = socket_types.FLOAT_PRECISION):
+        """Evaluate the components' formulas against the current values. Formulas are evaluated with the variables, or
+        by eval_formula(formula, expect_len, extend_to_expected, expect_number) if given, which may raise
+        FormulaPendingException to mark the results as pending."""
+        self.tolerance = tolerance
+        self._values = values
+        self._split_components = split_components
+        self._error_messages = {}
+        self._eval_formula = eval_formula or (
+            lambda formula, expect_len, extend_to_expected, expect_number: formula_core.eval_formula(
+                formula, variables, expect_len, extend_to_expected, expect_number=expect_number))
+
+        if not self._split_components:
+            if not components[0].use_formula:
+                self._results = self._values
+                self._formulas = ("",) * len(self._values)
+                self._matches = (True,) * len(self._values)
+                self._errors = (False,)
+                self._pending = (False,)
+                return
+
+            self._formulas = (components[0].formula,)
+            self._process_results(
+                components[0].formula,
+                len(self._values),
+                True
+            )
+            self._process_matches()
+            return
+
+        for c_idx, component in enumerate(components):
+            if not component.use_formula:
+                self._formulas += (self._values[c_idx],)
+                self._results += (self._values[c_idx],)
+                self._matches += (True,)
+                self._errors += (False,)
+                self._pending += (False,)
+                continue
+            self._process_results(
+                component.formula,
+                expect_len=1,
+                extend_to_expected=(not self._split_components)
+            )
+
+        self._process_matches()
+
+    def _process_results(self, formula, expect_len: int, extend_to_expected: bool):
+        """Evaluate the formula and store the results or the error state"""
+        self._formulas += (formula,)
+        start = len(self._results)
+
+        if formula == "":
+            self._results += (0.0,) * expect_len
+            self._errors += (True,) * expect_len
+            self._pending += (False,) * expect_len
+            self._error_messages |= dict.fromkeys(range(start, start + expect_len), "Missing formula")
+            return
+
+        # Formulas for number values mustn't give text, which is checked before they're evaluated
+        values = self._values[start:start + expect_len]
+        try:
+            result = self._eval_formula(
+                formula,
+                expect_len=expect_len,
+                extend_to_expected=extend_to_expected,
+                expect_number=not any(type(value) is str for value in values)
+            )
+            self._results += result
+            self._errors += (False,) * expect_len
+            self._pending += (False,) * expect_len
+        except formula_core.FormulaPendingException:
+            self._results += (0.0,) * expect_len
+            self._errors += (False,) * expect_len
+            self._pending += (True,) * expect_len
+        except formula_core.FormulaExecutionException as e:
+            self._results += (0.0,) * expect_len
+            self._errors += (True,) * expect_len
+            self._pending += (False,) * expect_len
+            self._error_messages |= dict.fromkeys(range(start, start + expect_len), str(e))
+
+    def _process_matches(self):
+        # Pending results are unknown, so they count as matching rather than prompting to apply a placeholder
+        comparison = [self._pending[idx] or util.compare_scalars(value, self._results[idx], self.tolerance)
+                      for idx, value in enumerate(self._values)]
+        self._matches = tuple(comparison)
+
+    def get_results(self) -> tuple[float]:
+        if self.has_errors():
+            raise ValueErrorException("Evaluation failed and results are invalid")
+        if self.has_pending():
+            raise ValueErrorException("Evaluation is still in progress")
+        return self._results
+
+    def is_index_matching(self, index: int, force_split_components: bool = False):
+        # If we have a single input (un-split components) we need to compare the whole result,
+        # not just the 0th index.
+
+        if index == 0 and not (self._split_components or force_split_components):
+            return self.is_matching()
+
+        # If we do have split components, or we've forced the matter, compare only the indexed value
+        return self._matches[index]
+
+    def is_matching(self):
+        return False not in self._matches
+
+    def is_error(self, index):
+        return self._errors[index]
+
+    def has_errors(self):
+        return True in self._errors
+
+    def error_message(self, index) -> str | None:
+        """Why the result failed, if it did"""
+        return self._error_messages.get(index, None)
+
+    def is_pending(self, index):
+        return self._pending[index]
+
+    def has_pending(self):
+        return True in self._pending
+
+    def component_result(self, index: int) -> tuple:
+        """The result for a component, which is the whole result if components aren't split"""
+        return self._results[index:index + 1] if self._split_components else self._results
+
+    def get_values(self) -> tuple:
+        """The values the results were compared with"""
+        return self._values
+
+    def get_formulas(self) -> tuple[str, ...]:
+        return self._formulas
+
+    def apply_result(self, current_value: float | Iterable[float], index: int = 0,
+                     force_split_components: bool = False) -> float | tuple[float]:
+        """Combine the given result index with the given one and return the results, considering split components and
+        scalar/list values"""
+        results = self.get_results()
+
+        # It's a safe assumption that a single-item result indicates a scalar
+        if len(results) == 1:
+            return results[0]
+
+        if index != 0 or self._split_components or force_split_components:
+            current_value: list[float] = list(current_value)
+            current_value[index] = results[index]
+            return tuple(current_value)
+
+        return results
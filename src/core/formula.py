@@ -0,0 +1,596 @@
+import ast
+import builtins
+import hashlib
+import itertools
+import math
+import time
+from collections.abc import Iterable, Mapping, Sequence
+
+from . import completion, shape as shape_core, subexpression, vector, util, instrument
+from ..vendor.simpleeval import EvalWithCompoundTypes
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (completion, shape_core, subexpression, vector, util, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+The formula engine. This works on plain data (formula text and a mapping of variable values) and must not import bpy,
+so it can be run and benchmarked outside Blender and used in worker processes. See lib/formula for the Blender side.
+"""
+
+Variables = Mapping[str, int | float | Sequence[float]]
+
+# formula text: formula result
+_formula_cache: dict[str, str] = {}
+# name: formula text
+_variable_formula_cache: dict[str, str] = {}
+# formula text: formula result
+_variable_eval_cache: dict[str, tuple[float, ...]] = {}
+# formula text: error message, so failing variables don't invalidate the formula cache every time they are evaluated
+_variable_error_cache: dict[str, str] = {}
+# (formula text, frame): formula result, for formulas that use the time names. Oldest first, and limited to
+# FRAME_CACHE_SIZE results.
+_frame_formula_cache: dict[tuple[str, float], any] = {}
+# formula text: whether the formula uses any of the time names
+_time_dependent_cache: dict[str, bool] = {}
+# formula text: names used in the formula
+_formula_names_cache: dict[str, frozenset[str]] = {}
+# formula: whether it may block (see may_block)
+_may_block_cache: dict[str, bool] = {}
+# formula text: inferred shape of the result (None if unknown), or the reason evaluating it would fail
+_shape_cache: dict[str, shape_core.Shape | None | shape_core.ShapeException] = {}
+
+# Names formulas can use, for suggesting what unknown names were meant to be
+_name_tries = completion.TrieCache()
+
+# The (name, formula) pairs of the derived variables last evaluated, and the variables version they were evaluated at
+_derived_key: tuple[tuple[str, str], ...] = ()
+_derived_version: int = -1
+# name: value, and name: error message, of the derived variables last evaluated
+_derived_values: dict[str, float | tuple[float, ...]] = {}
+_derived_errors: dict[str, str] = {}
+
+# Names that change with the current frame. These are set by the frame change handler via set_time.
+TIME_NAMES = ("frame", "fps", "time")
+
+# Most per-frame results to keep, so playing back long animations doesn't keep every frame's results forever
+FRAME_CACHE_SIZE = 50000
+
+_time_names: dict[str, float] = {"frame": 0, "fps": 24.0, "time": 0.0}
+
+# Incremented whenever variables change and cached results become invalid
+_variables_version: int = 0
+
+
+class FormulaExecutionException(Exception):
+    pass
+
+
+class FormulaTimeoutException(FormulaExecutionException):
+    pass
+
+
+class FormulaShapeException(FormulaExecutionException):
+    """The formula would certainly fail, or give the wrong kind or number of values, which was found without
+    evaluating it"""
+    pass
+
+
+class FormulaPendingException(Exception):
+    """The formula is being evaluated elsewhere (e.g., in the background) and has no result yet"""
+    pass
+
+
+class _BudgetedEval(EvalWithCompoundTypes):
+    """An evaluator that gives up once a deadline has passed. The deadline is checked on every node, so it stops
+    partway through long comprehensions, but long-running function calls must finish before it can stop."""
+    deadline: float = math.inf
+
+    def _eval(self, node):
+        if time.perf_counter() > self.deadline:
+            raise FormulaTimeoutException("Formula took too long to evaluate")
+        return super()._eval(node)
+
+
+def default_allowed() -> dict[str, any]:
+    allowed = {
+        "names": {
+            "eulers": math.e,
+            "infinity": math.inf,
+            "nan": math.nan,
+            "pi": math.pi,
+            "tau": math.tau,
+        } | _time_names,
+        "functions": {},
+    }
+    # Math methods from the "math" module
+    math_methods = ("acos", "acosh", "asin", "asinh", "atan", "atan2", "atanh", "ceil", "comb", "copysign", "cos",
+                    "cosh", "degrees", "dist", "erf", "erfc", "exp", "expm1", "fabs", "factorial", "floor", "fmod",
+                    "frexp", "fsum", "gamma", "gcd", "hypot", "inf", "isclose", "isfinite", "isinf", "isnan", "isqrt",
+                    "lcm", "ldexp", "lgamma", "log", "log10", "log1p", "log2", "modf", "nan", "nextafter", "perm", "pi",
+                    "pow", "prod", "radians", "remainder", "sin", "sinh", "sqrt", "tan", "tanh", "tau", "trunc", "ulp")
+    allowed["functions"] |= {(name, getattr(math, name)) for name in math_methods}
+
+    # Math methods from the builtin namespace
+    builtin_methods = ("abs", "divmod", "max", "min", "pow", "range", "round", "sum")
+    allowed["functions"] |= {(name, getattr(builtins, name)) for name in builtin_methods}
+
+    # Vector functions, such as dot and lerp
+    allowed["functions"] |= vector.FUNCTIONS
+
+    return allowed
+
+
+def set_time(frame: float, fps: float) -> None:
+    """Set the values of the frame, fps, and time names used by formulas"""
+    global _frame_formula_cache
+    # Cached per-frame results are only valid for the frame rate they were evaluated at
+    if fps != _time_names["fps"]:
+        instrument.count("frame_formula_cache", "eviction", len(_frame_formula_cache))
+        _frame_formula_cache = {}
+    _time_names["frame"] = frame
+    _time_names["fps"] = fps
+    _time_names["time"] = frame / fps if fps else 0.0
+
+
+def is_time_dependent(formula: str) -> bool:
+    """Whether the formula uses the frame, fps, or time names, and must be re-evaluated when the frame changes"""
+    if (dependent := _time_dependent_cache.get(formula, None)) is not None:
+        return dependent
+    try:
+        dependent = any(isinstance(node, ast.Name) and node.id in TIME_NAMES for node in ast.walk(ast.parse(formula)))
+    except SyntaxError:
+        dependent = False
+    _time_dependent_cache[formula] = dependent
+    return dependent
+
+
+def formula_names(formula: str) -> frozenset[str]:
+    """Every name the formula uses (e.g., variables and functions)"""
+    if (names := _formula_names_cache.get(formula, None)) is not None:
+        return names
+    try:
+        names = frozenset(node.id for node in ast.walk(ast.parse(formula.strip())) if isinstance(node, ast.Name))
+    except SyntaxError:
+        names = frozenset()
+    _formula_names_cache[formula] = names
+    return names
+
+
+# Functions that can run for a long time in a single call if given large numbers (e.g., factorial(10**6)), which a
+# budget can't interrupt. They're quick if every argument is a small constant.
+BLOCKING_FUNCTIONS = frozenset(("comb", "factorial", "perm", "range"))
+# Largest constant argument to a blocking function, or exponent, that can't take long, e.g., range(100) or x**2
+MAX_QUICK_ARGUMENT = 1000
+
+
+def _is_small_constant(node: ast.AST) -> bool:
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        node = node.operand
+    return isinstance(node, ast.Constant) and type(node.value) in (int, float, bool) \
+        and abs(node.value) <= MAX_QUICK_ARGUMENT
+
+
+def _may_be_huge_exponent(node: ast.AST) -> bool:
+    """Whether a power's exponent may be large enough to make a huge integer: if it has a large constant, or another
+    power, in it"""
+    return any(
+        isinstance(child, ast.Constant) and type(child.value) in (int, float) and abs(child.value) > MAX_QUICK_ARGUMENT
+        or isinstance(child, ast.BinOp) and isinstance(child.op, ast.Pow)
+        or isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id == "pow"
+        for child in ast.walk(node))
+
+
+def _may_block_node(node: ast.AST) -> bool:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        return _may_be_huge_exponent(node.right)
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+        return False
+    if node.func.id in BLOCKING_FUNCTIONS:
+        return bool(node.keywords) or not all(_is_small_constant(arg) for arg in node.args)
+    if node.func.id == "pow" and len(node.args) >= 2:
+        return _may_be_huge_exponent(node.args[1])
+    return False
+
+
+def may_block(formula: str) -> bool:
+    """Whether the formula might spend a long time in a single function call or power, which the budget of
+    eval_uncached can't interrupt, e.g., factorial(n) or 10**10000000. These formulas should only be evaluated where
+    they can be stopped from outside, e.g., in another process. Everyday uses of these, such as pow(x, 2), x**k, or
+    sum(range(4)), are left to the budget."""
+    if (blocking := _may_block_cache.get(formula, None)) is not None:
+        return blocking
+    try:
+        blocking = any(_may_block_node(node) for node in ast.walk(ast.parse(formula.strip())))
+    except SyntaxError:
+        blocking = False
+    _may_block_cache[formula] = blocking
+    return blocking
+
+
+# Change this if formulas could give different results than before for the same input, e.g., if functions change
+RESULT_HASH_VERSION = 1
+
+
+def result_hash(formula: str, variables: Variables) -> str:
+    """A hash of the formula and the values of the variables it uses, which is the same as long as its result is"""
+    used = sorted((name, variables[name]) for name in formula_names(formula) if name in variables)
+    return hashlib.blake2b(repr((RESULT_HASH_VERSION, formula, used)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def infer_shape(formula: str, variables: Variables = None) -> shape_core.Shape | None:
+    """The shape of the formula's result (see core/shape), or None if it can't be known without evaluating it. Raises
+    FormulaShapeException if evaluating it would certainly fail. Cached until the variables change."""
+    if (inferred := _shape_cache.get(formula, False)) is False:
+        allowed = default_allowed()
+        names = {name: shape_core.SCALAR for name in allowed["names"]}
+        names |= {name: shape_core.shape_of(value) for name, value in (variables or {}).items()}
+        try:
+            inferred = shape_core.infer(formula, names, allowed["functions"])
+        except shape_core.UnknownNameException as e:
+            suggestion = completion.did_you_mean(e.name, _name_tries.get([*names, *allowed["functions"]]))
+            inferred = shape_core.ShapeException(f"{e}. {suggestion}" if suggestion else str(e))
+        except shape_core.ShapeException as e:
+            inferred = e
+        _shape_cache[formula] = inferred
+    if isinstance(inferred, shape_core.ShapeException):
+        raise FormulaShapeException(str(inferred))
+    return inferred
+
+
+def check_shape(formula: str, variables: Variables = None, expect_len: int = None, extend_to_expected: bool = False,
+                expect_number: bool = False) -> shape_core.Shape | None:
+    """Like infer_shape, but also raises FormulaShapeException if the result wouldn't fit the expected length, or would
+    be text when a number is expected"""
+    inferred = infer_shape(formula, variables)
+    try:
+        shape_core.check_result(inferred, expect_len, extend_to_expected, expect_number)
+    except shape_core.ShapeException as e:
+        raise FormulaShapeException(str(e))
+    return inferred
+
+
+@instrument.timed
+def _do_eval(formula: str, variables: Variables = None, budget: float = None):
+    variables = vector.vectorize(variables) if variables else {}
+    allowed = default_allowed()
+    try:
+        if budget is None:
+            evaluator = EvalWithCompoundTypes(vector.OPERATORS, allowed["functions"], allowed["names"] | variables)
+        else:
+            evaluator = _BudgetedEval(vector.OPERATORS, allowed["functions"], allowed["names"] | variables)
+            evaluator.deadline = time.perf_counter() + budget
+        return vector.to_plain(evaluator.eval(formula))
+    except FormulaTimeoutException:
+        raise
+    except BaseException as e:
+        raise FormulaExecutionException(f"Formula raised an exception: {e}")
+
+
+def eval_uncached(formula: str, variables: Variables = None, budget: float = None):
+    """Evaluate the formula without touching the caches or scene data, so it is safe to call from other threads.
+    Raises FormulaTimeoutException if it takes longer than budget seconds."""
+    return _do_eval(formula, variables, budget)
+
+
+@instrument.timed
+def eval_uncached_batch(formulas: Sequence[str], variables: Variables = None) -> list[tuple[bool, any]]:
+    """Evaluate a batch of formulas without touching the caches, like eval_uncached, but evaluating parts they share
+    (see core/subexpression) only once. Returns (True, result) or (False, error message) for each formula."""
+    variables = vector.vectorize(variables) if variables else {}
+    allowed = default_allowed()
+    parsed = []
+    for formula in formulas:
+        try:
+            parsed.append(subexpression.SharedEval.parse(formula))
+        except BaseException as e:
+            parsed.append(e)
+    # The trees must outlive the evaluator, which refers to their nodes by id
+    shared = subexpression.shared_nodes((f, tree) for f, tree in zip(formulas, parsed) if isinstance(tree, ast.AST))
+    evaluator = subexpression.SharedEval(vector.OPERATORS, allowed["functions"], allowed["names"] | variables, shared)
+    results = []
+    for formula, tree in zip(formulas, parsed):
+        try:
+            if isinstance(tree, BaseException):
+                raise tree
+            results.append((True, vector.to_plain(evaluator.eval(formula, previously_parsed=tree))))
+        except BaseException as e:
+            results.append((False, f"Formula raised an exception: {e}"))
+    return results
+
+
+def _do_eval_frames(formula: str, frames: Sequence[float], fps: float, variables: Variables = None) -> list:
+    """Evaluate the formula once per frame, parsing it and setting up the evaluator only once"""
+    variables = vector.vectorize(variables) if variables else {}
+    allowed = default_allowed()
+    try:
+        evaluator = EvalWithCompoundTypes(vector.OPERATORS, allowed["functions"], allowed["names"] | variables)
+        parsed = evaluator.parse(formula)
+        results = []
+        for frame in frames:
+            evaluator.names["frame"] = frame
+            evaluator.names["fps"] = fps
+            evaluator.names["time"] = frame / fps if fps else 0.0
+            results.append(vector.to_plain(evaluator.eval(formula, previously_parsed=parsed)))
+        return results
+    except BaseException as e:
+        raise FormulaExecutionException(f"Formula raised an exception: {e}")
+
+
+def _shape_result(result, expect_len: int = None, extend_to_expected: bool = False) -> tuple[float, ...]:
+    result = (result,) if type(result) is str or not hasattr(result, "__len__") else tuple(result)
+
+    result_len = len(result)
+
+    if expect_len is not None:
+        if result_len != expect_len and not extend_to_expected:
+            raise FormulaExecutionException("Unexpected result length")
+
+        # Extend the result by repeating the last value if it's shorter
+        if result_len < expect_len:
+            return result + result[-1:] * (expect_len - result_len)
+
+        # Truncate the result if it's longer
+        if result_len > expect_len:
+            return result[0:expect_len]
+
+    return result
+
+
+def cache_key(formula: str) -> str | tuple[str, float]:
+    """The key a formula's result is cached under. Formulas that use the time names are memoized per frame."""
+    return (formula, _time_names["frame"]) if is_time_dependent(formula) else formula
+
+
+def variables_version() -> int:
+    return _variables_version
+
+
+def time_names() -> dict[str, float]:
+    return dict(_time_names)
+
+
+def is_cached(formula: str) -> bool:
+    key = cache_key(formula)
+    return key in (_frame_formula_cache if type(key) is tuple else _formula_cache)
+
+
+def _store_frame_result(key: tuple[str, float], result) -> None:
+    # Every frame played gets its own results, so drop the oldest once there are too many
+    if len(_frame_formula_cache) >= FRAME_CACHE_SIZE:
+        evicted = FRAME_CACHE_SIZE // 4
+        for old_key in list(itertools.islice(_frame_formula_cache, evicted)):
+            del _frame_formula_cache[old_key]
+        instrument.count("frame_formula_cache", "eviction", evicted)
+    _frame_formula_cache[key] = result
+
+
+def store_result(version: int, key: str | tuple[str, float], result) -> None:
+    """Cache a result evaluated elsewhere (e.g., in another process), if the variables haven't changed since"""
+    if version != _variables_version:
+        return
+    if type(key) is tuple:
+        _store_frame_result(key, result)
+    else:
+        _formula_cache[key] = result
+
+
+def eval_batch(formulas: Iterable[str], variables: Variables = None) -> int:
+    """Evaluate and cache the formulas that aren't cached yet, all at once with eval_uncached_batch, so parts they
+    share are only evaluated once. Failing formulas aren't cached, and raise as usual when passed to eval_formula. The
+    variables must be the result of eval_variables. Returns the number of formulas evaluated."""
+    keys = {}
+    for formula in formulas:
+        if not formula or is_cached(formula):
+            continue
+        # Formulas that would certainly fail aren't worth evaluating
+        try:
+            infer_shape(formula, variables)
+        except FormulaShapeException:
+            continue
+        keys[cache_key(formula)] = formula
+    if not keys:
+        return 0
+    version = _variables_version
+    for key, (ok, result) in zip(keys, eval_uncached_batch(list(keys.values()), variables)):
+        if ok:
+            store_result(version, key, result)
+    return len(keys)
+
+
+def eval_formula(
+        formula: str,
+        variables: Variables = None,
+        expect_len: int = None,
+        extend_to_expected: bool = False,
+        budget: float = None,
+        expect_number: bool = False
+) -> tuple[float, ...]:
+    """Evaluate the formula, or get it from the cache. The variables must be the result of eval_variables, which
+    MUST be called before this, as part of its job is invalidating the cache if variables change. Formulas that would
+    certainly fail (see check_shape) raise FormulaShapeException without being evaluated."""
+    inferred = check_shape(formula, variables, expect_len, extend_to_expected, expect_number)
+    key = cache_key(formula)
+    per_frame = type(key) is tuple
+    cache = _frame_formula_cache if per_frame else _formula_cache
+    if (result := cache.get(key, None)) is None:
+        if instrument.enabled:
+            instrument.count("frame_formula_cache" if per_frame else "formula_cache", "miss")
+        result = _do_eval(formula, variables, budget)
+        if per_frame:
+            _store_frame_result(key, result)
+        else:
+            _formula_cache[key] = result
+    elif instrument.enabled:
+        instrument.count("frame_formula_cache" if per_frame else "formula_cache", "hit")
+
+    # Results whose shape is known to fit don't need reshaping
+    if inferred is not None and inferred.kind == shape_core.NUMBER:
+        if inferred.is_scalar and expect_len in (None, 1):
+            return (result,)
+        if inferred.length == expect_len and type(result) is tuple:
+            return result
+    return _shape_result(result, expect_len, extend_to_expected)
+
+
+def snapshot_results(formulas: Iterable[str], variables: Variables) -> dict[str, tuple[str, any]]:
+    """The cached results of the formulas, as formula: (result hash, result), to be restored later by restore_results.
+    Formulas that use the time names or haven't been evaluated are left out."""
+    snapshot = {}
+    for formula in formulas:
+        if not is_time_dependent(formula) and (result := _formula_cache.get(formula, None)) is not None:
+            snapshot[formula] = (result_hash(formula, variables), result)
+    return snapshot
+
+
+def restore_results(snapshot: Mapping[str, Sequence], variables: Variables) -> int:
+    """Put results from snapshot_results back into the formula cache, skipping any whose formula or variables have
+    changed since. The variables must be the result of eval_variables. Returns the number of results restored."""
+    restored = 0
+    for formula, (hash_value, result) in snapshot.items():
+        if formula in _formula_cache or is_time_dependent(formula) or hash_value != result_hash(formula, variables):
+            continue
+        _formula_cache[formula] = tuple(result) if isinstance(result, list) else result
+        restored += 1
+    instrument.count("formula_cache", "restored", restored)
+    return restored
+
+
+def eval_formula_frames(
+        formula: str,
+        frames: Sequence[float],
+        fps: float,
+        variables: Variables = None,
+        expect_len: int = None,
+        extend_to_expected: bool = False
+) -> list[tuple[float, ...]]:
+    """Evaluate the formula for every frame in a range, e.g., for baking. Results are not cached."""
+    check_shape(formula, variables, expect_len, extend_to_expected)
+    return [_shape_result(r, expect_len, extend_to_expected) for r in _do_eval_frames(formula, frames, fps, variables)]
+
+
+def _invalidate_formula_caches():
+    global _formula_cache, _frame_formula_cache, _variables_version
+    instrument.count("formula_cache", "eviction", len(_formula_cache))
+    instrument.count("frame_formula_cache", "eviction", len(_frame_formula_cache))
+    _formula_cache = {}
+    _frame_formula_cache = {}
+    _shape_cache.clear()
+    _variables_version += 1
+
+
+def _to_variable_value(result) -> float | tuple[float, ...]:
+    return tuple([float(r) for r in result]) if util.is_iterable(result) else float(result)
+
+
+def eval_variable(name: str, formula: str):
+    # Since (non-derived) variables can't use other variables, there's always a 1:1 relationship between formula and
+    # value, so we can associate formula with value in a cache
+    global _variable_formula_cache, _variable_eval_cache
+    if _variable_formula_cache.get(name, None) == formula:
+        value = _variable_eval_cache.get(formula, None)
+        if value is not None:
+            # This runs for every variable on every evaluation, so skip even the call to count() when disabled
+            if instrument.enabled:
+                instrument.count("variable_cache", "hit")
+            return value
+        if (error := _variable_error_cache.get(formula, None)) is not None:
+            if instrument.enabled:
+                instrument.count("variable_cache", "hit")
+            raise FormulaExecutionException(f"Variable evaluation of \"{name}\" raised an exception: {error}")
+
+    # If variables have changed, the formula_cache is invalid
+    instrument.count("variable_cache", "miss")
+    _invalidate_formula_caches()
+    _variable_formula_cache[name] = formula
+
+    try:
+        result = _to_variable_value(_do_eval(formula, {}))
+    except BaseException as e:
+        _variable_error_cache[formula] = str(e)
+        raise FormulaExecutionException(f"Variable evaluation of \"{name}\" raised an exception: {e}")
+
+    _variable_eval_cache[formula] = result
+    return result
+
+
+def reset_variable_cache(variable_formulas: Mapping[str, str]):
+    """Reset variable name-to-value and formula caches, e.g., after deleting a variable
+    and possibly invalidating formulas. Takes the current name: formula of all variables."""
+    global _variable_formula_cache
+    _variable_formula_cache = dict(variable_formulas)
+    _invalidate_formula_caches()
+
+
+def _eval_derived(derived: tuple[tuple[str, str], ...], values: Variables) -> None:
+    """Evaluate derived variables into _derived_values and _derived_errors, each after the derived variables it uses"""
+    formulas = dict(derived)
+    # The variables being visited, each used by the one before it
+    visiting = []
+    _derived_values.clear()
+    _derived_errors.clear()
+
+    def visit(name: str) -> None:
+        if name in _derived_values or name in _derived_errors:
+            return
+        if name in visiting:
+            for cyclic in visiting[visiting.index(name):]:
+                _derived_errors[cyclic] = "it uses itself, through the variables in its formula"
+            return
+        visiting.append(name)
+        uses = formulas.keys() & formula_names(formulas[name])
+        for used in uses:
+            visit(used)
+        visiting.pop()
+        if name in _derived_errors:
+            return
+        if failed := sorted(used for used in uses if used in _derived_errors):
+            _derived_errors[name] = f"it uses \"{failed[0]}\", which failed"
+            return
+        try:
+            _derived_values[name] = _to_variable_value(_do_eval(formulas[name], values | _derived_values))
+        except BaseException as e:
+            _derived_errors[name] = str(e)
+
+    for name in formulas:
+        visit(name)
+
+
+def eval_variables(
+        variables: Iterable[tuple[str, str]],
+        derived: Iterable[tuple[str, str]] = ()
+) -> dict[str, float | tuple[float, ...]]:
+    """Evaluate (name, formula) pairs of variables, skipping (and logging) any that fail. Derived variables can use
+    the other variables (and each other), and are evaluated once each time those change, rather than once per formula
+    that uses them."""
+    global _derived_key, _derived_version
+    evaled_vars = {}
+    for name, formula in variables:
+        try:
+            evaled_vars[name] = eval_variable(name, formula)
+        except FormulaExecutionException as e:
+            print(f"Error processing variable \"{name}\": {e}")
+
+    derived = tuple(derived)
+    if derived != _derived_key or _derived_version != _variables_version:
+        # Base variables changing has already invalidated the formula caches, but derived variables changing hasn't
+        if derived != _derived_key:
+            instrument.count("variable_cache", "miss")
+            _invalidate_formula_caches()
+        _derived_key = derived
+        _derived_version = _variables_version
+        _eval_derived(derived, evaled_vars)
+        for name, error in _derived_errors.items():
+            print(f"Error processing variable \"{name}\": Variable evaluation of \"{name}\" raised an exception: "
+                  f"{error}")
+    elif derived and instrument.enabled:
+        instrument.count("variable_cache", "hit")
+    return evaled_vars | _derived_values
+
+
+def derived_error(name: str) -> str | None:
+    """Why the derived variable failed when last evaluated, or None if it didn't (or isn't a derived variable)"""
+    return _derived_errors.get(name, None)
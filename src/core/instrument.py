@@ -0,0 +1,92 @@
+import functools
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+"""
+Lightweight timing and cache counters, shown in the Diagnostics panel. Collection is off by default, and while it's off
+the timed() wrapper and count() do nothing but check a flag. This must not import bpy.
+"""
+
+enabled: bool = False
+
+
+@dataclass
+class TimerStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+# timer name: stats
+_timers: dict[str, TimerStats] = {}
+# counter name: {event name: count}, e.g., "formula_cache": {"hit": 10, "miss": 2, "eviction": 2}
+_counters: dict[str, dict[str, int]] = {}
+
+
+def set_enabled(value: bool) -> None:
+    global enabled
+    enabled = value
+
+
+def _timer_name(fn: Callable) -> str:
+    # Trim the addon's package name so names are the same however the addon is installed, e.g. "core.formula._do_eval"
+    module = fn.__module__.split(".", 1)[-1]
+    return f"{module}.{fn.__qualname__}"
+
+
+def timed(fn: Callable) -> Callable:
+    """Decorator that records the number of calls to a function and the time spent in them, while enabled"""
+    name = _timer_name(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = _timers.get(name, None) or _timers.setdefault(name, TimerStats())
+            stats.calls += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+
+    return wrapper
+
+
+def count(counter: str, event: str, amount: int = 1) -> None:
+    """Add to a counter (e.g., count("formula_cache", "hit")), while enabled"""
+    if not enabled or not amount:
+        return
+    events = _counters.get(counter, None) or _counters.setdefault(counter, {})
+    events[event] = events.get(event, 0) + amount
+
+
+def reset() -> None:
+    _timers.clear()
+    _counters.clear()
+
+
+def snapshot() -> dict[str, any]:
+    """The collected data as plain data, with times in milliseconds and timers sorted by total time"""
+    timers = sorted(_timers.items(), key=lambda item: item[1].total, reverse=True)
+    return {
+        "enabled": enabled,
+        "timers": {
+            name: {
+                "calls": stats.calls,
+                "total_ms": stats.total * 1000,
+                "mean_ms": stats.total * 1000 / stats.calls if stats.calls else 0.0,
+                "max_ms": stats.max * 1000,
+            } for name, stats in timers
+        },
+        "counters": {name: dict(events) for name, events in sorted(_counters.items())},
+    }
+
+
+def to_json() -> str:
+    return json.dumps(snapshot(), indent=2)
@@ -0,0 +1,249 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import socket_types, util
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (socket_types, util):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+A table of formula results and current values for many sockets, so whether each socket matches its results can be
+worked out for all of them at once. Rows are stored in NumPy arrays (one row per socket, padded to the longest value)
+and compared with one vectorized isclose, rather than one math.isclose per component. If NumPy isn't available, each
+row's status is worked out when it's set instead. This must not import bpy.
+"""
+
+# (stale, error)
+Status = tuple[bool, bool]
+
+
+def _is_number(value) -> bool:
+    return type(value) in (int, float, bool)
+
+
+class _BaseTable(ABC):
+    """Results and current values by key (e.g., socket locator). Rows with errors have no results, and are never
+    stale."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: Hashable) -> bool:
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, values: Sequence, results: Sequence,
+            tolerance: float = socket_types.FLOAT_PRECISION) -> None:
+        """Store the current values and formula results for the key, whose floats are compared within the relative
+        tolerance"""
+
+    @abstractmethod
+    def set_error(self, key: Hashable) -> None:
+        """Mark the key's formulas as failed"""
+
+    @abstractmethod
+    def discard(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def statuses(self) -> dict[Hashable, Status]:
+        """The status of every key that's stale or has errors"""
+
+    @abstractmethod
+    def counts(self) -> tuple[int, int]:
+        """The number of stale keys and the number with errors"""
+
+    def stale_keys(self) -> list[Hashable]:
+        return [key for key, (stale, _) in self.statuses().items() if stale]
+
+    def error_keys(self) -> list[Hashable]:
+        return [key for key, (_, error) in self.statuses().items() if error]
+
+
+class _ArrayTable(_BaseTable):
+    _INITIAL_CAPACITY = 64
+    _INITIAL_WIDTH = 4
+
+    def __init__(self):
+        # key: row, and row: key (None for free rows)
+        self._rows: dict[Hashable, int] = {}
+        self._keys: list[Hashable | None] = []
+        self._free: list[int] = []
+        # Rows set since they were last compared
+        self._changed: set[int] = set()
+        self.clear()
+
+    def _allocate(self, capacity: int, width: int) -> None:
+        old = getattr(self, "_results", None)
+        results = np.zeros((capacity, width))
+        values = np.zeros((capacity, width))
+        tolerances = np.zeros((capacity, width))
+        # Which elements of each row hold values that are compared numerically
+        used = np.zeros((capacity, width), dtype=bool)
+        # Rows whose non-numeric values (e.g., strings) don't match, which are compared when set
+        unequal = np.zeros(capacity, dtype=bool)
+        errors = np.zeros(capacity, dtype=bool)
+        # Whether each row was stale when it was last compared
+        stale = np.zeros(capacity, dtype=bool)
+        if old is not None:
+            rows, columns = old.shape
+            results[:rows, :columns] = self._results
+            values[:rows, :columns] = self._values
+            tolerances[:rows, :columns] = self._tolerances
+            used[:rows, :columns] = self._used
+            unequal[:rows] = self._unequal
+            errors[:rows] = self._errors
+            stale[:rows] = self._stale
+        self._results, self._values, self._tolerances, self._used = results, values, tolerances, used
+        self._unequal, self._errors, self._stale = unequal, errors, stale
+        self._keys.extend([None] * (capacity - len(self._keys)))
+
+    def _row(self, key: Hashable, width: int) -> int:
+        capacity, columns = self._results.shape
+        if width > columns:
+            columns = width
+            self._allocate(capacity, columns)
+        if (row := self._rows.get(key, None)) is not None:
+            return row
+        if not self._free:
+            self._allocate(capacity * 2, columns)
+            self._free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+        row = self._free.pop()
+        self._rows[key] = row
+        self._keys[row] = key
+        return row
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def set(self, key: Hashable, values: Sequence, results: Sequence,
+            tolerance: float = socket_types.FLOAT_PRECISION) -> None:
+        row = self._row(key, len(values))
+        self._used[row] = False
+        self._unequal[row] = False
+        self._errors[row] = False
+        for index, (value, result) in enumerate(zip(values, results)):
+            if _is_number(value) and _is_number(result):
+                self._values[row, index] = value
+                self._results[row, index] = result
+                self._tolerances[row, index] = tolerance if float in (type(value), type(result)) else 0.0
+                self._used[row, index] = True
+            elif value != result:
+                self._unequal[row] = True
+        self._changed.add(row)
+
+    def set_error(self, key: Hashable) -> None:
+        row = self._row(key, 0)
+        self._used[row] = False
+        self._unequal[row] = False
+        self._errors[row] = True
+        self._changed.add(row)
+
+    def discard(self, key: Hashable) -> None:
+        if (row := self._rows.pop(key, None)) is None:
+            return
+        self._keys[row] = None
+        self._used[row] = False
+        self._unequal[row] = False
+        self._errors[row] = False
+        self._free.append(row)
+        self._changed.add(row)
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._keys = []
+        self._free = list(range(self._INITIAL_CAPACITY - 1, -1, -1))
+        self._results = None
+        self._allocate(self._INITIAL_CAPACITY, self._INITIAL_WIDTH)
+        self._changed.clear()
+
+    def compare(self, rows=slice(None)) -> "np.ndarray":
+        """Whether each of the rows (all of them by default) is stale, worked out with math.isclose(value, result,
+        rel_tol) for every element at once, where a tolerance of 0 means exactly equal"""
+        values, results = self._values[rows], self._results[rows]
+        with np.errstate(invalid="ignore"):
+            close = (values == results) | (np.abs(values - results) <=
+                                           self._tolerances[rows] * np.maximum(np.abs(values), np.abs(results)))
+        return (self._used[rows] & ~close).any(axis=1) | self._unequal[rows]
+
+    def _stale_and_error_masks(self) -> tuple["np.ndarray", "np.ndarray"]:
+        # Only rows set since the last call need comparing again, which is most of them at first, and a few after that
+        if self._changed:
+            rows = np.fromiter(self._changed, dtype=np.intp, count=len(self._changed))
+            self._stale[rows] = self.compare(rows)
+            self._changed.clear()
+        return self._stale, self._errors
+
+    def statuses(self) -> dict[Hashable, Status]:
+        stale, errors = self._stale_and_error_masks()
+        return {self._keys[row]: (bool(stale[row]), bool(errors[row])) for row in np.flatnonzero(stale | errors)}
+
+    def counts(self) -> tuple[int, int]:
+        stale, errors = self._stale_and_error_masks()
+        return int(stale.sum()), int(errors.sum())
+
+
+class _DictTable(_BaseTable):
+    """The table without NumPy, which compares each row when it's set and keeps running counts"""
+
+    def __init__(self):
+        self._rows: dict[Hashable, Status] = {}
+        self._stale_count = 0
+        self._error_count = 0
+
+    def _put(self, key: Hashable, status: Status) -> None:
+        old = self._rows.get(key, (False, False))
+        self._rows[key] = status
+        self._stale_count += status[0] - old[0]
+        self._error_count += status[1] - old[1]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rows
+
+    def set(self, key: Hashable, values: Sequence, results: Sequence,
+            tolerance: float = socket_types.FLOAT_PRECISION) -> None:
+        matching = all(util.compare_scalars(value, result, tolerance) if _is_number(value) and _is_number(result)
+                       else value == result for value, result in zip(values, results))
+        self._put(key, (not matching, False))
+
+    def set_error(self, key: Hashable) -> None:
+        self._put(key, (False, True))
+
+    def discard(self, key: Hashable) -> None:
+        if key in self._rows:
+            self._put(key, (False, False))
+            del self._rows[key]
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._stale_count = self._error_count = 0
+
+    def statuses(self) -> dict[Hashable, Status]:
+        return {key: status for key, status in self._rows.items() if any(status)}
+
+    def counts(self) -> tuple[int, int]:
+        return self._stale_count, self._error_count
+
+
+ResultTable = _ArrayTable if np is not None else _DictTable
@@ -0,0 +1,486 @@
+import ast
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+"""
+Static shape inference for formulas: what kind of value a formula gives (numbers or text) and how many, worked out
+from its syntax tree and the shapes of the names it uses, without evaluating it. Formulas that would certainly fail
+(e.g., an unknown name, or adding vectors of different lengths) are found before they're run. Anything the analysis
+can't be sure about is left unknown (None) for evaluation to sort out. This must not import bpy.
+"""
+
+NUMBER = "number"
+TEXT = "text"
+# Elements of different (or unknown) kinds
+MIXED = "mixed"
+
+
+@dataclass(frozen=True)
+class Shape:
+    kind: str
+    # None for a single value, otherwise the number of elements
+    length: int | None = None
+    # Whether arithmetic works element by element (see core/vector), rather than as on tuples. For single values, whether
+    # it may be a NumPy number taken from a vector (e.g., by indexing it), which also works element by element on tuples.
+    vector: bool = False
+
+    @property
+    def is_scalar(self) -> bool:
+        return self.length is None
+
+    def describe(self) -> str:
+        if self.is_scalar:
+            return "text" if self.kind == TEXT else "a number"
+        return f"a vector of length {self.length}" if self.vector else f"a list of length {self.length}"
+
+
+class ShapeException(Exception):
+    """The formula would certainly fail when evaluated"""
+    pass
+
+
+class UnknownNameException(ShapeException):
+    """The formula uses a name (or function) that isn't defined"""
+
+    def __init__(self, message: str, name: str):
+        super().__init__(message)
+        self.name = name
+
+
+SCALAR = Shape(NUMBER)
+SCALAR_TEXT = Shape(TEXT)
+
+
+def shape_of(value: any) -> Shape | None:
+    """The shape of a value, such as a variable's. Tuples are vectors when formulas are evaluated (see vectorize)."""
+    if type(value) in (int, float, bool):
+        return SCALAR
+    if type(value) is str:
+        return SCALAR_TEXT
+    if type(value) is tuple and all(type(v) in (int, float, bool) for v in value):
+        return Shape(NUMBER, len(value), vector=True)
+    return None
+
+
+def _element_kind(shapes: Sequence[Shape | None]) -> str:
+    kinds = {shape.kind if shape is not None and shape.is_scalar else MIXED for shape in shapes}
+    return kinds.pop() if len(kinds) == 1 else MIXED
+
+
+def _is_sequence(shape: Shape | None) -> bool:
+    return shape is not None and not shape.is_scalar
+
+
+def _combine_vectors(a: Shape, b: Shape) -> Shape | None:
+    """The shape of element-wise arithmetic between a and b, at least one of which is a vector"""
+    if a.kind == TEXT or b.kind == TEXT:
+        raise ShapeException("Can't do arithmetic with text")
+    if a.kind != NUMBER or b.kind != NUMBER:
+        return None
+    # A number from a vector only works element by element with a list if it's a NumPy number
+    for number, other in ((a, b), (b, a)):
+        if number.is_scalar and number.vector and not other.is_scalar and not other.vector:
+            return None
+    if a.is_scalar or b.is_scalar or a.length == b.length:
+        return Shape(NUMBER, a.length if b.is_scalar else b.length, vector=True)
+    # NumPy stretches vectors of length 1 to fit, but the tuple-based vectors don't
+    if 1 in (a.length, b.length):
+        return None
+    raise ShapeException(f"Can't combine vectors of length {a.length} and {b.length}")
+
+
+def _binop(node: ast.BinOp, a: Shape | None, b: Shape | None) -> Shape | None:
+    if a is None or b is None:
+        return None
+    op = type(node.op)
+    if op is ast.Mod and a == SCALAR_TEXT:
+        return SCALAR_TEXT
+    if a.vector or b.vector:
+        return _combine_vectors(a, b) if op is not ast.MatMult else None
+
+    if a.is_scalar and b.is_scalar:
+        if a.kind == NUMBER and b.kind == NUMBER:
+            return SCALAR
+        if op is ast.Add and a.kind == TEXT and b.kind == TEXT:
+            return SCALAR_TEXT
+        if op is ast.Mult and {a.kind, b.kind} == {TEXT, NUMBER}:
+            return SCALAR_TEXT
+        raise ShapeException(f"Can't combine {a.describe()} and {b.describe()}")
+
+    # Lists (e.g., tuple literals), which concatenate and repeat, as in Python
+    if op is ast.Add and _is_sequence(a) and _is_sequence(b):
+        return Shape(a.kind if a.kind == b.kind else MIXED, a.length + b.length)
+    if op is ast.Mult and not (_is_sequence(a) and _is_sequence(b)):
+        sequence, count, count_node = (a, b, node.right) if _is_sequence(a) else (b, a, node.left)
+        if count.kind == TEXT:
+            raise ShapeException(f"Can't combine {a.describe()} and {b.describe()}")
+        if isinstance(count_node, ast.Constant) and type(count_node.value) is int:
+            return Shape(sequence.kind, sequence.length * max(count_node.value, 0))
+        return None
+    raise ShapeException(f"Can't combine {a.describe()} and {b.describe()}; use vec(...) for element-wise math")
+
+
+def _is_vector(shape: Shape | None) -> bool:
+    return shape is not None and shape.vector
+
+
+def _unaryop(node: ast.UnaryOp, operand: Shape | None) -> Shape | None:
+    if isinstance(node.op, ast.Not):
+        # Vectors with NumPy have no single truth value
+        return None if operand is None or operand.vector else SCALAR
+    if operand is None:
+        return None
+    if operand.kind == TEXT:
+        raise ShapeException("Can't do arithmetic with text")
+    if operand.is_scalar or operand.vector:
+        return operand
+    raise ShapeException(f"Can't negate {operand.describe()}; use vec(...) for element-wise math")
+
+
+# Function signatures. Each takes the shapes of the call's positional arguments (None where unknown) and returns the
+# shape of the result, or None if it can't tell, and raises ShapeException if the call would certainly fail.
+Signature = Callable[[str, list[Shape | None]], Shape | None]
+
+
+def _check_arity(name: str, args: list, least: int, most: int | None) -> None:
+    if len(args) < least or (most is not None and len(args) > most):
+        expected = str(least) if least == most else f"{least} or more" if most is None else f"{least} to {most}"
+        raise ShapeException(f"{name}() takes {expected} argument{'' if expected == '1' else 's'}, not {len(args)}")
+
+
+def _numbers(least: int = 1, most: int | None = 1, result: Shape | None = SCALAR) -> Signature:
+    """A function of numbers only, such as most of the math module"""
+    def signature(name: str, args: list[Shape | None]) -> Shape | None:
+        _check_arity(name, args, least, most)
+        for arg in args:
+            # NumPy converts vectors of length 1 to numbers
+            if arg is not None and arg.vector and arg.length == 1:
+                return None
+            if arg is not None and not (arg.is_scalar and arg.kind == NUMBER):
+                raise ShapeException(f"{name}() takes numbers, not {arg.describe()}")
+        return result
+
+    return signature
+
+
+def _same_as_first(least: int = 1, most: int | None = 1) -> Signature:
+    """An element-wise function of a number or vector, such as abs"""
+    def signature(name: str, args: list[Shape | None]) -> Shape | None:
+        _check_arity(name, args, least, most)
+        first = args[0]
+        if first is not None and first.kind == TEXT:
+            raise ShapeException(f"{name}() takes numbers, not text")
+        return first if first is not None and (first.is_scalar or first.vector) else None
+
+    return signature
+
+
+def _reduction(allow_several: bool) -> Signature:
+    """A function of a sequence of numbers (such as sum), or of several numbers (such as max) if allow_several"""
+    def signature(name: str, args: list[Shape | None]) -> Shape | None:
+        _check_arity(name, args, 1, None if allow_several else 2)
+        first = args[0]
+        if len(args) == 1 or not allow_several:
+            if first is not None and first.is_scalar and first.kind == NUMBER:
+                raise ShapeException(f"{name}() takes a list of numbers, not {first.describe()}")
+            # A start value (e.g., a vector) can change the result's shape
+            if len(args) == 2 and args[1] != SCALAR:
+                return None
+            return Shape(NUMBER, vector=first.vector) if first is not None and first.kind == NUMBER else None
+        return SCALAR if all(arg == SCALAR for arg in args) else None
+
+    return signature
+
+
+def _sequences(allow_numbers: bool = False) -> Signature:
+    """A function of two sequences of the same length (such as dist), giving a number. If allow_numbers, numbers are
+    allowed too, as NumPy's dot multiplies them, and the shape of the result isn't known."""
+    def signature(name: str, args: list[Shape | None]) -> Shape | None:
+        _check_arity(name, args, 2, 2)
+        lengths = set()
+        for arg in args:
+            if arg is None:
+                continue
+            if arg.is_scalar:
+                if allow_numbers:
+                    return None
+                raise ShapeException(f"{name}() takes vectors, not {arg.describe()}")
+            lengths.add(arg.length)
+        if len(lengths) > 1:
+            raise ShapeException(f"{name}() takes vectors of the same length, not {' and '.join(map(str, lengths))}")
+        return SCALAR
+
+    return signature
+
+
+def _vec(name: str, args: list[Shape | None]) -> Shape | None:
+    if len(args) == 1 and not (args[0] is not None and args[0].is_scalar):
+        return Shape(NUMBER, args[0].length, vector=True) if args[0] is not None and args[0].kind == NUMBER else None
+    for arg in args:
+        if arg is None or not arg.is_scalar or arg.kind != NUMBER:
+            return None
+    return Shape(NUMBER, len(args), vector=True)
+
+
+def _cross(name: str, args: list[Shape | None]) -> Shape | None:
+    _check_arity(name, args, 2, 2)
+    for arg in args:
+        if arg is not None and arg.is_scalar:
+            raise ShapeException(f"{name}() takes vectors, not {arg.describe()}")
+        # NumPy also allows vectors of length 2, but the tuple-based vectors don't
+        if arg is not None and arg.length not in (2, 3):
+            raise ShapeException(f"{name}() takes vectors of length 3")
+    return Shape(NUMBER, 3, vector=True) if all(arg is not None and arg.length == 3 for arg in args) else None
+
+
+def _normalize(name: str, args: list[Shape | None]) -> Shape | None:
+    _check_arity(name, args, 1, 1)
+    arg = args[0]
+    if arg is None or arg.kind != NUMBER:
+        return None
+    return Shape(NUMBER, 1 if arg.is_scalar else arg.length, vector=True)
+
+
+def _lerp(name: str, args: list[Shape | None]) -> Shape | None:
+    _check_arity(name, args, 3, 3)
+    if None in args:
+        return None
+    # Sequences are turned into vectors first
+    a, b, t = (Shape(arg.kind, arg.length, vector=True) if _is_sequence(arg) else arg for arg in args)
+    ab = _combine_vectors(a, b) if a.vector or b.vector else SCALAR if a == b == SCALAR else None
+    if ab is None or not (ab.vector or t.vector):
+        return ab if t == SCALAR else None
+    return _combine_vectors(ab, t)
+
+
+def _clamp(name: str, args: list[Shape | None]) -> Shape | None:
+    _check_arity(name, args, 1, 3)
+    value = args[0]
+    if value is not None and value.kind == TEXT:
+        raise ShapeException(f"{name}() takes numbers, not text")
+    # Vector limits make the result a vector too
+    if any(arg != SCALAR for arg in args[1:]) or value is None or not (value.is_scalar or value.vector):
+        return None
+    return value
+
+
+def _pow(name: str, args: list[Shape | None]) -> Shape | None:
+    _check_arity(name, args, 2, 3)
+    base, exponent = args[:2]
+    if base is None or exponent is None:
+        return None
+    if base.vector or exponent.vector:
+        return _combine_vectors(base, exponent)
+    return _numbers(2, 3)(name, args)
+
+
+def _divmod(name: str, args: list[Shape | None]) -> Shape | None:
+    # Vectors give a pair of vectors with NumPy, but fail without it
+    if None in args or any(map(_is_vector, args)):
+        return None
+    return _numbers(2, 2, result=Shape(NUMBER, 2))(name, args)
+
+
+def _range(name: str, args: list[Shape | None]) -> Shape | None:
+    _numbers(1, 3, result=None)(name, args)
+    return None
+
+
+# Functions in default_allowed() that aren't here aren't checked
+SIGNATURES: dict[str, Signature] = {
+    **{name: _numbers() for name in (
+        "acos", "acosh", "asin", "asinh", "atan", "atanh", "ceil", "cos", "cosh", "degrees", "erf", "erfc", "exp",
+        "expm1", "fabs", "factorial", "floor", "gamma", "isfinite", "isinf", "isnan", "isqrt", "lgamma", "log10",
+        "log1p", "log2", "radians", "sin", "sinh", "sqrt", "tan", "tanh", "trunc", "ulp")},
+    **{name: _numbers(2, 2) for name in ("atan2", "comb", "copysign", "fmod", "ldexp", "remainder")},
+    **{name: _numbers(result=Shape(NUMBER, 2)) for name in ("frexp", "modf")},
+    "log": _numbers(1, 2),
+    "perm": _numbers(1, 2),
+    "nextafter": _numbers(2, 2),
+    "gcd": _numbers(0, None),
+    "lcm": _numbers(0, None),
+    "hypot": _numbers(0, None),
+    "isclose": _numbers(2, 2),
+    "abs": _same_as_first(),
+    "round": _same_as_first(1, 2),
+    "pow": _pow,
+    "divmod": _divmod,
+    "max": _reduction(allow_several=True),
+    "min": _reduction(allow_several=True),
+    "sum": _reduction(allow_several=False),
+    "fsum": _reduction(allow_several=False),
+    "prod": _reduction(allow_several=False),
+    "dist": _sequences(),
+    "range": _range,
+    "vec": _vec,
+    "dot": _sequences(allow_numbers=True),
+    "cross": _cross,
+    "normalize": _normalize,
+    "lerp": _lerp,
+    "clamp": _clamp,
+}
+
+
+class _ShapeVisitor:
+    def __init__(self, names: Mapping[str, Shape | None], functions: Mapping[str, any]):
+        self.names = names
+        self.functions = functions
+        # Names bound by the comprehensions being visited, whose shapes aren't known
+        self._bound: list[set[str]] = []
+
+    def visit(self, node: ast.AST) -> Shape | None:
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        return method(node) if method else None
+
+    def visit_maybe(self, node: ast.AST) -> Shape | ShapeException | None:
+        """Visit a part that might not be evaluated (e.g., one branch of an if), so its errors aren't certain. Returns
+        the error instead of raising it."""
+        try:
+            return self.visit(node)
+        except ShapeException as e:
+            return e
+
+    def visit_Expr(self, node: ast.Expr) -> Shape | None:
+        return self.visit(node.value)
+
+    def visit_Constant(self, node: ast.Constant) -> Shape | None:
+        return shape_of(node.value)
+
+    def visit_Name(self, node: ast.Name) -> Shape | None:
+        if any(node.id in bound for bound in self._bound):
+            return None
+        if node.id in self.names:
+            return self.names[node.id]
+        if node.id in self.functions:
+            return shape_of(self.functions[node.id])
+        raise UnknownNameException(f"Unknown name \"{node.id}\"", node.id)
+
+    def visit_Tuple(self, node: ast.Tuple | ast.List) -> Shape | None:
+        shapes = [self.visit(element) for element in node.elts]
+        if any(isinstance(element, ast.Starred) for element in node.elts):
+            return None
+        return Shape(_element_kind(shapes), len(shapes))
+
+    visit_List = visit_Tuple
+
+    def visit_JoinedStr(self, node: ast.JoinedStr) -> Shape | None:
+        for value in node.values:
+            self.visit(value)
+        return SCALAR_TEXT
+
+    def visit_FormattedValue(self, node: ast.FormattedValue) -> Shape | None:
+        self.visit(node.value)
+        return SCALAR_TEXT
+
+    def visit_BinOp(self, node: ast.BinOp) -> Shape | None:
+        return _binop(node, self.visit(node.left), self.visit(node.right))
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> Shape | None:
+        return _unaryop(node, self.visit(node.operand))
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> Shape | None:
+        # Only the first value is certain to be evaluated
+        shapes = {self.visit(node.values[0])} | {self.visit_maybe(value) for value in node.values[1:]}
+        shape = shapes.pop() if len(shapes) == 1 else None
+        return shape if isinstance(shape, Shape) and not shape.vector else None
+
+    def visit_Compare(self, node: ast.Compare) -> Shape | None:
+        shapes = [self.visit(node.left)] + [self.visit(comparator) for comparator in node.comparators]
+        # Comparing vectors gives a vector (with NumPy), or compares them as tuples (without it)
+        return None if any(shape is None or shape.vector for shape in shapes) else SCALAR
+
+    def visit_IfExp(self, node: ast.IfExp) -> Shape | None:
+        test = self.visit(node.test)
+        body, orelse = self.visit_maybe(node.body), self.visit_maybe(node.orelse)
+        # Whichever branch is taken fails
+        if isinstance(body, ShapeException) and isinstance(orelse, ShapeException):
+            raise body
+        return body if body == orelse and not _is_vector(test) else None
+
+    def visit_Subscript(self, node: ast.Subscript) -> Shape | None:
+        container, index = self.visit(node.value), self.visit(node.slice)
+        if container is None or isinstance(node.slice, ast.Slice):
+            return None
+        if container.kind == TEXT:
+            return SCALAR_TEXT
+        if container.is_scalar:
+            raise ShapeException(f"Can't index {container.describe()}")
+        if index is not None and index.kind == TEXT:
+            raise ShapeException(f"Can't index {container.describe()} with text")
+        if index is not None and not index.is_scalar:
+            return None
+        if isinstance(node.slice, ast.Constant) and type(node.slice.value) is int \
+                and not -container.length <= node.slice.value < container.length:
+            raise ShapeException(f"Index {node.slice.value} is out of range for {container.describe()}")
+        return Shape(NUMBER, vector=container.vector) if container.kind == NUMBER else None
+
+    def visit_Slice(self, node: ast.Slice) -> Shape | None:
+        for part in (node.lower, node.upper, node.step):
+            if part is not None:
+                self.visit(part)
+        return None
+
+    def visit_Call(self, node: ast.Call) -> Shape | None:
+        args = [self.visit(arg) for arg in node.args]
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+        if not isinstance(node.func, ast.Name):
+            return None
+        name = node.func.id
+        if name not in self.functions:
+            raise UnknownNameException(f"Unknown function \"{name}\"", name)
+        signature = SIGNATURES.get(name, None)
+        if signature is None or node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            return None
+        return signature(name, args)
+
+    def _visit_comprehension(self, node) -> Shape | None:
+        bound = set()
+        iterables = []
+        for index, generator in enumerate(node.generators):
+            # The first iterable is evaluated outside the comprehension, and later ones can use earlier targets. Only
+            # the first is certain to be evaluated, as the others aren't if it's empty.
+            iterable = self.visit(generator.iter) if not index else self.visit_maybe(generator.iter)
+            if iterable == SCALAR and not index:
+                raise ShapeException(f"Can't loop over {iterable.describe()}")
+            iterables.append(iterable)
+            if not index:
+                self._bound.append(bound)
+            bound |= {name.id for name in ast.walk(generator.target) if isinstance(name, ast.Name)}
+            for condition in generator.ifs:
+                self.visit_maybe(condition)
+        try:
+            element = self.visit_maybe(node.elt)
+        finally:
+            self._bound.pop()
+
+        # Only the length of a plain list comprehension over one list of known length is known
+        if not isinstance(node, ast.ListComp) or len(node.generators) != 1 or node.generators[0].ifs \
+                or iterables[0] is None or iterables[0].kind == TEXT:
+            return None
+        return Shape(element.kind if isinstance(element, Shape) and element.is_scalar else MIXED, iterables[0].length)
+
+    visit_ListComp = visit_GeneratorExp = _visit_comprehension
+
+
+def infer(formula: str, names: Mapping[str, Shape | None], functions: Mapping[str, any]) -> Shape | None:
+    """The shape of the formula's result, given the shapes of the names it can use and the functions it can call, or
+    None if it can't be known without evaluating it. Raises ShapeException if evaluating it would certainly fail."""
+    try:
+        body = ast.parse(formula.strip()).body
+    except SyntaxError as e:
+        raise ShapeException(f"Invalid syntax: {e.msg}")
+    if not body:
+        raise ShapeException("The formula is empty")
+    return _ShapeVisitor(names, functions).visit(body[0])
+
+
+def check_result(shape: Shape | None, expect_len: int | None, extend_to_expected: bool, expect_number: bool) -> None:
+    """Raise ShapeException if a result of the shape can't be used as a value of the expected length and kind"""
+    if shape is None:
+        return
+    if expect_number and shape.kind == TEXT:
+        raise ShapeException("The formula gives text, but the value is a number")
+    length = 1 if shape.is_scalar else shape.length
+    if expect_len is not None and length != expect_len and not extend_to_expected:
+        raise ShapeException(f"Unexpected result length: the formula gives {length} values, not {expect_len}")
@@ -0,0 +1,91 @@
+import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+"""
+What Tell Me Why knows about each type of node socket: how it's labelled, how its value is split into components for
+formulas, and how values are compared with formula results. The registry is built once, when the addon is loaded, and
+looked up by socket type (e.g., "VECTOR") or bl_idname (e.g., "NodeSocketVector"), so supporting a new socket type only
+needs an entry here. This must not import bpy.
+"""
+
+# Relative tolerance for comparing float values, as in util.compare_scalars
+FLOAT_PRECISION = 0.00001
+
+
+@dataclass(frozen=True)
+class SocketType:
+    type: str
+    label: str
+    # The ComponentValueExplanation.type of each component of the value. Empty if formulas can't set it.
+    component_types: tuple[str, ...] = ()
+    # The label of each component, when they're split. If not given, they're named (and numbered, if there are several)
+    # after the socket.
+    component_labels: tuple[str, ...] | None = None
+    # Shown as "Split ... Components"
+    component_abbreviation: str = ""
+    numeric_compare: bool = False
+    # Relative tolerance when comparing values with formula results, used whenever either is a float (e.g., a float
+    # result for an integer socket, which is stored rounded). 0 means they must be equal.
+    tolerance: float = 0.0
+    # Whether the value is a datablock (or shader), which formulas give the name of
+    reference: bool = False
+    bl_idnames: tuple[str, ...] = ()
+
+    def split_labels(self, socket_name: str) -> tuple[str, ...]:
+        """The labels of the value's components when they're split"""
+        if self.component_labels:
+            return self.component_labels
+        if len(self.component_types) == 1:
+            return (socket_name,)
+        return tuple(f"{socket_name} {index}" for index in range(len(self.component_types)))
+
+
+def _reference_type(type_: str, label: str, bl_idname: str) -> SocketType:
+    """A socket holding a datablock (or shader), whose formulas give its name"""
+    return SocketType(type_, label, ("string",), reference=True, bl_idnames=(bl_idname,))
+
+
+_FLOAT_VECTOR_IDNAMES = ("NodeSocketVector", "NodeSocketVectorTranslation", "NodeSocketVectorDirection",
+                         "NodeSocketVectorVelocity", "NodeSocketVectorAcceleration", "NodeSocketVectorEuler",
+                         "NodeSocketVectorXYZ")
+
+_TYPES = (
+    SocketType("INT", "Integer", ("int",), numeric_compare=True, tolerance=FLOAT_PRECISION,
+               bl_idnames=("NodeSocketInt", "NodeSocketIntUnsigned", "NodeSocketIntPercentage", "NodeSocketIntFactor")),
+    SocketType("VALUE", "Float", ("float",), numeric_compare=True, tolerance=FLOAT_PRECISION,
+               bl_idnames=("NodeSocketFloat", "NodeSocketFloatUnsigned", "NodeSocketFloatPercentage",
+                           "NodeSocketFloatFactor", "NodeSocketFloatAngle", "NodeSocketFloatTime",
+                           "NodeSocketFloatTimeAbsolute", "NodeSocketFloatDistance")),
+    SocketType("VECTOR", "X, Y, Z", ("float",) * 3, ("X", "Y", "Z"), "XYZ", numeric_compare=True,
+               tolerance=FLOAT_PRECISION, bl_idnames=_FLOAT_VECTOR_IDNAMES),
+    SocketType("ROTATION", "Rotation", ("float",) * 4, ("W", "X", "Y", "Z"), tolerance=FLOAT_PRECISION,
+               bl_idnames=("NodeSocketRotation",)),
+    SocketType("RGBA", "R, G, B, A", ("float",) * 4, ("Red", "Green", "Blue", "Alpha"), "RGBA", numeric_compare=True,
+               tolerance=FLOAT_PRECISION, bl_idnames=("NodeSocketColor",)),
+    SocketType("BOOLEAN", "Boolean", ("bool",), tolerance=FLOAT_PRECISION, bl_idnames=("NodeSocketBool",)),
+    SocketType("STRING", "String", ("string",), bl_idnames=("NodeSocketString",)),
+    _reference_type("SHADER", "Node", "NodeSocketShader"),
+    _reference_type("OBJECT", "Object", "NodeSocketObject"),
+    _reference_type("IMAGE", "Image", "NodeSocketImage"),
+    _reference_type("TEXTURE", "Texture", "NodeSocketTexture"),
+    _reference_type("MATERIAL", "Material", "NodeSocketMaterial"),
+    _reference_type("COLLECTION", "Collection", "NodeSocketCollection"),
+)
+
+# type: SocketType, and bl_idname: SocketType
+SOCKET_TYPES: Mapping[str, SocketType] = MappingProxyType({socket_type.type: socket_type for socket_type in _TYPES})
+BY_IDNAME: Mapping[str, SocketType] = MappingProxyType(
+    {bl_idname: socket_type for socket_type in _TYPES for bl_idname in socket_type.bl_idnames})
+
+
+@functools.cache
+def _unknown(type_: str) -> SocketType:
+    """A socket type that isn't in the registry (e.g., from a newer version of Blender), which formulas can't set"""
+    return SocketType(type_, type_.capitalize())
+
+
+def lookup(type_: str, bl_idname: str = "") -> SocketType:
+    """The registry entry for a socket's type, falling back to its bl_idname (e.g., for custom sockets)"""
+    return SOCKET_TYPES.get(type_, None) or BY_IDNAME.get(bl_idname, None) or _unknown(type_)
@@ -0,0 +1,87 @@
+import ast
+from collections.abc import Iterable
+
+from . import instrument
+from ..vendor.simpleeval import EvalWithCompoundTypes
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (instrument,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Common subexpressions across a batch of formulas. Identical parts of different formulas (e.g., "sqrt(ior * ior - 1)"
+used by dozens of sockets) are found from their syntax trees, and evaluated only once per batch. This must not import
+bpy.
+"""
+
+# Parts of formulas that are worth remembering the values of. Names and constants are already quick to look up.
+_CACHEABLE = (ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call, ast.Subscript, ast.ListComp,
+              ast.GeneratorExp)
+# type: the parts of a node to look for shared parts in. This is most of the work of finding them, so only expressions
+# are visited, and names, constants, and comprehensions (whose parts can use the comprehension's variables, so their
+# values change as it runs) have none.
+_CHILDREN = {
+    ast.Expr: lambda node: (node.value,),
+    ast.BinOp: lambda node: (node.left, node.right),
+    ast.UnaryOp: lambda node: (node.operand,),
+    ast.BoolOp: lambda node: node.values,
+    ast.Compare: lambda node: (node.left, *node.comparators),
+    ast.IfExp: lambda node: (node.test, node.body, node.orelse),
+    ast.Call: lambda node: (*node.args, *(keyword.value for keyword in node.keywords)),
+    ast.Subscript: lambda node: (node.value, node.slice),
+    ast.Slice: lambda node: [part for part in (node.lower, node.upper, node.step) if part is not None],
+    ast.Tuple: lambda node: node.elts,
+    ast.List: lambda node: node.elts,
+    ast.Set: lambda node: node.elts,
+    ast.Dict: lambda node: [part for part in (*node.keys, *node.values) if part is not None],
+    ast.Starred: lambda node: (node.value,),
+}
+
+
+def _key(node: ast.AST, lines: list[bytes]) -> bytes | str:
+    """The node's text in the formula, which is the same for identical parts (unless they're formatted differently)"""
+    if node.lineno == node.end_lineno:
+        # As in ast, columns are offsets in the UTF-8 encoded line
+        return lines[node.lineno - 1][node.col_offset:node.end_col_offset]
+    return ast.dump(node)
+
+
+def shared_nodes(formulas: Iterable[tuple[str, ast.AST]]) -> dict[int, bytes | str]:
+    """The parts of the parsed formulas that appear more than once (in one formula or across them), as id(node): a key
+    that's the same for identical parts. Takes (formula text, tree parsed from formula.strip()) pairs. The trees must
+    be kept alive while this is used, as it refers to nodes by id."""
+    found: dict[bytes | str, list[ast.AST]] = {}
+    for formula, tree in formulas:
+        lines = formula.strip().encode("utf-8").split(b"\n")
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, _CACHEABLE):
+                found.setdefault(_key(node, lines), []).append(node)
+            if (children := _CHILDREN.get(type(node), None)) is not None:
+                nodes.extend(children(node))
+    return {id(node): key for key, nodes in found.items() if len(nodes) > 1 for node in nodes}
+
+
+class SharedEval(EvalWithCompoundTypes):
+    """An evaluator that remembers the values of shared parts of formulas (see shared_nodes) in values, and reuses them
+    rather than evaluating the same part again. Parts that fail aren't remembered."""
+
+    def __init__(self, operators, functions, names, shared: dict[int, bytes | str]):
+        super().__init__(operators, functions, names)
+        self.shared = shared
+        # key: value
+        self.values: dict[bytes | str, any] = {}
+
+    def _eval(self, node):
+        if (key := self.shared.get(id(node), None)) is None:
+            return super()._eval(node)
+        if key in self.values:
+            instrument.count("subexpression_cache", "hit")
+            return self.values[key]
+        instrument.count("subexpression_cache", "miss")
+        value = self.values[key] = super()._eval(node)
+        return value
@@ -0,0 +1,28 @@
+import collections.abc
+from math import isclose
+
+"""
+Small helpers for comparing formula results with values, used by core and by lib/util. This must not import bpy.
+"""
+
+
+def compare_scalars(a, b, float_precision: float = 0.00001):
+    if type(a) is float or type(b) is float:
+        return isclose(a, b, rel_tol=float_precision)
+    return a == b
+
+
+def compare_vectors(a, b, float_precision: float = 0.00001):
+    for ac, bc in zip(a, b):
+        numeric_value = type(ac) in [int, float] and type(bc) in [int, float]
+        if numeric_value:
+            if not isclose(float(ac), float(bc), rel_tol=float_precision):
+                return False
+        else:
+            if ac != bc:
+                return False
+    return True
+
+
+def is_iterable(thing: any):
+    return (isinstance(thing, collections.abc.Iterable) or hasattr(thing, "__getitem__")) and not isinstance(thing, str)
@@ -0,0 +1,146 @@
+import ast
+import math
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..vendor.simpleeval import DEFAULT_OPERATORS
+
+"""
+Vector values in formulas. Arithmetic between vectors, or between a vector and a number, works element by element, so
+"color * 0.5" or "a + b" don't need comprehensions. Vectors are NumPy arrays, so each operation runs on every element at
+once. NumPy comes with Blender, but if it isn't available (e.g., when benchmarking elsewhere), vectors are a small
+tuple-based class instead. This must not import bpy.
+"""
+
+
+class _TupleVector(tuple):
+    """A tuple with element-wise arithmetic, used if NumPy isn't available"""
+
+    def _apply(self, other, fn, reverse=False):
+        if isinstance(other, (tuple, list)):
+            ours = tuple(self)
+            # As in NumPy, a sequence of length 1 is repeated to match the other
+            if len(other) != len(ours):
+                if len(other) == 1:
+                    other = tuple(other) * len(ours)
+                elif len(ours) == 1:
+                    ours = ours * len(other)
+                else:
+                    raise ValueError(f"Can't combine vectors of length {len(self)} and {len(other)}")
+            pairs = zip(other, ours) if reverse else zip(ours, other)
+        else:
+            pairs = ((other, a) for a in self) if reverse else ((a, other) for a in self)
+        return _TupleVector(fn(a, b) for a, b in pairs)
+
+    def __repr__(self):
+        return f"vec{tuple.__repr__(self)}"
+
+    def __neg__(self):
+        return _TupleVector(-a for a in self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _TupleVector(abs(a) for a in self)
+
+
+for _name, _fn in (("add", operator.add), ("sub", operator.sub), ("mul", operator.mul), ("truediv", operator.truediv),
+                   ("floordiv", operator.floordiv), ("mod", operator.mod), ("pow", operator.pow)):
+    setattr(_TupleVector, f"__{_name}__", lambda self, other, fn=_fn: self._apply(other, fn))
+    setattr(_TupleVector, f"__r{_name}__", lambda self, other, fn=_fn: self._apply(other, fn, reverse=True))
+
+
+def is_vector(value: any) -> bool:
+    return isinstance(value, _TupleVector) or (np is not None and isinstance(value, np.ndarray))
+
+
+def vec(*components) -> any:
+    """Make a vector, from components (vec(1, 2, 3)) or a sequence (vec(some_tuple))"""
+    if len(components) == 1 and hasattr(components[0], "__len__"):
+        components = components[0]
+    if np is not None:
+        return np.array(components, dtype=float)
+    return _TupleVector(float(c) for c in components)
+
+
+def to_plain(value: any) -> any:
+    """Turn vectors (and NumPy numbers) in a formula result back into tuples and plain Python numbers, including inside
+    tuples and lists, e.g., a tuple of vectors"""
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return tuple(value.tolist())
+        if isinstance(value, np.generic):
+            return value.item()
+    if isinstance(value, _TupleVector):
+        return tuple(value)
+    if type(value) in (tuple, list):
+        return type(value)(to_plain(v) for v in value)
+    return value
+
+
+def dot(a, b) -> float:
+    if np is not None:
+        return float(np.dot(a, b))
+    return math.fsum(x * y for x, y in zip(a, b, strict=True))
+
+
+def cross(a, b) -> any:
+    if np is not None:
+        return np.cross(a, b)
+    (ax, ay, az), (bx, by, bz) = a, b
+    return _TupleVector((ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx))
+
+
+def normalize(a) -> any:
+    """The vector scaled to a length of 1, or zeros if it has no length"""
+    a = vec(a)
+    length = math.sqrt(dot(a, a))
+    return a / length if length else a * 0.0
+
+
+def lerp(a, b, t):
+    """Linear interpolation from a (at t=0) to b (at t=1). Any of them can be numbers or vectors."""
+    a, b, t = (vec(v) if hasattr(v, "__len__") else v for v in (a, b, t))
+    return a + (b - a) * t
+
+
+def clamp(value, low=0.0, high=1.0):
+    """The value (number or vector) limited to the range low to high"""
+    if np is not None:
+        result = np.clip(value, low, high)
+        return result if isinstance(result, np.ndarray) else result.item()
+    if hasattr(value, "__len__"):
+        return _TupleVector(min(max(v, low), high) for v in value)
+    return min(max(value, low), high)
+
+
+FUNCTIONS = {
+    "vec": vec,
+    "dot": dot,
+    "cross": cross,
+    "normalize": normalize,
+    "lerp": lerp,
+    "clamp": clamp,
+}
+
+
+def _vector_aware(safe_fn, plain_fn):
+    # simpleeval's safe operators limit the length of repeated/concatenated sequences, which doesn't apply to vectors
+    return lambda a, b: plain_fn(a, b) if is_vector(a) or is_vector(b) else safe_fn(a, b)
+
+
+OPERATORS = DEFAULT_OPERATORS | {
+    ast.Add: _vector_aware(DEFAULT_OPERATORS[ast.Add], operator.add),
+    ast.Mult: _vector_aware(DEFAULT_OPERATORS[ast.Mult], operator.mul),
+    ast.Pow: _vector_aware(DEFAULT_OPERATORS[ast.Pow], operator.pow),
+}
+
+
+def vectorize(names: dict[str, any]) -> dict[str, any]:
+    """The names, with tuples (e.g., vector variables) turned into vectors"""
+    return {name: vec(value) if type(value) is tuple else value for name, value in names.items()}
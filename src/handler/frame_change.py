@@ -0,0 +1,52 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from ..lib import animation as animation_lib, evaluation as evaluation_lib, formula as formula_lib, write_batch
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (animation_lib, evaluation_lib, formula_lib, write_batch):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+def _apply_time_dependent_formulas(scene: bpy.types.Scene) -> None:
+    """Set the time names from the scene and apply every formula that uses them"""
+    formula_lib.set_time(*animation_lib.scene_time(scene))
+
+    # Baked or converted values are driven by their F-curves or drivers, so leave them be. Sockets can have some
+    # components driven and others not, e.g., if only some of their formulas could be converted to drivers.
+    sockets = [(s, animation_lib.animated_indices(s)) for s in evaluation_lib.time_dependent_sockets()]
+    sockets = [(s, animated) for s, animated in sockets if len(animated) < len(evaluation_lib.socket_values(s))]
+    # Formulas are evaluated together first, so parts they share (e.g., "sin(time * speed)") are evaluated once a frame
+    formula_lib.eval_batch(c.formula for s, _ in sockets for c in s.tmy_explanation.components if c.use_formula)
+
+    batch = write_batch.SocketWriteBatch()
+    for socket, animated in sockets:
+        evaluated = evaluation_lib.Evaluation(socket)
+        if evaluated.has_errors() or evaluated.is_matching():
+            continue
+        results = evaluated.get_results()
+        if animated:
+            values = evaluated.get_values()
+            results = tuple(values[index] if index in animated else result for index, result in enumerate(results))
+        batch.set(socket, results[0] if len(results) == 1 else results)
+    batch.commit()
+
+
+@persistent
+def on_frame_change(scene, depsgraph=None) -> None:
+    _apply_time_dependent_formulas(scene)
+
+
+@persistent
+def on_load(*args) -> None:
+    # Formulas drawn before the first frame change need to see the loaded file's frame
+    formula_lib.set_time(*animation_lib.scene_time(bpy.context.scene))
+
+
+REGISTER_HANDLERS = {
+    "frame_change_post": [on_frame_change],
+    "load_post": [on_load],
+}
@@ -0,0 +1,40 @@
+import bpy
+from bpy.app.handlers import persistent
+
+from ..lib import pkginfo, saved_results as saved_results_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (pkginfo, saved_results_lib):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+package_name = pkginfo.package_name()
+
+
+def _save_results_enabled() -> bool:
+    try:
+        return bpy.context.preferences.addons[package_name].preferences.save_results
+    except (AttributeError, KeyError):
+        return True
+
+
+@persistent
+def on_save_pre(*args) -> None:
+    if _save_results_enabled():
+        saved_results_lib.save(bpy.context.scene)
+    else:
+        saved_results_lib.clear(bpy.context.scene)
+
+
+@persistent
+def on_load_post(*args) -> None:
+    if _save_results_enabled():
+        saved_results_lib.load(bpy.context.scene)
+
+
+REGISTER_HANDLERS = {
+    "save_pre": [on_save_pre],
+    "load_post": [on_load_post],
+}
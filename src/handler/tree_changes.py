@@ -0,0 +1,38 @@
+from bpy.app.handlers import persistent
+
+from ..lib import tree_versions, search as search_lib, variable_usage as variable_usage_lib, \
+    stale_check as stale_check_lib, evaluation as evaluation_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    # list all imports here
+    for mod in (tree_versions, search_lib, variable_usage_lib, stale_check_lib, evaluation_lib):
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Undo, redo, and loading a file can change any node tree without running property update callbacks, so mark them all as
+changed for anything indexing annotations.
+"""
+
+
+@persistent
+def on_undo_redo(*args) -> None:
+    tree_versions.bump_all()
+
+
+@persistent
+def on_load(*args) -> None:
+    tree_versions.bump_all()
+    search_lib.reset()
+    variable_usage_lib.reset()
+    stale_check_lib.reset()
+    evaluation_lib.reset_time_dependent_index()
+
+
+REGISTER_HANDLERS = {
+    "undo_post": [on_undo_redo],
+    "redo_post": [on_undo_redo],
+    "load_post": [on_load],
+}
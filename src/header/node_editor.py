@@ -1,11 +1,11 @@
 import bpy
 from ..panel import n_panel
-from ..lib import node as node_lib
+from ..lib import node as node_lib, stale_check as stale_check_lib
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (node_lib,):  # list all imports here
+    for mod in (node_lib, stale_check_lib):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -21,3 +21,8 @@ def annotations_indicator(self, context):
         box.popover(n_panel.NODE_PT_TellMeWhyPopover.bl_idname, text="Tell Me Why", icon="INFO")
     else:
         box.popover(n_panel.NODE_PT_TellMeWhyPopover.bl_idname, text="No Annotations")
+
+    # Counted in the background (see lib/stale_check), so this doesn't evaluate anything
+    stale, errors = stale_check_lib.stale_count, stale_check_lib.error_count
+    if stale or errors:
+        layout.label(text=f"{stale} stale / {errors} error{'' if errors == 1 else 's'}", icon="ERROR")
@@ -16,12 +16,13 @@ It is required by the __init__.py, so don't remove it unless you fix dependencie
 """
 
 
-def menuitem(cls: bpy.types.Operator | bpy.types.Menu, operator_context: str = "EXEC_DEFAULT") -> Callable:
+def menuitem(cls: bpy.types.Operator | bpy.types.Menu, operator_context: str = "EXEC_DEFAULT",
+             text: str = None) -> Callable:
     if issubclass(cls, bpy.types.Operator):
         def operator_fn(self, context):
             self.layout.operator_context = operator_context
             if (not hasattr(cls, "can_show")) or cls.can_show(context):
-                self.layout.operator(cls.bl_idname)
+                self.layout.operator(cls.bl_idname, **({"text": text} if text else {}))
 
         return operator_fn
     if issubclass(cls, bpy.types.Menu):
@@ -32,6 +33,14 @@ def menuitem(cls: bpy.types.Operator | bpy.types.Menu, operator_context: str = "
     raise Exception(f"Tell Me Why: Unknown menu type for menu {cls}. The developer screwed up.")
 
 
+def redraw_areas(area_type: str = "NODE_EDITOR") -> None:
+    """Tag every area of the type for redraw, e.g., after something drawn in it changes outside of an operator"""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == area_type:
+                area.tag_redraw()
+
+
 def warn_unregisterable(registerable_modules: list[ModuleType]) -> None:
     def can_register(module: ModuleType) -> bool:
         return hasattr(module, "REGISTER_CLASSES") or hasattr(module, "REGISTER_FUNCTIONS") or hasattr(module, "UNREGISTER_FUNCTIONS")
@@ -0,0 +1,63 @@
+from typing import Sequence
+
+import bpy
+from bpy.types import NodeSocket, Scene
+
+"""
+Helpers for animating socket values, used by the frame change handler and for baking formulas to keyframes.
+"""
+
+
+def scene_time(scene: Scene) -> tuple[float, float]:
+    """Return the current (frame, fps) of the scene, including subframes and the fps base"""
+    fps = scene.render.fps / scene.render.fps_base
+    return scene.frame_current + scene.frame_subframe, fps
+
+
+def _action(socket: NodeSocket, create: bool = False) -> bpy.types.Action | None:
+    tree = socket.id_data
+    if not tree.animation_data:
+        if not create:
+            return None
+        tree.animation_data_create()
+    if not tree.animation_data.action and create:
+        tree.animation_data.action = bpy.data.actions.new(name=f"{tree.name}Action")
+    return tree.animation_data.action
+
+
+def animated_indices(socket: NodeSocket) -> set[int]:
+    """The indices of the socket's default value that have F-curves or drivers, e.g., from having been baked or
+    converted"""
+    animation_data = socket.id_data.animation_data
+    if not animation_data:
+        return set()
+    data_path = socket.path_from_id("default_value")
+    value = socket.default_value
+    indices = range(len(value)) if hasattr(value, "__len__") and not isinstance(value, str) else (0,)
+    action = animation_data.action
+    return {index for index in indices if (action and action.fcurves.find(data_path, index=index))
+            or animation_data.drivers.find(data_path, index=index)}
+
+
+def is_animated(socket: NodeSocket) -> bool:
+    """Whether any part of the socket's default value has F-curves or drivers"""
+    return bool(animated_indices(socket))
+
+
+def write_fcurve(socket: NodeSocket, index: int, frames: Sequence[float], values: Sequence[float],
+                 group: str = None) -> bpy.types.FCurve:
+    """Replace the F-curve for the given default value index with a keyframe on every frame"""
+    action = _action(socket, create=True)
+    data_path = socket.path_from_id("default_value")
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve:
+        action.fcurves.remove(fcurve)
+    fcurve = action.fcurves.new(data_path, index=index, action_group=group or socket.node.name)
+
+    # Add and set all the points at once rather than using keyframe_insert for each
+    fcurve.keyframe_points.add(len(frames))
+    fcurve.keyframe_points.foreach_set("co", [c for co in zip(frames, values) for c in co])
+    fcurve.keyframe_points.foreach_set("interpolation", [bpy.types.Keyframe.bl_rna.properties[
+        "interpolation"].enum_items["LINEAR"].value] * len(frames))
+    fcurve.update()
+    return fcurve
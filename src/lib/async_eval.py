@@ -0,0 +1,157 @@
+import multiprocessing
+import time
+from multiprocessing.pool import AsyncResult, Pool
+from pathlib import Path
+
+import bpy
+
+from . import formula as formula_lib, addon, pkginfo, pool
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (formula_lib, addon, pkginfo, pool, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Evaluation of slow formulas off the UI thread. Formulas are first tried inline with a small time budget, and any that
+run over it are handed to a worker process. Formulas that could get stuck in a single long function call (see
+formula.may_block), which the budget can't interrupt, go straight to the worker. Results are posted back to the formula
+cache by a bpy.app.timers timer, and anything drawn in the meantime is shown as "computing". The timer also stops the
+worker if a formula takes too long, since only a process can be stopped partway through a function call.
+"""
+
+package_name = pkginfo.package_name()
+
+# Formulas that take longer than this (in seconds) to evaluate inline are handed off to the worker process
+INLINE_BUDGET = 0.005
+# Used if the preferences aren't available
+DEFAULT_TIMEOUT = 5.0
+# How often to check for finished formulas, in seconds
+POLL_INTERVAL = 0.05
+
+_addon_path = Path(__file__).parents[1]
+
+# A single worker process, started when first needed, and stopped (and started again later) if a formula gets stuck
+_pool: Pool | None = None
+# (variables version, cache key): result of the worker's evaluate_one
+_pending: dict[tuple[int, any], AsyncResult] = {}
+# (variables version, cache key): time the formula was handed to the worker, so time spent queued counts too
+_submitted: dict[tuple[int, any], float] = {}
+# (variables version, cache key): error message
+_failed: dict[tuple[int, any], str] = {}
+_failed_version: int = -1
+
+
+def _timeout() -> float:
+    try:
+        return bpy.context.preferences.addons[package_name].preferences.formula_timeout
+    except (AttributeError, KeyError):
+        return DEFAULT_TIMEOUT
+
+
+def _stop_worker() -> None:
+    """Stop the worker process, even partway through a formula, and forget everything it was given"""
+    global _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool = None
+    _pending.clear()
+    _submitted.clear()
+
+
+def _poll() -> float | None:
+    """Timer callback that moves finished results from the worker into the formula cache"""
+    timeout = _timeout()
+    now = time.perf_counter()
+    changed = False
+
+    for key, result in list(_pending.items()):
+        if result.ready():
+            del _pending[key]
+            del _submitted[key]
+            try:
+                ok, value = result.get()
+            except Exception as e:
+                ok, value = False, f"Formula raised an exception: {e}"
+            if ok:
+                formula_lib.store_result(*key, value)
+                instrument.count("background_eval", "finished")
+            else:
+                _failed[key] = value
+                instrument.count("background_eval", "failed")
+            changed = True
+
+    # The worker evaluates formulas in the order they were handed to it, so the oldest is the one it's working on. It
+    # stops itself at the timeout unless it's stuck in a long function call, so give it some leeway.
+    oldest = min(_submitted, key=_submitted.get, default=None)
+    if oldest is not None and now - _submitted[oldest] > timeout * 1.5:
+        _failed[oldest] = "Formula took too long to evaluate"
+        instrument.count("background_eval", "timed_out")
+        # Formulas queued behind it are handed to a new worker when they're next drawn
+        _stop_worker()
+        changed = True
+
+    if changed:
+        addon.redraw_areas()
+
+    return POLL_INTERVAL if _pending else None
+
+
+def _submit(key: tuple[int, any], formula: str) -> None:
+    global _pool
+    worker = pool.worker_module()
+    if _pool is None:
+        # "spawn" starts a clean Python process rather than forking all of Blender
+        _pool = multiprocessing.get_context("spawn").Pool(1, initializer=worker.load, initargs=(str(_addon_path),))
+
+    # Snapshot everything the worker needs, since it can't read scene data
+    variables = formula_lib.time_names() | formula_lib.eval_all_variables()
+    _pending[key] = _pool.apply_async(worker.evaluate_one, (formula, variables, _timeout()))
+    _submitted[key] = time.perf_counter()
+    instrument.count("background_eval", "submitted")
+
+    if not bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL)
+
+
+def eval_formula(formula: str, expect_len: int = None, extend_to_expected: bool = False,
+                 expect_number: bool = False) -> tuple[float, ...]:
+    """Like formula.eval_formula, but formulas that take too long are evaluated in the background. Raises
+    FormulaPendingException until the result is ready, and FormulaExecutionException if it failed or timed out."""
+    global _failed_version
+
+    # Variables must be evaluated before getting the version, in case they've changed
+    formula_lib.eval_all_variables()
+    version = formula_lib.variables_version()
+    if version != _failed_version:
+        _failed.clear()
+        _failed_version = version
+    key = (version, formula_lib.cache_key(formula))
+
+    if (error := _failed.get(key, None)) is not None:
+        raise formula_lib.FormulaExecutionException(error)
+    if key in _pending:
+        raise formula_lib.FormulaPendingException()
+
+    if formula_lib.may_block(formula) and not formula_lib.is_cached(formula):
+        _submit(key, formula)
+        raise formula_lib.FormulaPendingException()
+    try:
+        return formula_lib.eval_formula(formula, expect_len, extend_to_expected, budget=INLINE_BUDGET,
+                                        expect_number=expect_number)
+    except formula_lib.FormulaTimeoutException:
+        _submit(key, formula)
+        raise formula_lib.FormulaPendingException()
+
+
+def shutdown() -> None:
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+    _stop_worker()
+    _failed.clear()
+
+
+UNREGISTER_FUNCTIONS = [shutdown]
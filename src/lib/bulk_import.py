@@ -0,0 +1,129 @@
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from bpy.types import ID, NodeSocket, NodeTree
+
+from . import explanation as explanation_lib, node as node_lib
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (explanation_lib, node_lib, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Importing annotations in bulk from a JSON file, e.g., one generated by a pipeline, or saved by the JSON Lines export.
+The file is either JSON Lines with one annotation per line, or a JSON list of annotations (optionally as the
+"annotations" member of an object). Each annotation is found by its "owner" (the material, light, scene, or node group
+name), "node" (node name), and "socket" (input socket identifier), and optionally "owner_type" (e.g., "materials") if
+the owner name isn't unique. The rest is as in explanation_to_dict.
+"""
+
+REQUIRED_KEYS = ("owner", "node", "socket")
+
+
+class UnmatchedException(Exception):
+    pass
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    # (annotation label, reason)
+    unmatched: list[tuple[str, str]] = field(default_factory=list)
+
+
+class SocketLookup:
+    """Finds input sockets by owner, node name, and socket identifier. The owners are listed once, and a map of each
+    node tree's sockets is built the first time something in it is looked up."""
+
+    def __init__(self):
+        # owner name: [(owner type, owner, node tree)]
+        self._owners: dict[str, list[tuple[str, ID, NodeTree]]] = {}
+        for owner_type, owner, tree in node_lib.iter_node_trees():
+            self._owners.setdefault(owner.name, []).append((owner_type, owner, tree))
+        # node tree pointer: {(node name, socket identifier): socket}
+        self._sockets: dict[int, dict[tuple[str, str], NodeSocket]] = {}
+
+    def _tree(self, owner_name: str, owner_type: str | None) -> NodeTree:
+        candidates = [(t, tree) for t, _, tree in self._owners.get(owner_name, []) if owner_type in {None, t}]
+        if not candidates:
+            raise UnmatchedException("no such node tree")
+        if len(candidates) > 1:
+            raise UnmatchedException(f"more than one node tree is named \"{owner_name}\", so give its owner_type")
+        return candidates[0][1]
+
+    def _tree_sockets(self, tree: NodeTree) -> dict[tuple[str, str], NodeSocket]:
+        pointer = tree.as_pointer()
+        if (sockets := self._sockets.get(pointer, None)) is None:
+            sockets = {(node.name, socket.identifier): socket for node in tree.nodes for socket in node.inputs}
+            self._sockets[pointer] = sockets
+        return sockets
+
+    def find(self, owner_name: str, node_name: str, socket_identifier: str, owner_type: str = None) -> NodeSocket:
+        """Find an input socket, raising UnmatchedException if it can't be found"""
+        sockets = self._tree_sockets(self._tree(owner_name, owner_type))
+        if (socket := sockets.get((node_name, socket_identifier), None)) is not None:
+            return socket
+        if not any(name == node_name for name, _ in sockets):
+            raise UnmatchedException("no such node")
+        raise UnmatchedException("no such input socket")
+
+
+def read_annotations(fh: TextIO, json_lines: bool) -> Iterator[dict[str, any]]:
+    """Read annotations from the file. Raises ValueError if it isn't valid JSON."""
+    if json_lines:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+        return
+    data = json.load(fh)
+    if isinstance(data, dict):
+        data = data.get("annotations", None)
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of annotations, or an object with an \"annotations\" list")
+    yield from data
+
+
+def _label(annotation: any) -> str:
+    if not isinstance(annotation, dict):
+        return repr(annotation)[:40]
+    return " > ".join(str(annotation.get(key, "?")) for key in REQUIRED_KEYS)
+
+
+def _validate(annotation: any) -> None:
+    if not isinstance(annotation, dict):
+        raise UnmatchedException("not an object")
+    missing = [key for key in REQUIRED_KEYS if not isinstance(annotation.get(key, None), str)]
+    if missing:
+        raise UnmatchedException(f"missing {', '.join(missing)}")
+    components = annotation.get("components", [])
+    if not (isinstance(components, list) and all(isinstance(c, dict) for c in components)):
+        raise UnmatchedException("components must be a list of objects")
+
+
+@instrument.timed
+def import_annotations(filepath: str) -> ImportResult:
+    """Apply the annotations in the file to their sockets, replacing any existing annotations. Raises ValueError if the
+    file isn't valid JSON, and OSError if it can't be read."""
+    # Read everything before changing anything, so an invalid file doesn't leave a partial import
+    with open(filepath, "r", encoding="utf-8") as fh:
+        annotations = list(read_annotations(fh, filepath.lower().endswith(".jsonl")))
+
+    lookup = SocketLookup()
+    result = ImportResult()
+    for annotation in annotations:
+        try:
+            _validate(annotation)
+            socket = lookup.find(annotation["owner"], annotation["node"], annotation["socket"],
+                                 annotation.get("owner_type", None))
+        except UnmatchedException as e:
+            result.unmatched.append((_label(annotation), str(e)))
+            continue
+        explanation_lib.apply_explanation_dict(socket, annotation)
+        result.imported += 1
+    return result
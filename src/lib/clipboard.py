@@ -0,0 +1,87 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from bpy.types import Node
+
+from . import explanation as explanation_lib, node as node_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (explanation_lib, node_lib):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Copying a node's annotations, and pasting them onto other nodes. Annotations are held as plain data (see
+explanation_to_dict) and pasted to sockets with the same identifier and type.
+"""
+
+
+@dataclass(frozen=True)
+class CopiedAnnotations:
+    # The copied node's bl_idname
+    node_type: str
+    # (socket identifier, socket type): explanation data
+    sockets: dict[tuple[str, str], dict[str, any]]
+
+
+_copied: CopiedAnnotations | None = None
+
+
+def copied() -> CopiedAnnotations | None:
+    return _copied
+
+
+def copy_node(node: Node) -> int:
+    """Copy the node's active annotations, replacing anything copied before. Returns the number of sockets copied."""
+    global _copied
+    sockets = {}
+    for socket in node.inputs:
+        explanation = getattr(socket, "tmy_explanation", None)
+        if explanation and explanation.active:
+            sockets[(socket.identifier, socket.type)] = explanation_lib.explanation_to_dict(explanation)
+    _copied = CopiedAnnotations(node.bl_idname, sockets) if sockets else None
+    return len(sockets)
+
+
+def paste_to_node(node: Node) -> int:
+    """Paste the copied annotations onto the node's matching sockets. Returns the number of sockets pasted to."""
+    if _copied is None:
+        return 0
+    pasted = 0
+    for socket in node.inputs:
+        if (data := _copied.sockets.get((socket.identifier, socket.type), None)) is not None:
+            explanation_lib.apply_explanation_dict(socket, data)
+            pasted += 1
+    return pasted
+
+
+def _group_nodes(nodes: Iterable[Node], node_type: str) -> Iterable[Node]:
+    """Nodes of the type in the node groups used by the nodes, and the groups in those. Groups linked from a library
+    are skipped, since they can't be changed in this file."""
+    for tree in node_lib.iter_nested_trees(node.node_tree for node in nodes if node.type == "GROUP"):
+        if node_lib.is_library_data(tree):
+            continue
+        for inner in tree.nodes:
+            if inner.bl_idname == node_type:
+                yield inner
+
+
+def paste(nodes: Iterable[Node], into_groups: bool = False) -> tuple[int, int]:
+    """Paste the copied annotations onto the nodes. If into_groups is set, also paste onto nodes of the same type as
+    the copied node inside any node groups among the nodes. Returns the number of nodes and sockets pasted to."""
+    if _copied is None:
+        return 0, 0
+    nodes = list(nodes)
+    targets = nodes + list(_group_nodes(nodes, _copied.node_type)) if into_groups else nodes
+    node_count = socket_count = 0
+    seen = set()
+    for node in targets:
+        if node.as_pointer() in seen:
+            continue
+        seen.add(node.as_pointer())
+        if pasted := paste_to_node(node):
+            node_count += 1
+            socket_count += pasted
+    return node_count, socket_count
@@ -0,0 +1,88 @@
+import re
+
+from . import formula as formula_lib, variable as variable_lib
+from ..core import completion as completion_core
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (formula_lib, variable_lib, completion_core):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Formula autocompletion for the Scene's variables and the built-in functions and names, from a trie (see
+core/completion) that's only rebuilt when the variables are renamed, added, or removed.
+"""
+
+# The name (or start of a name) being typed at the end of a formula. Names can't start right after a digit (e.g., the
+# "e" in "1e").
+_TRAILING_NAME = re.compile(r"(?<![\w.])[A-Za-z_]\w*$")
+
+# Most completions to offer at once
+SEARCH_LIMIT = 50
+
+_tries = completion_core.TrieCache()
+# name: "Function" or "Built-in", for the built-in names and functions
+_builtin_kinds: dict[str, str] | None = None
+# The trie the enum items were made from, and the items. Blender needs the item strings kept alive while they're used.
+_enum_items: tuple[completion_core.NameTrie | None, list[tuple[str, str, str]]] = (None, [])
+
+
+def _builtins() -> dict[str, str]:
+    global _builtin_kinds
+    if _builtin_kinds is None:
+        allowed = formula_lib.default_allowed()
+        # Some constants (e.g., pi) are also listed as functions
+        _builtin_kinds = {name: "Function" if callable(fn) else "Built-in" for name, fn in allowed["functions"].items()}
+        _builtin_kinds |= {name: "Built-in" for name in allowed["names"]}
+    return _builtin_kinds
+
+
+def name_trie() -> completion_core.NameTrie:
+    """A trie of every name formulas in the Scene can use"""
+    return _tries.get([*_builtins(), *(v.name for v in variable_lib.get_scene_variables())])
+
+
+def name_kind(name: str) -> str:
+    return _builtins().get(name, "Variable")
+
+
+def names_with_prefix(prefix: str, limit: int = None) -> list[str]:
+    return name_trie().with_prefix(prefix, limit)
+
+
+def _insertion(name: str) -> str:
+    """The text to insert for the name, which opens the call for functions"""
+    return f"{name}(" if name_kind(name) == "Function" else name
+
+
+def complete(formula: str, name: str) -> str:
+    """The formula with name in place of the name being typed at the end of it, or added to the end if there isn't
+    one"""
+    match = _TRAILING_NAME.search(formula)
+    if match and name.startswith(match[0]):
+        head = formula[:match.start()]
+    else:
+        head = f"{formula} " if formula and formula[-1] not in " ([{," else formula
+    return head + _insertion(name)
+
+
+def enum_items(self, context) -> list[tuple[str, str, str]]:
+    """Every name formulas can use, as items for an EnumProperty"""
+    global _enum_items
+    trie = name_trie()
+    if _enum_items[0] is not trie:
+        _enum_items = (trie, [(name, name, name_kind(name)) for name in trie.with_prefix("")])
+    return _enum_items[1]
+
+
+def search_formula(self, context, edit_text: str) -> list[tuple[str, str]]:
+    """Completions of the name being typed at the end of the formula, as whole formulas with descriptions, for the
+    formula field's search callback"""
+    match = _TRAILING_NAME.search(edit_text)
+    if not match:
+        return []
+    head = edit_text[:match.start()]
+    return [(head + _insertion(name), name_kind(name)) for name in names_with_prefix(match[0], SEARCH_LIMIT)
+            if name != match[0]]
@@ -0,0 +1,236 @@
+import ast
+import copy
+import keyword
+import math
+from dataclasses import dataclass, field
+
+import bpy
+from bpy.types import NodeSocket, Scene
+
+from . import formula as formula_lib, util, variable as variable_lib
+from ..core import vector as core_vector
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (formula_lib, util, variable_lib, core_vector):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Conversion of formulas to native Blender drivers. Blender evaluates "simple expressions" (a small subset of Python:
+arithmetic, comparisons, and a fixed set of functions) without the Python interpreter, so formulas that fit that subset
+get live values with no Python overhead. Others can still become (slower) Python drivers if allowed.
+"""
+
+# Scene custom properties that hold variable values for driver variables to read are named with this prefix
+PROPERTY_PREFIX = "tmy_"
+
+# Functions and operators supported by Blender's simple expression evaluator
+SIMPLE_FUNCTIONS = {"min", "max", "radians", "degrees", "abs", "fabs", "floor", "ceil", "trunc", "round", "int", "sin",
+                    "cos", "tan", "asin", "acos", "atan", "atan2", "exp", "log", "sqrt", "pow", "fmod"}
+SIMPLE_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+SIMPLE_UNARYOPS = (ast.UAdd, ast.USub, ast.Not)
+# Names available in every driver expression
+DRIVER_NAMES = {"frame", "pi", "True", "False"}
+# Names that need to be replaced with an equivalent expression
+REPLACED_NAMES = {
+    "tau": "(2 * pi)",
+    "eulers": repr(math.e),
+    "fps": "(fps / fps_base)",
+    "time": "(frame / (fps / fps_base))",
+}
+# Driver variables used by the replacements above, as name: scene data path
+TIME_VARIABLES = {"fps": "render.fps", "fps_base": "render.fps_base"}
+
+
+class DriverConversionException(Exception):
+    pass
+
+
+@dataclass
+class DriverExpression:
+    expression: str
+    # Driver variable name: Scene data path
+    variables: dict[str, str] = field(default_factory=dict)
+    # Scene variable names whose values need to be stored in custom properties
+    scene_variables: set[str] = field(default_factory=set)
+    # If the expression can't use the simple expression fast path, this is why
+    python_reason: str | None = None
+
+    @property
+    def is_simple(self) -> bool:
+        return self.python_reason is None
+
+
+def property_name(variable_name: str) -> str:
+    return f"{PROPERTY_PREFIX}{variable_name}"
+
+
+def _driver_variable_name(name: str, index: int | None = None) -> str:
+    # Driver variable names must be valid identifiers that don't start with an underscore
+    name = name if index is None else f"{name}_{index}"
+    if name.startswith("_") or keyword.iskeyword(name) or name in SIMPLE_FUNCTIONS or name in DRIVER_NAMES:
+        name = f"{PROPERTY_PREFIX}{name.lstrip('_')}"
+    return name
+
+
+class _DriverTransformer(ast.NodeTransformer):
+    """Rewrites a formula AST into a driver expression, collecting driver variables and noting anything that needs
+    Python. Raises DriverConversionException if the formula can't be a driver at all."""
+
+    def __init__(self, variables: dict[str, float | tuple[float, ...]], allowed_functions: set[str]):
+        self.variables = variables
+        self.allowed_functions = allowed_functions
+        self.result = DriverExpression("")
+
+    def _needs_python(self, reason: str):
+        if self.result.python_reason is None:
+            self.result.python_reason = reason
+
+    def _scene_variable(self, name: str, index: int | None = None) -> ast.Name:
+        driver_name = _driver_variable_name(name, index)
+        path = f'["{property_name(name)}"]' + (f"[{index}]" if index is not None else "")
+        self.result.variables[driver_name] = path
+        self.result.scene_variables.add(name)
+        return ast.Name(id=driver_name, ctx=ast.Load())
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float, bool):
+            raise DriverConversionException(f"Unsupported value {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id in self.variables:
+            if util.is_iterable(self.variables[node.id]):
+                raise DriverConversionException(f"Vector variable \"{node.id}\" must be used with an index")
+            return self._scene_variable(node.id)
+        if node.id in DRIVER_NAMES:
+            return node
+        if node.id in REPLACED_NAMES:
+            if node.id in ("fps", "time"):
+                self.result.variables |= TIME_VARIABLES
+            return ast.parse(REPLACED_NAMES[node.id], mode="eval").body
+        raise DriverConversionException(f"Unsupported name \"{node.id}\"")
+
+    def visit_Subscript(self, node):
+        # Only constant indexes of vector variables, which are read as single custom property array elements
+        if (isinstance(node.value, ast.Name) and util.is_iterable(self.variables.get(node.value.id, None))
+                and isinstance(node.slice, ast.Constant) and type(node.slice.value) is int):
+            length = len(self.variables[node.value.id])
+            index = node.slice.value if node.slice.value >= 0 else node.slice.value + length
+            if 0 <= index < length:
+                return self._scene_variable(node.value.id, index)
+        raise DriverConversionException("Only constant indexes of vector variables are supported")
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in self.allowed_functions:
+            raise DriverConversionException("Unsupported function")
+        if node.func.id not in SIMPLE_FUNCTIONS:
+            self._needs_python(f"\"{node.func.id}\" is not a simple expression function")
+        if node.keywords:
+            self._needs_python("Keyword arguments are not supported in simple expressions")
+        node.args = [self.visit(a) for a in node.args]
+        node.keywords = [self.visit(k) for k in node.keywords]
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, SIMPLE_BINOPS):
+            self._needs_python(f"The {type(node.op).__name__} operator is not supported in simple expressions")
+        return self.generic_visit(node)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, SIMPLE_UNARYOPS):
+            self._needs_python(f"The {type(node.op).__name__} operator is not supported in simple expressions")
+        return self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        if len(node.ops) > 1:
+            self._needs_python("Chained comparisons are not supported in simple expressions")
+        return self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        return self.generic_visit(node)
+
+    def visit_IfExp(self, node):
+        return self.generic_visit(node)
+
+    def visit_keyword(self, node):
+        return self.generic_visit(node)
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.IfExp,
+                                 ast.keyword, ast.operator, ast.unaryop, ast.cmpop, ast.boolop, ast.expr_context)):
+            raise DriverConversionException(f"{type(node).__name__} expressions are not supported")
+        return super().generic_visit(node)
+
+
+def _component_nodes(tree: ast.expr, variables: dict, expect_len: int) -> list[ast.expr]:
+    """Split a formula's AST into one AST per component"""
+    if expect_len == 1:
+        return [tree]
+    if isinstance(tree, (ast.Tuple, ast.List)) and tree.elts and not any(
+            isinstance(e, ast.Starred) for e in tree.elts):
+        elements = tree.elts[:expect_len]
+    elif isinstance(tree, ast.Name) and util.is_iterable(variables.get(tree.id, None)):
+        elements = [ast.Subscript(value=ast.Name(id=tree.id, ctx=ast.Load()), slice=ast.Constant(value=i),
+                                  ctx=ast.Load()) for i in range(min(len(variables[tree.id]), expect_len))]
+    else:
+        # A single value is used for every component, as when it's evaluated
+        elements = [tree]
+    # Short results are extended with their last value, as when they are evaluated. Each component's AST is transformed
+    # in place, so they mustn't share nodes.
+    return elements + [copy.deepcopy(elements[-1]) for _ in range(expect_len - len(elements))]
+
+
+def to_driver_expressions(formula: str, expect_len: int,
+                          variables: dict[str, float | tuple[float, ...]]) -> list[DriverExpression]:
+    """Convert a formula to one driver expression for each of expect_len components"""
+    try:
+        tree = ast.parse(formula.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise DriverConversionException(f"Invalid formula: {e}")
+
+    # Vector functions aren't available to drivers
+    allowed_functions = set(formula_lib.default_allowed()["functions"].keys()) - set(core_vector.FUNCTIONS)
+    expressions = []
+    for node in _component_nodes(tree, variables, expect_len):
+        transformer = _DriverTransformer(variables, allowed_functions)
+        transformed = transformer.visit(ast.Expression(body=node))
+        transformer.result.expression = ast.unparse(transformed)
+        expressions.append(transformer.result)
+    return expressions
+
+
+def sync_properties(scene: Scene, names: set[str] = None) -> None:
+    """Store the values of scene variables in the custom properties read by driver variables. If no names are given,
+    update the properties that already exist."""
+    values = formula_lib.eval_all_variables()
+    for variable in variable_lib.get_scene_variables():
+        prop = property_name(variable.name)
+        if not (variable.name in names if names is not None else prop in scene):
+            continue
+        # Variables that failed are left out
+        if (value := values.get(variable.name, None)) is None:
+            continue
+        scene[prop] = list(value) if util.is_iterable(value) else value
+    # Drivers don't otherwise notice custom property changes until the next depsgraph update
+    scene.update_tag()
+
+
+def add_driver(socket: NodeSocket, index: int | None, expression: DriverExpression, scene: Scene) -> None:
+    """Replace any driver on the socket's default value (or one component of it) with the driver expression"""
+    fcurve = socket.driver_add("default_value", index) if index is not None else socket.driver_add("default_value")
+    driver = fcurve.driver
+    driver.type = "SCRIPTED"
+    for variable in list(driver.variables):
+        driver.variables.remove(variable)
+    for name, path in expression.variables.items():
+        variable = driver.variables.new()
+        variable.name = name
+        variable.type = "SINGLE_PROP"
+        target = variable.targets[0]
+        target.id_type = "SCENE"
+        target.id = scene
+        target.data_path = path
+    driver.expression = expression.expression
@@ -1,167 +1,115 @@
-from typing import Iterable
+from collections.abc import Iterable, Iterator
 
-import bpy
-from bpy.types import NodeSocket
+from bpy.types import Node, NodeSocket, NodeTree
 
-from ..lib import formula as formula_lib, util
+from ..core import evaluation as core_evaluation, instrument
+from ..core.evaluation import ValueErrorException
+from ..lib import async_eval, formula as formula_lib, node as node_lib, tree_index, util
 from ..props import explanation as explanation_props
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (explanation_props, formula_lib, util):  # list all imports here
+    # list all imports here
+    for mod in (explanation_props, core_evaluation, async_eval, formula_lib, node_lib, tree_index, util, instrument):
         importlib.reload(mod)
 _LOADED = True
 
 
-class ValueErrorException(Exception):
-    pass
-
-
-class Evaluation:
-    _values: tuple = tuple()
-    _results: tuple[float, ...] = tuple()
-    _formulas: tuple[str, ...] = tuple()
-    _matches: tuple[bool, ...] = tuple()
-    _errors: tuple[bool, ...] = tuple()
-    _split_components: bool = False
-
-    def __init__(self, socket: NodeSocket):
-        explanation = socket.tmy_explanation
-
-        self._values = tuple(socket.default_value) if util.is_iterable(socket.default_value) else (
-            socket.default_value,)
-        self._split_components = explanation.split_components
-
-        if not self._split_components:
-            if not explanation.components[0].use_formula:
-                self._results = self._values
-                self._formulas = ("",) * len(self._values)
-                self._matches = (True,) * len(self._values)
-                self._errors = (False,)
-                return
-
-            self._formulas = (explanation.components[0].formula,)
-            self._process_results(
-                explanation.components[0].formula,
-                len(self._values),
-                True
-            )
-            self._process_matches()
-            return
-
-        for c_idx, component in enumerate(explanation.components):
-            if not component.use_formula:
-                self._formulas += (self._values[c_idx],)
-                self._results += (self._values[c_idx],)
-                self._matches += (True,)
-                self._errors += (False,)
-                continue
-            self._process_results(
-                component.formula,
-                expect_len=1,
-                extend_to_expected=(not self._split_components)
-            )
-
-        self._process_matches()
-
-    def _process_results(self, formula, expect_len: int, extend_to_expected: bool):
-        """Evaluate the formula and store the results or the error state"""
-        self._formulas += (formula,)
-
-        if formula == "":
-            self._results += (0.0,) * expect_len
-            self._errors += (True,) * expect_len
-            return
-
-        try:
-            result = formula_lib.eval_formula(
-                formula,
-                expect_len=expect_len,
-                extend_to_expected=extend_to_expected
-            )
-            self._results += result
-            self._errors += (False,) * expect_len
-        except formula_lib.FormulaExecutionException as e:
-            self._results += (0.0,) * expect_len
-            self._errors += (True,) * expect_len
-
-    def _process_matches(self):
-        comparison = [util.compare_scalars(value, self._results[idx]) for idx, value in enumerate(self._values)]
-        self._matches = tuple(comparison)
-
-    def get_results(self) -> tuple[float]:
-        if self.has_errors():
-            raise ValueErrorException("Evaluation failed and results are invalid")
-        return self._results
-
-    def is_index_matching(self, index: int, force_split_components: bool = False):
-        # If we have a single input (un-split components) we need to compare the whole result,
-        # not just the 0th index.
-
-        if index == 0 and not (self._split_components or force_split_components):
-            return self.is_matching()
-
-        # If we do have split components, or we've forced the matter, compare only the indexed value
-        return self._matches[index]
-
-    def is_matching(self):
-        return False not in self._matches
-
-    def is_error(self, index):
-        return self._errors[index]
-
-    def has_errors(self):
-        return True in self._errors
-
-    def get_formulas(self) -> tuple[str, ...]:
-        return self._formulas
-
-    def apply_result(self, current_value: float | Iterable[float], index: int = 0,
-                     force_split_components: bool = False) -> float | tuple[float]:
-        """Combine the given result index with the given one and return the results, considering split components and
-        scalar/list values"""
-        results = self.get_results()
-
-        # It's a safe assumption that a single-item result indicates a scalar
-        if len(results) == 1:
-            return results[0]
-
-        if index != 0 or self._split_components or force_split_components:
-            current_value: list[float] = list(current_value)
-            current_value[index] = results[index]
-            return tuple(current_value)
-
-        return results
-
-
-def _has_formula(socket: NodeSocket):
+class Evaluation(core_evaluation.Evaluation):
+    @instrument.timed
+    def __init__(self, socket: NodeSocket, background: bool = False):
+        """Evaluate the socket's formulas. If background is set, slow formulas are evaluated in the background and
+        marked as pending until they finish, rather than blocking (e.g., while drawing the UI)."""
+        super().__init__(
+            socket_values(socket),
+            socket_components(socket),
+            socket.tmy_explanation.split_components,
+            eval_formula=async_eval.eval_formula if background else formula_lib.eval_formula,
+            tolerance=node_lib.socket_type(socket).tolerance
+        )
+
+
+def socket_values(socket: NodeSocket) -> tuple:
+    """The socket's value as formulas see it: its components, or a datablock's name (None if it's empty)"""
+    if node_lib.socket_type(socket).reference:
+        return getattr(socket.default_value, "name", None),
+    return tuple(socket.default_value) if util.is_iterable(socket.default_value) else (socket.default_value,)
+
+
+def socket_components(socket: NodeSocket) -> tuple[core_evaluation.Component, ...]:
+    return tuple(core_evaluation.Component(c.use_formula, c.formula) for c in socket.tmy_explanation.components)
+
+
+def has_formula(socket: NodeSocket):
     return hasattr(socket, "tmy_explanation") and socket.tmy_explanation.active and any(
         [c for c in socket.tmy_explanation.components if c.use_formula])
 
 
+def has_time_dependent_formula(socket: NodeSocket):
+    """Whether any of the socket's active formulas use the frame, fps, or time names"""
+    return any(formula_lib.is_time_dependent(c.formula) for c in socket.tmy_explanation.components if c.use_formula)
+
+
+def iter_formula_sockets() -> Iterator[tuple[node_lib.SocketLocator, NodeSocket]]:
+    """Yield (locator, socket) for all Node Inputs that have active formulas"""
+    for locator, socket in node_lib.iter_annotated_sockets():
+        if has_formula(socket):
+            yield locator, socket
+
+
+@instrument.timed
 def find_formula_sockets():
     """Find all Node Inputs that have active formulas"""
-    # Only these locations are scanned for nodes when creating the formula report. Other node types,
-    # such as those created in newer versions of Blender, should not be allowed to run,
-    # because the user cannot verify them.
+    return {socket for _, socket in iter_formula_sockets()}
+
+
+def find_formula_sockets_in_nodes(nodes: Iterable[Node]) -> set[NodeSocket]:
+    """Find the Node Inputs of the nodes that have active formulas, without scanning the whole file"""
+    return {socket for node in nodes for socket in node.inputs if has_formula(socket)}
+
+
+def find_formula_sockets_in_trees(trees: Iterable[NodeTree]) -> set[NodeSocket]:
+    """Find the Node Inputs in the node trees that have active formulas, skipping trees from libraries"""
+    return find_formula_sockets_in_nodes(
+        node for tree in trees if not node_lib.is_library_data(tree) for node in tree.nodes)
+
+
+def find_time_dependent_sockets():
+    """Find all Node Inputs that have active formulas using the frame, fps, or time names"""
+    return {socket for socket in find_formula_sockets() if has_time_dependent_formula(socket)}
+
+
+class _TimeDependentIndex(tree_index.TreeIndex):
+    name = "time_dependent_index"
+
+    def __init__(self):
+        super().__init__()
+        self.locators: set[node_lib.SocketLocator] = set()
+
+    def add_socket(self, locator, socket) -> bool:
+        if not (has_formula(socket) and has_time_dependent_formula(socket)):
+            return False
+        self.locators.add(locator)
+        return True
+
+    def remove_socket(self, locator) -> None:
+        self.locators.discard(locator)
+
 
-    node_locations = {
-        "nodes": ["node_groups"],
-        "node_tree.nodes": ["materials", "lights", "scenes"],
-    }
+_time_dependent_index = _TimeDependentIndex()
 
-    sockets = set()
 
-    for loc in node_locations["nodes"]:
-        for thing in getattr(bpy.data, loc, []):
-            for node in thing.nodes:
-                sockets |= {socket for socket in node.inputs if _has_formula(socket)}
+@instrument.timed
+def time_dependent_sockets() -> list[NodeSocket]:
+    """Like find_time_dependent_sockets, but from an index that only re-indexes the node trees that have changed, so
+    it's quick enough to call on every frame"""
+    found = _time_dependent_index.lookup(
+        lambda: [(locator, locator.socket()) for locator in _time_dependent_index.locators],
+        lambda pairs: [locator for locator, socket in pairs if socket is None])
+    return [socket for _, socket in found if socket is not None]
 
-    for loc in node_locations["node_tree.nodes"]:
-        for thing in getattr(bpy.data, loc, []):
-            if hasattr(thing, "node_tree") and hasattr(thing.node_tree, "nodes") and len(thing.node_tree.nodes):
-                for node in thing.node_tree.nodes:
-                    sockets |= {socket for socket in node.inputs if _has_formula(socket)}
 
-    return sockets
+def reset_time_dependent_index() -> None:
+    """Throw away the index of time dependent sockets, e.g., when the file changes"""
+    _time_dependent_index.reset()
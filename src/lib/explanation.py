@@ -0,0 +1,62 @@
+from bpy.types import NodeSocket
+
+from . import node as node_lib
+from ..props import explanation as explanation_props
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib, explanation_props):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Socket annotations (TMYExplanation) as plain data, e.g., for exporting, importing, or copying them between sockets.
+"""
+
+
+def component_to_dict(component: explanation_props.ComponentValueExplanation) -> dict[str, any]:
+    return {
+        "description": component.description,
+        "use_formula": component.use_formula,
+        "formula": component.formula,
+        "type": component.type,
+        "length": component.length,
+    }
+
+
+def explanation_to_dict(explanation: explanation_props.TMYExplanation) -> dict[str, any]:
+    return {
+        "description": explanation.description,
+        "split_components": explanation.split_components,
+        "components": [component_to_dict(component) for component in explanation.components],
+    }
+
+
+def apply_explanation_dict(socket: NodeSocket, data: dict[str, any]) -> None:
+    """Replace the socket's annotation with one from plain data (see explanation_to_dict). Components are matched to the
+    socket's value by position, so missing ones are left empty and extra ones are ignored. If components aren't split,
+    only the first is used, as set_split_components leaves them."""
+    explanation = socket.tmy_explanation
+    # Clear the components first, so setting split_components has nothing to collapse
+    explanation.components.clear()
+    explanation.split_components = bool(data.get("split_components", True))
+    explanation.description = str(data.get("description", ""))
+
+    # As in CreateSocketExplanation, sockets with no default value can have a description but no components
+    if not hasattr(socket, "default_value"):
+        explanation.active = True
+        return
+
+    sources = data.get("components", [])
+    if not explanation.split_components:
+        sources = sources[:1]
+    types = node_lib.get_value_types(socket)
+    for index, value_type in enumerate(types):
+        source = sources[index] if index < len(sources) else {}
+        component = explanation.components.add()
+        component.type = value_type
+        component.description = str(source.get("description", ""))
+        component.formula = str(source.get("formula", ""))
+        component.use_formula = bool(source.get("use_formula", False))
+    explanation.active = bool(types)
@@ -0,0 +1,156 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from bpy.types import NodeSocket
+
+from . import evaluation as evaluation_lib, explanation as explanation_lib, node as node_lib
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (evaluation_lib, explanation_lib, node_lib, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Reports of every annotated socket, with its formulas, their results, and whether they match the socket's value. Sockets
+are read, evaluated, and written one at a time, so a report of a large file doesn't need to be held in memory.
+"""
+
+# format: (label, file extension)
+FORMATS = {
+    "JSONL": ("JSON Lines", ".jsonl"),
+    "CSV": ("CSV", ".csv"),
+    "MARKDOWN": ("Markdown", ".md"),
+}
+
+CSV_COLUMNS = ("owner_type", "owner", "node", "socket", "socket_name", "socket_type", "socket_description", "value",
+               "component", "component_description", "use_formula", "formula", "result", "status")
+
+
+def _status(evaluation: evaluation_lib.Evaluation, index: int, use_formula: bool) -> str:
+    if not use_formula:
+        return "value"
+    if evaluation.is_error(index):
+        return "error"
+    return "match" if evaluation.is_index_matching(index) else "mismatch"
+
+
+def socket_record(locator: node_lib.SocketLocator, socket: NodeSocket) -> dict[str, any]:
+    """A socket's annotation as plain data, with the results of its formulas"""
+    record = explanation_lib.explanation_to_dict(socket.tmy_explanation)
+    # Sockets without values (e.g., shader sockets) can only have a description, so there's nothing to evaluate.
+    # Datablocks are written by name.
+    has_value = hasattr(socket, "default_value")
+    values = list(evaluation_lib.socket_values(socket)) if has_value else None
+    evaluation = evaluation_lib.Evaluation(socket) if has_value else None
+    # Only the first component is used if components aren't split
+    components = record["components"] if record["split_components"] else record["components"][:1]
+    for index, component in enumerate(components):
+        if evaluation is None:
+            component["result"] = None
+            component["status"] = "error" if component["use_formula"] else "value"
+            continue
+        component["result"] = list(evaluation.component_result(index)) if component["use_formula"] else None
+        component["status"] = _status(evaluation, index, component["use_formula"])
+    return {
+        "owner_type": locator.owner_type,
+        "owner": locator.owner_name,
+        "node": locator.node_name,
+        "socket": locator.socket_identifier,
+        "socket_name": socket.name,
+        "socket_type": socket.type,
+        "value": values,
+        "description": record["description"],
+        "split_components": record["split_components"],
+        "components": components,
+    }
+
+
+def iter_records() -> Iterator[dict[str, any]]:
+    for locator, socket in node_lib.iter_annotated_sockets():
+        yield socket_record(locator, socket)
+
+
+def _cell(value: any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def write_jsonl(records: Iterable[dict[str, any]], fh: TextIO) -> int:
+    """One JSON object per socket, per line"""
+    count = 0
+    for record in records:
+        fh.write(json.dumps(record, ensure_ascii=False))
+        fh.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records: Iterable[dict[str, any]], fh: TextIO) -> int:
+    """One row per formula component"""
+    writer = csv.writer(fh)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for record in records:
+        for index, component in enumerate(record["components"]):
+            writer.writerow((
+                record["owner_type"], record["owner"], record["node"], record["socket"], record["socket_name"],
+                record["socket_type"], record["description"], _cell(record["value"]), index,
+                component["description"], component["use_formula"], component["formula"], _cell(component["result"]),
+                component["status"],
+            ))
+        count += 1
+    return count
+
+
+def _md(value: any) -> str:
+    return _cell(value).replace("\\", "\\\\").replace("|", "\\|").replace("\r", "").replace("\n", "<br>")
+
+
+def write_markdown(records: Iterable[dict[str, any]], fh: TextIO) -> int:
+    """A table per node tree owner, starting a new one whenever the owner changes"""
+    count = 0
+    owner = None
+    fh.write("# Annotations\n")
+    for record in records:
+        if (record["owner_type"], record["owner"]) != owner:
+            owner = (record["owner_type"], record["owner"])
+            fh.write(f"\n## {_md(record['owner'])} ({_md(record['owner_type'])})\n\n")
+            fh.write("| Node | Socket | Description | Value | Formula | Result | Status |\n")
+            fh.write("| --- | --- | --- | --- | --- | --- | --- |\n")
+        for index, component in enumerate(record["components"]):
+            first = not index
+            description = " / ".join(text for text in (record["description"] if first else "",
+                                                       component["description"]) if text)
+            fh.write("| " + " | ".join((
+                _md(record["node"]) if first else "",
+                _md(record["socket_name"]) if first else "",
+                _md(description),
+                _md(record["value"]) if first else "",
+                f"`{_md(component['formula'])}`" if component["use_formula"] else "",
+                _md(component["result"]),
+                component["status"],
+            )) + " |\n")
+        count += 1
+    return count
+
+
+WRITERS = {
+    "JSONL": write_jsonl,
+    "CSV": write_csv,
+    "MARKDOWN": write_markdown,
+}
+
+
+@instrument.timed
+def export(filepath: str, file_format: str) -> int:
+    """Write a report of every annotated socket to the file. Returns the number of sockets written."""
+    with open(filepath, "w", encoding="utf-8", newline="") as fh:
+        return WRITERS[file_format](iter_records(), fh)
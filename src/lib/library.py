@@ -0,0 +1,60 @@
+import os
+
+import bpy
+from bpy.types import Library
+
+from . import evaluation as evaluation_lib, node as node_lib
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (evaluation_lib, node_lib, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Node trees linked or overridden from library files can't be changed in this file, so scans and Apply All Formulas skip
+them (see node.iter_node_trees). Their formulas are still counted for reports, and the counts are cached by library
+file path, modification time, and the datablocks linked from it, so a library's node trees are only scanned again when
+its file changes or datablocks are linked from it or removed.
+"""
+
+# (type, name) of each datablock linked from a library
+LinkedIDs = frozenset[tuple[str, str]]
+
+# (absolute library file path, modification time, linked datablocks): number of sockets with formulas
+_counts: dict[tuple[str, float, LinkedIDs], int] = {}
+
+
+def _library_key(library: Library) -> tuple[str, float | None, LinkedIDs]:
+    filepath = bpy.path.abspath(library.filepath, library=library.library)
+    linked = frozenset((data.bl_rna.identifier, data.name) for data in library.users_id)
+    try:
+        return filepath, os.path.getmtime(filepath), linked
+    except OSError:
+        # Missing library. There's no way to tell if it has changed, so it isn't cached.
+        return filepath, None, linked
+
+
+@instrument.timed
+def count_library_formulas() -> dict[str, int]:
+    """The number of sockets with formulas in each library's node trees, by library file path"""
+    keys = {library.as_pointer(): _library_key(library) for library in bpy.data.libraries}
+    counts = {key: _counts[key] for key in keys.values() if key in _counts}
+    instrument.count("library_formula_cache", "hit", len(counts))
+    stale = {pointer for pointer, key in keys.items() if key not in counts}
+    if stale:
+        instrument.count("library_formula_cache", "miss", len(stale))
+        for pointer in stale:
+            counts[keys[pointer]] = 0
+        for _, owner, tree in node_lib.iter_node_trees(include_library=True):
+            library = node_lib.data_library(owner)
+            if library is None or library.as_pointer() not in stale:
+                continue
+            counts[keys[library.as_pointer()]] += sum(
+                1 for node in tree.nodes for socket in node.inputs if evaluation_lib.has_formula(socket))
+        for pointer in stale:
+            if keys[pointer][1] is not None:
+                _counts[keys[pointer]] = counts[keys[pointer]]
+    return {filepath: count for (filepath, _, _), count in counts.items()}
@@ -1,21 +1,32 @@
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from bpy.types import Node, NodeSocket
-
-def socket_type_label(socket: NodeSocket):
-    return {
-        socket.type: socket.type.capitalize(),
-        "INT": "Integer",
-        "VALUE": "Float",
-        "STRING": "String",
-        "VECTOR": "X, Y, Z",
-        "RGBA": "R, G, B, A",
-        "SHADER": "Node",
-        "OBJECT": "Object",
-        "IMAGE": "Image",
-        "TEXTURE": "Texture",
-        "MATERIAL": "Material",
-        "COLLECTION": "Collection"
-    }[socket.type]
+
+import bpy
+from bpy.types import ID, Library, Node, NodeSocket, NodeTree, Scene
+
+from ..core import socket_types
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (socket_types,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+# bpy.data collections holding datablocks with embedded node trees, if they can't be found from RNA (see
+# node_tree_owner_types)
+NODE_TREE_OWNERS = ("materials", "lights", "worlds", "linestyles", "textures", "scenes")
+
+_owner_types: tuple[str, ...] | None = None
+
+
+def socket_type(socket: NodeSocket) -> socket_types.SocketType:
+    """What's known about the socket's type (see core/socket_types)"""
+    return socket_types.lookup(socket.type, socket.bl_idname)
+
+
+def socket_type_label(socket: NodeSocket) -> str:
+    return socket_type(socket).label
 
 
 def default_value_string(socket: NodeSocket, unprintable: str = "---", float_fix: int = 3):
@@ -38,22 +49,12 @@ def default_value_string(socket: NodeSocket, unprintable: str = "---", float_fix
     return unprintable
 
 
-def get_value_types(socket: NodeSocket) -> list[str]:
-    types = {
-        "INT": ["int"],
-        "VALUE": ["float"],
-        "VECTOR": ["float", "float", "float"],
-        "ROTATION": ["float", "float", "float", "float"],
-        "RGBA": ["float", "float", "float", "float"],
-        "BOOLEAN": ["bool"]
-    }
-    for t in ["STRING", "SHADER", "OBJECT", "IMAGE", "TEXTURE", "MATERIAL", "COLLECTION"]:
-        types[t] = ["string"]
-    return types[socket.type] if socket.type in types else []
+def get_value_types(socket: NodeSocket) -> tuple[str, ...]:
+    return socket_type(socket).component_types
 
 
-def can_value_numeric_compare(socket: NodeSocket):
-    return socket.type in ["INT", "VALUE", "VECTOR", "RGBA"]
+def can_value_numeric_compare(socket: NodeSocket) -> bool:
+    return socket_type(socket).numeric_compare
 
 
 @dataclass
@@ -79,3 +80,156 @@ def get_node_explanation_state(node: Node | None) -> ExplanationState:
         if node_state.has_explained and node_state.has_unexplained:
             return node_state
     return node_state
+
+
+def node_tree_owner_types() -> tuple[str, ...]:
+    """The bpy.data collections whose datablocks own an embedded node tree (e.g., "materials", "worlds"), found once
+    from RNA so that every owner in this version of Blender is included"""
+    global _owner_types
+    if _owner_types is None:
+        try:
+            _owner_types = tuple(
+                prop.identifier for prop in bpy.types.BlendData.bl_rna.properties
+                if prop.type == "COLLECTION" and (tree_prop := prop.fixed_type.properties.get("node_tree")) is not None
+                and tree_prop.type == "POINTER" and tree_prop.fixed_type.identifier == "NodeTree"
+            )
+        except AttributeError:
+            _owner_types = NODE_TREE_OWNERS
+    return _owner_types
+
+
+def is_library_data(data: ID) -> bool:
+    """Whether the datablock is linked or overridden from a library file, so it can't be changed in this file"""
+    return data.library is not None or data.override_library is not None
+
+
+def data_library(data: ID) -> Library | None:
+    """The library file the datablock is linked or overridden from, if any"""
+    if data.library is not None:
+        return data.library
+    override = data.override_library
+    return override.reference.library if override is not None and override.reference is not None else None
+
+
+def iter_node_trees(include_library: bool = False) -> Iterator[tuple[str, ID, NodeTree]]:
+    """Yield (bpy.data collection name, owning datablock, node tree) once for every node tree that Tell Me Why looks
+    at: node groups, and the node trees embedded in other datablocks, which are all trees the user can open in a Node
+    Editor and check. For node groups, the owner is the node tree itself. Unless include_library is set, trees whose
+    owners are linked or overridden from libraries are skipped (see lib/library)."""
+    seen = set()
+    for group in bpy.data.node_groups:
+        seen.add(group.as_pointer())
+        if include_library or not is_library_data(group):
+            yield "node_groups", group, group
+    for owner_type in node_tree_owner_types():
+        for owner in getattr(bpy.data, owner_type):
+            tree = owner.node_tree
+            if tree is None or (pointer := tree.as_pointer()) in seen:
+                continue
+            seen.add(pointer)
+            if include_library or not is_library_data(owner):
+                yield owner_type, owner, tree
+
+
+def iter_nested_trees(trees: Iterable[NodeTree]) -> Iterator[NodeTree]:
+    """Yield the node trees and the node groups used in them (and in those, and so on), each once"""
+    seen = set()
+    pending = list(trees)
+    while pending:
+        tree = pending.pop()
+        if tree is None or tree.as_pointer() in seen:
+            continue
+        seen.add(tree.as_pointer())
+        yield tree
+        pending.extend(node.node_tree for node in tree.nodes if node.type == "GROUP")
+
+
+def scene_node_trees(scene: Scene) -> list[NodeTree]:
+    """The node trees the scene uses directly: its compositor and world, and its objects' materials, lights, and
+    Geometry Nodes modifiers. Use iter_nested_trees to include the node groups they use."""
+    trees = [getattr(scene, "node_tree", None), scene.world and scene.world.node_tree]
+    for obj in scene.objects:
+        trees.extend(slot.material.node_tree for slot in obj.material_slots if slot.material)
+        if obj.type == "LIGHT":
+            trees.append(obj.data.node_tree)
+        trees.extend(modifier.node_group for modifier in obj.modifiers if modifier.type == "NODES")
+    return [tree for tree in trees if tree is not None]
+
+
+def iter_annotated_sockets() -> Iterator[tuple["SocketLocator", NodeSocket]]:
+    """Yield (locator, socket) for every input socket with an active annotation, one at a time, so callers that don't
+    need them all at once (e.g., exports) use constant memory"""
+    for owner_type, owner, tree in iter_node_trees():
+        for node in tree.nodes:
+            for socket in node.inputs:
+                explanation = getattr(socket, "tmy_explanation", None)
+                if explanation and explanation.active:
+                    yield SocketLocator.of(owner_type, owner, node, socket), socket
+
+
+@dataclass(frozen=True)
+class SocketLocator:
+    """Where to find a node input socket by name, so it can be stored (e.g., in a report) and found again later"""
+    owner_type: str
+    owner_name: str
+    node_name: str
+    socket_identifier: str
+
+    @classmethod
+    def of(cls, owner_type: str, owner: ID, node: Node, socket: NodeSocket) -> "SocketLocator":
+        return cls(owner_type, owner.name, node.name, socket.identifier)
+
+    @classmethod
+    def find(cls, socket: NodeSocket) -> "SocketLocator | None":
+        """The locator of a socket whose owner isn't known, found by looking through the node trees"""
+        pointer = socket.id_data.as_pointer()
+        for owner_type, owner, tree in iter_node_trees(include_library=True):
+            if tree.as_pointer() == pointer:
+                return cls.of(owner_type, owner, socket.node, socket)
+        return None
+
+    def tree(self) -> NodeTree | None:
+        owner = getattr(bpy.data, self.owner_type, {}).get(self.owner_name)
+        if owner is None:
+            return None
+        return owner if self.owner_type == "node_groups" else getattr(owner, "node_tree", None)
+
+    def node(self) -> Node | None:
+        tree = self.tree()
+        return tree.nodes.get(self.node_name) if tree else None
+
+    def socket(self) -> NodeSocket | None:
+        node = self.node()
+        if node is None:
+            return None
+        return next((socket for socket in node.inputs if socket.identifier == self.socket_identifier), None)
+
+    @property
+    def label(self) -> str:
+        return f"{self.owner_name} > {self.node_name} > {self.socket_identifier}"
+
+
+def frame_node(context, tree: NodeTree, node: Node) -> bool:
+    """Show the tree in the context's Node Editor, then select the node and center the view on it. Returns False if
+    the context has no Node Editor to show it in."""
+    space = context.space_data
+    if space is None or space.type != "NODE_EDITOR":
+        return False
+
+    if space.edit_tree != tree:
+        space.tree_type = tree.bl_idname
+        # Pinning lets the editor show trees that don't belong to the active object, like other materials
+        space.pin = True
+        space.node_tree = tree
+
+    for other in tree.nodes:
+        other.select = False
+    node.select = True
+    tree.nodes.active = node
+
+    # The operator is usually run from the sidebar, but view_selected needs the main region
+    region = next((r for r in context.area.regions if r.type == "WINDOW"), None)
+    if region is not None:
+        with context.temp_override(area=context.area, region=region):
+            bpy.ops.node.view_selected()
+    return True
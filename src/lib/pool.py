@@ -0,0 +1,77 @@
+import importlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable
+
+from . import formula as formula_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (formula_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Batch evaluation of formulas in a process pool, for applying formulas across very large files. Workers run the same
+bpy-free formula engine (core/formula) as the addon. Results are put into the formula cache, so the usual (main thread)
+evaluation picks them up without evaluating again.
+"""
+
+# Starting worker processes takes a while, so don't bother for fewer formulas than this
+POOL_MIN_JOBS = 256
+# Formulas are sent to workers in batches to keep the inter-process overhead down
+BATCH_SIZE = 128
+
+_addon_path = Path(__file__).parents[1]
+
+
+def worker_module() -> ModuleType:
+    """The module worker processes run (worker/tmy_formula_worker). It's imported as a top-level module, not as part of
+    the addon, so worker processes can import it (to unpickle its functions) without importing bpy."""
+    worker_path = str(_addon_path / "worker")
+    if worker_path not in sys.path:
+        sys.path.append(worker_path)
+    return importlib.import_module("tmy_formula_worker")
+
+
+def _batches(items: list[str], size: int) -> Iterable[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def prime_cache(formulas: Iterable[str]) -> int:
+    """Evaluate all uncached formulas in a process pool and cache the results. Returns the number of results cached,
+    or 0 if there weren't enough formulas to be worth starting a pool."""
+    # eval_all_variables MUST come first, as it invalidates the cache if variables have changed
+    variables = formula_lib.eval_all_variables()
+    version = formula_lib.variables_version()
+    jobs = [f for f in set(formulas) if f and not formula_lib.is_cached(f)]
+    if len(jobs) < POOL_MIN_JOBS:
+        return 0
+
+    time_names = formula_lib.time_names()
+    worker = worker_module()
+    workers = min(os.cpu_count() or 1, -(-len(jobs) // BATCH_SIZE))
+    stored = 0
+
+    # "spawn" starts clean Python processes rather than forking all of Blender
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=worker.initialize,
+            initargs=(str(_addon_path), variables, time_names["frame"], time_names["fps"])
+    ) as executor:
+        batches = list(_batches(jobs, BATCH_SIZE))
+        for batch, results in zip(batches, executor.map(worker.evaluate, batches)):
+            for formula, (ok, result) in zip(batch, results):
+                # Failures aren't cached, so they are evaluated (and reported) as usual
+                if ok:
+                    formula_lib.store_result(version, formula_lib.cache_key(formula), result)
+                    stored += 1
+
+    return stored
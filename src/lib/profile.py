@@ -0,0 +1,93 @@
+import time
+from dataclasses import dataclass
+
+import bpy
+
+from . import pkginfo, evaluation as evaluation_lib, formula as formula_lib, node as node_lib, util
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (pkginfo, evaluation_lib, formula_lib, node_lib, util):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Times every formula in the file, to find the ones that make Apply All or drawing slow.
+"""
+
+package_name = pkginfo.package_name()
+
+# Used if the preferences aren't available
+DEFAULT_TIMEOUT = 5.0
+
+
+@dataclass
+class FormulaProfile:
+    locator: node_lib.SocketLocator
+    component_index: int
+    formula: str
+    # Times are in seconds
+    mean: float = 0.0
+    max: float = 0.0
+    result_size: int = 0
+    error: str = ""
+
+
+@dataclass
+class _Timing:
+    mean: float
+    max: float
+    result_size: int
+    error: str
+
+
+def _timeout() -> float:
+    try:
+        return bpy.context.preferences.addons[package_name].preferences.formula_timeout
+    except (AttributeError, KeyError):
+        return DEFAULT_TIMEOUT
+
+
+def _result_size(result) -> int:
+    return len(result) if util.is_iterable(result) and type(result) is not str else 1
+
+
+def _time_formula(formula: str, variables: dict, repeat: int, timeout: float) -> _Timing:
+    """Evaluate the formula up to repeat times, bypassing the cache. Stops early if it fails or takes too long."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = formula_lib.eval_uncached(formula, variables, budget=timeout)
+        except formula_lib.FormulaExecutionException as e:
+            elapsed = time.perf_counter() - start
+            return _Timing(elapsed, elapsed, 0, str(e))
+        durations.append(time.perf_counter() - start)
+        # A formula this slow has made its point, and more runs would only hold up the UI
+        if durations[-1] > timeout / repeat:
+            break
+    return _Timing(sum(durations) / len(durations), max(durations), _result_size(result), "")
+
+
+def profile_formulas(repeat: int = 5) -> list[FormulaProfile]:
+    """Time every active formula in the file, repeat times each. Returns the profiles, slowest (by mean) first.
+    Formulas used in more than one place are only timed once."""
+    variables = formula_lib.eval_all_variables()
+    timeout = _timeout()
+    timings: dict[str, _Timing] = {}
+    profiles = []
+
+    for locator, socket in evaluation_lib.iter_formula_sockets():
+        for index, component in enumerate(socket.tmy_explanation.components):
+            if not component.use_formula:
+                continue
+            formula = component.formula
+            if formula not in timings:
+                timings[formula] = _time_formula(formula, variables, repeat, timeout)
+            timing = timings[formula]
+            profiles.append(FormulaProfile(locator, index, formula, timing.mean, timing.max, timing.result_size,
+                                           timing.error))
+
+    return sorted(profiles, key=lambda profile: profile.mean, reverse=True)
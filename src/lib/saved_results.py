@@ -0,0 +1,61 @@
+import json
+
+from bpy.types import Scene
+
+from . import evaluation as evaluation_lib, formula as formula_lib
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (evaluation_lib, formula_lib, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Formula results saved with the file, so reopening it doesn't start with every formula unevaluated. The results are
+stored as one JSON string on the Scene (where the variables are), each with a hash of its formula and the variables it
+uses, and are only put back in the formula cache if that hash still matches.
+"""
+
+PROPERTY = "tmy_formula_results"
+FORMAT_VERSION = 1
+
+_PLAIN_TYPES = (bool, int, float, str)
+
+
+def _is_plain(value: any) -> bool:
+    return isinstance(value, _PLAIN_TYPES) or (
+            isinstance(value, (list, tuple)) and all(isinstance(v, _PLAIN_TYPES) for v in value))
+
+
+@instrument.timed
+def save(scene: Scene) -> int:
+    """Store the cached results of the formulas in the file on the scene. Returns the number stored."""
+    formulas = {component.formula for _, socket in evaluation_lib.iter_formula_sockets()
+                for component in socket.tmy_explanation.components if component.use_formula}
+    snapshot = formula_lib.snapshot_results(formulas, formula_lib.eval_all_variables())
+    results = {formula: entry for formula, entry in snapshot.items() if _is_plain(entry[1])}
+    scene[PROPERTY] = json.dumps({"version": FORMAT_VERSION, "results": results}, separators=(",", ":"))
+    return len(results)
+
+
+def clear(scene: Scene) -> None:
+    if PROPERTY in scene:
+        del scene[PROPERTY]
+
+
+@instrument.timed
+def load(scene: Scene) -> int:
+    """Put the results stored on the scene back in the formula cache, if they're still valid. Returns the number
+    restored."""
+    try:
+        data = json.loads(scene.get(PROPERTY, ""))
+        if data.get("version", None) != FORMAT_VERSION:
+            return 0
+        # Start from the loaded file's variables, so only results that match them are restored
+        formula_lib.reset_variable_cache()
+        return formula_lib.restore_results(data["results"], formula_lib.eval_all_variables())
+    except (TypeError, ValueError, KeyError, AttributeError):
+        # Missing or unreadable. The results will just be evaluated again.
+        return 0
@@ -0,0 +1,136 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from bpy.types import NodeSocket
+
+from . import node as node_lib, tree_index
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib, tree_index, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Full-text search over annotation descriptions and formulas, using an inverted index (word: sockets) that is built the
+first time it's needed. After that, only node trees that have changed are re-indexed.
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    locator: node_lib.SocketLocator
+    socket_name: str
+    # The socket description, or its first formula if there is no description
+    preview: str
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _socket_texts(socket: NodeSocket) -> list[str]:
+    explanation = socket.tmy_explanation
+    texts = [explanation.description]
+    for component in explanation.components:
+        texts.append(component.description)
+        if component.use_formula:
+            texts.append(component.formula)
+    return [text for text in texts if text]
+
+
+class _SearchIndex(tree_index.TreeIndex):
+    name = "search_index"
+
+    def __init__(self):
+        super().__init__()
+        # locator: (search result, words)
+        self.documents: dict[node_lib.SocketLocator, tuple[SearchResult, set[str]]] = {}
+        # word: locators of sockets using the word
+        self.postings: dict[str, set[node_lib.SocketLocator]] = {}
+        # All words in postings, sorted for prefix lookups. None if it needs rebuilding.
+        self._sorted_words: list[str] | None = None
+
+    def add_socket(self, locator: node_lib.SocketLocator, socket: NodeSocket) -> bool:
+        texts = _socket_texts(socket)
+        words = {word for text in texts for word in tokenize(text)}
+        if not words:
+            return False
+        self.documents[locator] = (SearchResult(locator, socket.name, texts[0]), words)
+        for word in words:
+            self.postings.setdefault(word, set()).add(locator)
+        self._sorted_words = None
+        return True
+
+    def remove_socket(self, locator: node_lib.SocketLocator) -> None:
+        _, words = self.documents.pop(locator)
+        for word in words:
+            locators = self.postings[word]
+            locators.discard(locator)
+            if not locators:
+                del self.postings[word]
+        self._sorted_words = None
+
+    def words_with_prefix(self, prefix: str) -> list[str]:
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self.postings)
+        words = []
+        index = bisect_left(self._sorted_words, prefix)
+        while index < len(self._sorted_words) and self._sorted_words[index].startswith(prefix):
+            words.append(self._sorted_words[index])
+            index += 1
+        return words
+
+    def find(self, terms: list[str]) -> set[node_lib.SocketLocator]:
+        matches = None
+        for term in terms:
+            term_matches = set().union(*(self.postings[word] for word in self.words_with_prefix(term)))
+            matches = term_matches if matches is None else matches & term_matches
+            if not matches:
+                break
+        return matches or set()
+
+
+_index = _SearchIndex()
+_last_search: tuple[tuple[str, int, int], list[SearchResult]] | None = None
+
+
+@instrument.timed
+def refresh() -> int:
+    """Bring the index up to date. Returns the number of node trees re-indexed."""
+    return _index.refresh()
+
+
+@instrument.timed
+def search(query: str, limit: int = 100) -> list[SearchResult]:
+    """Find sockets whose descriptions or formulas contain words starting with every word in the query, e.g.,
+    "ior tw" matches "Tweak the IOR". Returns up to limit results, ordered by location."""
+    def find() -> list[SearchResult]:
+        global _last_search
+        key = (query, _index.generation, limit)
+        if _last_search and _last_search[0] == key:
+            return _last_search[1]
+        matches = _index.find(tokenize(query))
+        ordered = sorted(matches, key=lambda loc: (loc.owner_name, loc.node_name, loc.socket_identifier))
+        results = [_index.documents[locator][0] for locator in ordered[:limit]]
+        _last_search = (key, results)
+        return results
+
+    return _index.lookup(find, lambda results: (result.locator for result in results))
+
+
+def count_matches(query: str) -> int:
+    _index.refresh()
+    return len(_index.find(tokenize(query)))
+
+
+def reset() -> None:
+    """Throw away the index, e.g., when the file changes"""
+    global _last_search
+    _index.reset()
+    _last_search = None
@@ -0,0 +1,124 @@
+import time
+from collections import deque
+
+import bpy
+
+from . import addon, evaluation as evaluation_lib, node as node_lib, tree_index
+from ..core import result_table, instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (result_table, addon, evaluation_lib, node_lib, tree_index, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+A running count of stale formulas (whose socket values don't match their results) and formulas with errors, for the
+Node Editor header. A bpy.app.timers timer re-checks a few sockets each tick, round-robin, and stops when it runs out
+of its time budget, so the counts are kept up to date without evaluating anything while drawing. Each socket's values
+and results are kept in a result_table, so the counts for the whole file come from one comparison over the table.
+"""
+
+# Time to spend checking sockets per tick, in seconds. A tick can run over by one check, which is itself limited to
+# async_eval.INLINE_BUDGET before the formula is handed to the background.
+TICK_BUDGET = 0.003
+# Time between ticks, in seconds
+TICK_INTERVAL = 0.25
+
+stale_count: int = 0
+error_count: int = 0
+# locator: current values and results, for every formula socket checked so far
+_table = result_table.ResultTable()
+# Sockets left to check in this round
+_queue: deque[node_lib.SocketLocator] = deque()
+
+
+class _FormulaIndex(tree_index.TreeIndex):
+    name = "stale_check_index"
+
+    def __init__(self):
+        super().__init__()
+        self.locators: set[node_lib.SocketLocator] = set()
+
+    def add_socket(self, locator, socket) -> bool:
+        if not evaluation_lib.has_formula(socket):
+            return False
+        self.locators.add(locator)
+        return True
+
+    def remove_socket(self, locator) -> None:
+        self.locators.discard(locator)
+        _table.discard(locator)
+
+
+_index = _FormulaIndex()
+
+
+def _check(locator: node_lib.SocketLocator) -> None:
+    socket = locator.socket()
+    if socket is None:
+        # Renaming a node doesn't change the tree's version, so make sure the tree is re-indexed
+        _table.discard(locator)
+        _index.invalidate([locator])
+        return
+    if not evaluation_lib.has_formula(socket):
+        _table.discard(locator)
+        return
+    # Slow formulas are left to the background evaluator, and checked again next round
+    evaluated = evaluation_lib.Evaluation(socket, background=True)
+    if evaluated.has_errors():
+        _table.set_error(locator)
+    elif not evaluated.has_pending():
+        _table.set(locator, evaluated.get_values(), evaluated.get_results(), evaluated.tolerance)
+
+
+def _tick() -> float:
+    """Timer callback that checks sockets until it runs out of time, starting a new round when all have been checked"""
+    global stale_count, error_count
+    deadline = time.perf_counter() + TICK_BUDGET
+    if not _queue:
+        # After loading a file or undoing, every tree needs re-indexing, which is spread over as many ticks as it takes
+        _index.refresh(deadline)
+        if _index.up_to_date:
+            _queue.extend(_index.locators)
+
+    checked = 0
+    while _queue and time.perf_counter() < deadline:
+        locator = _queue.popleft()
+        try:
+            _check(locator)
+        except Exception:
+            _table.set_error(locator)
+        checked += 1
+    instrument.count("stale_check", "checked", checked)
+
+    counts = _table.counts()
+    if counts != (stale_count, error_count):
+        stale_count, error_count = counts
+        addon.redraw_areas()
+    return TICK_INTERVAL
+
+
+def reset() -> None:
+    """Forget everything, e.g., when the file changes"""
+    global stale_count, error_count
+    _queue.clear()
+    _index.reset()
+    _table.clear()
+    stale_count = error_count = 0
+
+
+def start() -> None:
+    if not bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.register(_tick, first_interval=TICK_INTERVAL, persistent=True)
+
+
+def stop() -> None:
+    if bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.unregister(_tick)
+    reset()
+
+
+REGISTER_FUNCTIONS = [start]
+UNREGISTER_FUNCTIONS = [stop]
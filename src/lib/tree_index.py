@@ -0,0 +1,128 @@
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from bpy.types import ID, NodeSocket, NodeTree
+
+from . import node as node_lib, tree_versions
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib, tree_versions, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Base for indexes over the annotated sockets in every node tree (see search and variable_usage), which are built the
+first time they're needed, and after that only re-index the node trees that have changed (see tree_versions).
+"""
+
+
+@dataclass
+class _IndexedTree:
+    owner_type: str
+    owner_name: str
+    version: tuple[int, int] | None
+    # Nodes can be added or removed without changing any annotations, e.g., by duplicating an annotated node
+    node_count: int
+    locators: list[node_lib.SocketLocator] = field(default_factory=list)
+
+
+_T = TypeVar("_T")
+
+
+class TreeIndex(ABC):
+    """An index of annotated sockets. Subclasses add sockets to, and remove them from, their own data structures in
+    add_socket and remove_socket."""
+    name = "tree_index"
+
+    def __init__(self):
+        # node tree pointer: indexed tree
+        self._trees: dict[int, _IndexedTree] = {}
+        # Incremented whenever the index changes, so results can be cached
+        self.generation = 0
+        # False if the last refresh ran out of time before re-indexing every changed tree
+        self.up_to_date = False
+
+    @abstractmethod
+    def add_socket(self, locator: node_lib.SocketLocator, socket: NodeSocket) -> bool:
+        """Index an annotated socket. Returns False if there was nothing to index."""
+
+    @abstractmethod
+    def remove_socket(self, locator: node_lib.SocketLocator) -> None:
+        """Remove a socket that add_socket indexed"""
+
+    def _drop_tree(self, pointer: int) -> None:
+        for locator in self._trees.pop(pointer).locators:
+            self.remove_socket(locator)
+
+    def _index_tree(self, pointer: int, owner_type: str, owner: ID, tree: NodeTree) -> None:
+        if pointer in self._trees:
+            self._drop_tree(pointer)
+        indexed = _IndexedTree(owner_type, owner.name, tree_versions.version(tree), len(tree.nodes))
+        for node in tree.nodes:
+            for socket in node.inputs:
+                explanation = getattr(socket, "tmy_explanation", None)
+                if explanation and explanation.active:
+                    locator = node_lib.SocketLocator.of(owner_type, owner, node, socket)
+                    if self.add_socket(locator, socket):
+                        indexed.locators.append(locator)
+        self._trees[pointer] = indexed
+
+    def refresh(self, deadline: float = None) -> int:
+        """Bring the index up to date, re-indexing only the node trees that have changed. Returns how many were. If a
+        deadline (a time.perf_counter() time) is given, trees left to re-index once it's passed are left for the next
+        refresh, and up_to_date is cleared until they're done."""
+        seen = set()
+        reindexed = 0
+        self.up_to_date = True
+        for owner_type, owner, tree in node_lib.iter_node_trees():
+            pointer = tree.as_pointer()
+            seen.add(pointer)
+            indexed = self._trees.get(pointer, None)
+            if indexed is None or indexed.version != tree_versions.version(tree) or indexed.owner_name != owner.name \
+                    or indexed.node_count != len(tree.nodes):
+                # At least one tree is re-indexed each time, so it gets there eventually
+                if deadline is not None and reindexed and time.perf_counter() > deadline:
+                    self.up_to_date = False
+                    continue
+                self._index_tree(pointer, owner_type, owner, tree)
+                reindexed += 1
+
+        for pointer in self._trees.keys() - seen:
+            self._drop_tree(pointer)
+            reindexed += 1
+
+        if reindexed:
+            self.generation += 1
+        instrument.count(self.name, "tree_reindexed", reindexed)
+        return reindexed
+
+    def invalidate(self, locators: list[node_lib.SocketLocator]) -> None:
+        """Make the next refresh re-index the trees the locators are in, e.g., if they can't be found any more"""
+        owners = {(locator.owner_type, locator.owner_name) for locator in locators}
+        for indexed in self._trees.values():
+            if (indexed.owner_type, indexed.owner_name) in owners:
+                indexed.version = None
+
+    def lookup(self, find: Callable[[], _T], locators: Callable[[_T], Iterable[node_lib.SocketLocator]]) -> _T:
+        """Refresh the index and return find(). Renaming a node doesn't change the tree's version, so if any of the
+        locators of the result can't be found, the trees they're in are re-indexed, and find() is tried again."""
+        for attempt in range(2):
+            self.refresh()
+            found = find()
+            stale = [locator for locator in locators(found) if locator.node() is None]
+            if not stale or attempt:
+                break
+            self.invalidate(stale)
+        return found
+
+    def reset(self) -> None:
+        """Throw away the index, e.g., when the file changes"""
+        for pointer in list(self._trees):
+            self._drop_tree(pointer)
+        self.generation += 1
@@ -0,0 +1,29 @@
+"""
+Edit versions for node trees, so indexes built over annotation data (e.g., search) can tell which trees have changed
+since they were built, and only redo those. Versions are bumped by update callbacks on the annotation properties, and
+everything is invalidated on undo, redo, and file load, when trees can change without any callbacks running.
+This must not import bpy or other modules in the addon, since props modules use it.
+"""
+
+# Incremented whenever all versions are invalidated, so versions from before can't be mistaken for current ones
+_epoch: int = 0
+# node tree pointer: version
+_versions: dict[int, int] = {}
+
+
+def bump(tree) -> None:
+    """Mark the node tree (e.g., the id_data of a changed socket) as changed"""
+    key = tree.as_pointer()
+    _versions[key] = _versions.get(key, 0) + 1
+
+
+def bump_all() -> None:
+    """Mark every node tree as changed"""
+    global _epoch
+    _epoch += 1
+    _versions.clear()
+
+
+def version(tree) -> tuple[int, int]:
+    """The node tree's current version. If this differs from a previously-seen version, the tree has changed."""
+    return _epoch, _versions.get(tree.as_pointer(), 0)
@@ -1,8 +1,17 @@
-import collections.abc
 import re
-from math import isclose
+import struct
 from typing import Callable
 
+from ..core import util as core_util
+from ..core.util import compare_scalars, compare_vectors, is_iterable
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (core_util,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
 
 def flatten(list_of_lists: list[list[any]]) -> list[any]:
     """Flatten a list of lists"""
@@ -71,23 +80,21 @@ def compare(a, b, float_precision: float = 0.00001):
     return compare_scalars(a, b, float_precision)
 
 
-def compare_scalars(a, b, float_precision: float = 0.00001):
-    if type(a) is float or type(b) is float:
-        return isclose(a, b, rel_tol=float_precision)
-    return a == b
-
-
-def compare_vectors(a, b, float_precision: float = 0.00001):
-    for ac, bc in zip(a, b):
-        numeric_value = type(ac) in [int, float] and type(bc) in [int, float]
-        if numeric_value:
-            if not isclose(float(ac), float(bc), rel_tol=float_precision):
-                return False
-        else:
-            if ac != bc:
-                return False
-    return True
+def as_float32(value: float) -> float:
+    """The value at the single precision Blender stores float properties with"""
+    try:
+        return struct.unpack("f", struct.pack("f", value))[0]
+    except (OverflowError, struct.error):
+        return value
 
 
-def is_iterable(thing: any):
-    return (isinstance(thing, collections.abc.Iterable) or hasattr(thing, "__getitem__")) and not isinstance(thing, str)
+def is_same_stored_value(current, new) -> bool:
+    """Returns true if setting a property's current value to new would store the same value, comparing floats at the
+    precision they're stored with"""
+    if is_iterable(current) != is_iterable(new):
+        return False
+    if is_iterable(current):
+        return len(current) == len(new) and all(is_same_stored_value(c, n) for c, n in zip(current, new))
+    if type(new) is float:
+        return as_float32(new) == current
+    return new == current
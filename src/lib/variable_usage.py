@@ -0,0 +1,179 @@
+import ast
+from dataclasses import dataclass
+
+from bpy.types import NodeSocket
+
+from . import node as node_lib, tree_index
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib, tree_index, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Which formulas use which names (e.g., Scene variables), found from the formulas' syntax trees. The index is built the
+first time it's needed, and after that only node trees that have changed are re-indexed, so finding or renaming the
+uses of a variable costs about as much as the number of uses, not the size of the file.
+"""
+
+# (line, start column, end column) of a name in a formula. As in ast, columns are offsets in the UTF-8 encoded line.
+Span = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class VariableUse:
+    locator: node_lib.SocketLocator
+    component_index: int
+    formula: str
+
+
+class _NameCollector(ast.NodeVisitor):
+    """Collects the spans of names that are read from outside the formula, skipping names bound by comprehensions
+    while inside those comprehensions"""
+
+    def __init__(self):
+        self.spans: dict[str, list[Span]] = {}
+        self._bound: list[set[str]] = []
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if not any(node.id in bound for bound in self._bound):
+            self.spans.setdefault(node.id, []).append((node.lineno, node.col_offset, node.end_col_offset))
+
+    def _visit_comprehension(self, node) -> None:
+        bound = set()
+        for index, generator in enumerate(node.generators):
+            # The first iterable is evaluated outside the comprehension, and later ones can use earlier targets
+            self.visit(generator.iter)
+            if not index:
+                self._bound.append(bound)
+            bound |= {name.id for name in ast.walk(generator.target) if isinstance(name, ast.Name)}
+            for condition in generator.ifs:
+                self.visit(condition)
+        for field in ("elt", "key", "value"):
+            if hasattr(node, field):
+                self.visit(getattr(node, field))
+        self._bound.pop()
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+
+# formula text: {name: spans}
+_name_spans_cache: dict[str, dict[str, list[Span]]] = {}
+
+
+def name_spans(formula: str) -> dict[str, list[Span]]:
+    """The names the formula reads from outside itself (e.g., variables, but not comprehension variables), and where
+    they are in formula.strip(), which is what simpleeval parses"""
+    if (spans := _name_spans_cache.get(formula, None)) is not None:
+        return spans
+    collector = _NameCollector()
+    try:
+        collector.visit(ast.parse(formula.strip(), mode="eval"))
+    except SyntaxError:
+        pass
+    _name_spans_cache[formula] = collector.spans
+    return collector.spans
+
+
+class NameCaptureException(Exception):
+    """Renaming would change the meaning of the formula, because the new name is already used in it"""
+    pass
+
+
+def rename_in_formula(formula: str, old_name: str, new_name: str) -> str:
+    """Replace uses of the name old_name with new_name, leaving everything else in the formula (such as strings, other
+    names containing old_name, and formatting) untouched. Raises NameCaptureException if the formula already uses
+    new_name, e.g., as a comprehension variable."""
+    spans = name_spans(formula).get(old_name, None)
+    if not spans:
+        return formula
+    stripped = formula.strip()
+    leading = formula[:formula.index(stripped)]
+    trailing = formula[len(leading) + len(stripped):]
+
+    lines = stripped.encode("utf-8").split(b"\n")
+    replacement = new_name.encode("utf-8")
+    # Work from the end, so earlier offsets stay valid
+    for line, start, end in sorted(spans, reverse=True):
+        text = lines[line - 1]
+        lines[line - 1] = text[:start] + replacement + text[end:]
+    renamed = leading + b"\n".join(lines).decode("utf-8") + trailing
+
+    if new_name in name_spans(formula) or len(name_spans(renamed).get(new_name, [])) != len(spans):
+        raise NameCaptureException(f"\"{new_name}\" is already used in the formula")
+    return renamed
+
+
+class _UsageIndex(tree_index.TreeIndex):
+    name = "variable_usage_index"
+
+    def __init__(self):
+        super().__init__()
+        # name: {locator: {component index: formula}}
+        self.uses: dict[str, dict[node_lib.SocketLocator, dict[int, str]]] = {}
+        # locator: names used by the socket's formulas
+        self.socket_names: dict[node_lib.SocketLocator, set[str]] = {}
+
+    def add_socket(self, locator: node_lib.SocketLocator, socket: NodeSocket) -> bool:
+        names = set()
+        for index, component in enumerate(socket.tmy_explanation.components):
+            if not component.use_formula:
+                continue
+            for name in name_spans(component.formula):
+                self.uses.setdefault(name, {}).setdefault(locator, {})[index] = component.formula
+                names.add(name)
+        if names:
+            self.socket_names[locator] = names
+        return bool(names)
+
+    def remove_socket(self, locator: node_lib.SocketLocator) -> None:
+        for name in self.socket_names.pop(locator):
+            sockets = self.uses[name]
+            del sockets[locator]
+            if not sockets:
+                del self.uses[name]
+
+
+_index = _UsageIndex()
+
+
+@instrument.timed
+def where_used(name: str) -> list[VariableUse]:
+    """Every formula component that uses the name, ordered by location"""
+    def find() -> list[VariableUse]:
+        sockets = _index.uses.get(name, {})
+        return [VariableUse(locator, index, formula)
+                for locator in sorted(sockets, key=lambda loc: (loc.owner_name, loc.node_name, loc.socket_identifier))
+                for index, formula in sorted(sockets[locator].items())]
+
+    return _index.lookup(find, lambda uses: (use.locator for use in uses))
+
+
+def rename_everywhere(old_name: str, new_name: str) -> tuple[int, list[VariableUse]]:
+    """Rename the name in every formula that uses it. Returns the number of formulas changed, and the uses that
+    couldn't be renamed because the formula already uses new_name."""
+    changed = 0
+    conflicts = []
+    for use in where_used(old_name):
+        socket = use.locator.socket()
+        if socket is None:
+            continue
+        component = socket.tmy_explanation.components[use.component_index]
+        try:
+            renamed = rename_in_formula(component.formula, old_name, new_name)
+        except NameCaptureException:
+            conflicts.append(use)
+            continue
+        if renamed != component.formula:
+            component.formula = renamed
+            changed += 1
+    return changed, conflicts
+
+
+def reset() -> None:
+    """Throw away the index, e.g., when the file changes"""
+    _index.reset()
+    _name_spans_cache.clear()
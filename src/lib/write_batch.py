@@ -0,0 +1,52 @@
+from bpy.types import NodeSocket
+
+from . import util
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (util, instrument):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+"""
+Batched writes of socket values. Values are collected first, writes that wouldn't change the stored value are dropped,
+and the rest are written grouped by node tree, once per socket, so applying many formulas doesn't set the same socket
+(and update its tree) once per component.
+"""
+
+
+class SocketWriteBatch:
+    def __init__(self):
+        # node tree pointer: {socket pointer: (socket, value)}
+        self._trees: dict[int, dict[int, tuple[NodeSocket, any]]] = {}
+
+    def set(self, socket: NodeSocket, value: any) -> bool:
+        """Queue a new value for the socket, replacing any queued before. Returns False if the value is already set."""
+        sockets = self._trees.setdefault(socket.id_data.as_pointer(), {})
+        if util.is_same_stored_value(socket.default_value, value):
+            sockets.pop(socket.as_pointer(), None)
+            instrument.count("socket_writes", "skipped")
+            return False
+        sockets[socket.as_pointer()] = (socket, value)
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(sockets) for sockets in self._trees.values())
+
+    def commit(self) -> tuple[int, int]:
+        """Write the queued values, one node tree at a time. Returns the number of sockets written and the number that
+        couldn't be (e.g., read-only values)."""
+        written = failed = 0
+        for sockets in self._trees.values():
+            for socket, value in sockets.values():
+                try:
+                    socket.default_value = value
+                    written += 1
+                except (AttributeError, TypeError, ValueError):
+                    failed += 1
+        self._trees.clear()
+        instrument.count("socket_writes", "written", written)
+        instrument.count("socket_writes", "failed", failed)
+        return written, failed
@@ -0,0 +1,70 @@
+from typing import Set
+
+from bpy.props import IntProperty
+from bpy.types import Operator
+
+from ..lib import animation as animation_lib, evaluation as evaluation_lib, formula as formula_lib, util
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (animation_lib, evaluation_lib, formula_lib, util):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class BakeFormulasToKeyframes(Operator):
+    """Bake all formulas that use frame, fps, or time to keyframes, so they animate without running any formulas"""
+    bl_idname = "tell_me_why.bake_formulas"
+    bl_label = "Bake Formulas to Keyframes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    frame_start: IntProperty(name="Start Frame")
+    frame_end: IntProperty(name="End Frame")
+
+    def invoke(self, context, event) -> Set[str]:
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context) -> Set[str]:
+        if self.frame_end < self.frame_start:
+            self.report({"ERROR"}, "The end frame must not be before the start frame")
+            return {"CANCELLED"}
+
+        frames = list(range(self.frame_start, self.frame_end + 1))
+        _, fps = animation_lib.scene_time(context.scene)
+        baked = 0
+        failures = 0
+
+        for socket in evaluation_lib.find_time_dependent_sockets():
+            explanation = socket.tmy_explanation
+            length = len(socket.default_value) if util.is_iterable(socket.default_value) else 1
+            try:
+                if not explanation.split_components:
+                    # One formula for all components, which is evaluated once per frame and split into F-curves
+                    results = formula_lib.eval_formula_frames(explanation.components[0].formula, frames, fps,
+                                                              expect_len=length, extend_to_expected=True)
+                    for index in range(length):
+                        animation_lib.write_fcurve(socket, index, frames, [r[index] for r in results])
+                else:
+                    for index, component in enumerate(explanation.components):
+                        if not (component.use_formula and formula_lib.is_time_dependent(component.formula)):
+                            continue
+                        results = formula_lib.eval_formula_frames(component.formula, frames, fps, expect_len=1)
+                        animation_lib.write_fcurve(socket, index, frames, [r[0] for r in results])
+                baked += 1
+            except formula_lib.FormulaExecutionException:
+                failures += 1
+
+        if failures:
+            self.report({"WARNING"}, f"{failures} failed. {baked} sockets baked.")
+        elif baked:
+            self.report({"INFO"}, f"{baked} sockets baked over frames {self.frame_start}-{self.frame_end}.")
+        else:
+            self.report({"WARNING"}, "No formulas use frame, fps, or time.")
+
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [BakeFormulasToKeyframes]
@@ -0,0 +1,51 @@
+from typing import Set
+
+from bpy.props import StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ImportHelper
+
+from ..lib import bulk_import as bulk_import_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (bulk_import_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+# Unmatched annotations to list individually in the report
+REPORT_LIMIT = 10
+
+
+class ImportAnnotations(Operator, ImportHelper):
+    """Add annotations to sockets from a JSON or JSON Lines file, replacing any they already have"""
+    bl_idname = "tell_me_why.import_annotations"
+    bl_label = "Import Annotations"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json;*.jsonl", options={"HIDDEN"})
+
+    def execute(self, context) -> Set[str]:
+        try:
+            result = bulk_import_lib.import_annotations(self.filepath)
+        except (OSError, UnicodeDecodeError) as e:
+            self.report({"ERROR"}, f"Could not read annotations: {e}")
+            return {"CANCELLED"}
+        except ValueError as e:
+            self.report({"ERROR"}, f"Could not import annotations, the file is not valid: {e}")
+            return {"CANCELLED"}
+
+        for label, reason in result.unmatched[:REPORT_LIMIT]:
+            self.report({"WARNING"}, f"Not imported: {label}: {reason}")
+        if len(result.unmatched) > REPORT_LIMIT:
+            self.report({"WARNING"}, f"...and {len(result.unmatched) - REPORT_LIMIT} more not imported")
+
+        summary = f"{result.imported} annotation{'' if result.imported == 1 else 's'} imported."
+        if result.unmatched:
+            summary += f" {len(result.unmatched)} could not be matched."
+        self.report({"WARNING"} if result.unmatched else {"INFO"}, summary)
+        return {"FINISHED"} if result.imported else {"CANCELLED"}
+
+
+REGISTER_CLASSES = [ImportAnnotations]
@@ -0,0 +1,62 @@
+from typing import Set
+
+from bpy.props import BoolProperty
+from bpy.types import Operator
+
+from ..lib import clipboard as clipboard_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (clipboard_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class CopyAnnotations(Operator):
+    """Copy the active node's annotations, to paste onto other nodes"""
+    bl_idname = "tell_me_why.copy_annotations"
+    bl_label = "Copy Annotations"
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return getattr(context, "active_node", None) is not None
+
+    def execute(self, context) -> Set[str]:
+        copied = clipboard_lib.copy_node(context.active_node)
+        if not copied:
+            self.report({"WARNING"}, "The active node has no annotations to copy")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Copied annotations from {copied} socket{'' if copied == 1 else 's'}")
+        return {"FINISHED"}
+
+
+class PasteAnnotations(Operator):
+    """Paste copied annotations onto the selected nodes' sockets with the same identifier and type, replacing any they
+    already have"""
+    bl_idname = "tell_me_why.paste_annotations"
+    bl_label = "Paste Annotations"
+    bl_options = {"REGISTER", "UNDO"}
+
+    into_groups: BoolProperty(
+        name="Include Node Groups",
+        description="Also paste onto nodes of the copied node's type inside selected group nodes, and the groups in "
+                    "those",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return clipboard_lib.copied() is not None and bool(getattr(context, "selected_nodes", None))
+
+    def execute(self, context) -> Set[str]:
+        node_count, socket_count = clipboard_lib.paste(context.selected_nodes, self.into_groups)
+        if not node_count:
+            self.report({"WARNING"}, "No selected nodes have matching sockets")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Pasted annotations to {socket_count} socket{'' if socket_count == 1 else 's'} on "
+                              f"{node_count} node{'' if node_count == 1 else 's'}")
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [CopyAnnotations, PasteAnnotations]
@@ -0,0 +1,46 @@
+from typing import Set
+
+from bpy.props import StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..core import instrument
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (instrument,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class ResetDiagnostics(Operator):
+    """Clear the collected timings and cache counts"""
+    bl_idname = "tell_me_why.reset_diagnostics"
+    bl_label = "Reset Diagnostics"
+
+    def execute(self, context) -> Set[str]:
+        instrument.reset()
+        return {"FINISHED"}
+
+
+class ExportDiagnostics(Operator, ExportHelper):
+    """Save the collected timings and cache counts to a JSON file"""
+    bl_idname = "tell_me_why.export_diagnostics"
+    bl_label = "Export Diagnostics"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context) -> Set[str]:
+        try:
+            with open(self.filepath, "w", encoding="utf-8") as fh:
+                fh.write(instrument.to_json())
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not save diagnostics: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Diagnostics saved to {self.filepath}")
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [ResetDiagnostics, ExportDiagnostics]
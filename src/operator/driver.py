@@ -0,0 +1,94 @@
+from typing import Set
+
+from bpy.props import BoolProperty
+from bpy.types import Operator
+
+from ..lib import driver as driver_lib, evaluation as evaluation_lib, formula as formula_lib, util
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (driver_lib, evaluation_lib, formula_lib, util):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+def _socket_label(socket) -> str:
+    return f"{socket.id_data.name} > {socket.node.name} > {socket.name}"
+
+
+class ConvertFormulasToDrivers(Operator):
+    """Convert Tell Me Why formulas in the file to drivers, which keep socket values live without running formulas"""
+    bl_idname = "tell_me_why.convert_to_drivers"
+    bl_label = "Convert Formulas to Drivers"
+    bl_options = {"REGISTER", "UNDO"}
+
+    allow_python: BoolProperty(
+        name="Allow Python Drivers",
+        description="Also convert formulas that cannot use simple expressions. These are slower, and require "
+                    "Auto Run Python Scripts to be enabled",
+        default=False
+    )
+
+    def execute(self, context) -> Set[str]:
+        variables = formula_lib.eval_all_variables()
+        used_variables = set()
+        simple = 0
+        python = 0
+        skipped = 0
+
+        for socket in evaluation_lib.find_formula_sockets():
+            explanation = socket.tmy_explanation
+            is_array = util.is_iterable(socket.default_value)
+            length = len(socket.default_value) if is_array else 1
+            if explanation.split_components:
+                jobs = [(index, component.formula, 1) for index, component in enumerate(explanation.components) if
+                        component.use_formula]
+            else:
+                jobs = [(None, explanation.components[0].formula, length)]
+
+            for index, formula, expect_len in jobs:
+                label = _socket_label(socket) if index is None else f"{_socket_label(socket)} [{index}]"
+                try:
+                    expressions = driver_lib.to_driver_expressions(formula, expect_len, variables)
+                except driver_lib.DriverConversionException as e:
+                    self.report({"WARNING"}, f"Not converted: {label}: \"{formula}\": {e}")
+                    skipped += 1
+                    continue
+
+                slow = [e.python_reason for e in expressions if not e.is_simple]
+                if slow and not self.allow_python:
+                    self.report({"WARNING"}, f"Not converted (needs Python): {label}: \"{formula}\": {slow[0]}")
+                    skipped += 1
+                    continue
+                if slow:
+                    self.report({"WARNING"}, f"Python driver (no fast path): {label}: \"{formula}\": {slow[0]}")
+                    python += 1
+                else:
+                    simple += 1
+
+                for e_idx, expression in enumerate(expressions):
+                    driver_index = (index if index is not None else e_idx) if is_array else None
+                    driver_lib.add_driver(socket, driver_index, expression, context.scene)
+                    used_variables |= expression.scene_variables
+
+        driver_lib.sync_properties(context.scene, used_variables)
+
+        summary = f"{simple} formulas converted to simple expression drivers, {python} to Python drivers, " \
+                  f"{skipped} not converted."
+        self.report({"WARNING"} if skipped or python else {"INFO"}, summary)
+        return {"FINISHED"}
+
+
+class SyncDriverVariables(Operator):
+    """Update the scene properties that drivers created from formulas use to read variable values"""
+    bl_idname = "tell_me_why.sync_driver_variables"
+    bl_label = "Update Driver Variables"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context) -> Set[str]:
+        driver_lib.sync_properties(context.scene)
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [ConvertFormulasToDrivers, SyncDriverVariables]
@@ -1,18 +1,24 @@
 from typing import Set
 
-from bpy.props import IntProperty
+import bpy
+from bpy.props import IntProperty, EnumProperty, StringProperty
 from bpy.types import Operator
 
-from ..lib import node as node_lib, evaluation as evaluation_lib, formula as formula_lib, util
+from ..lib import pkginfo, node as node_lib, evaluation as evaluation_lib, formula as formula_lib, pool as pool_lib, \
+    tree_versions, library as library_lib, write_batch, completion as completion_lib
+from ..core import instrument
 from ..props import explanation as explanation_props
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (node_lib, explanation_props, evaluation_lib, formula_lib, util):  # list all imports here
+    for mod in (node_lib, explanation_props, evaluation_lib, formula_lib, pool_lib, instrument,
+                tree_versions, library_lib, write_batch, completion_lib):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
+package_name = pkginfo.package_name()
+
 
 class CreateSocketExplanation(Operator):
     """Add Tell Me Why annotation data for the socket"""
@@ -48,6 +54,8 @@ class RemoveSocketExplanation(Operator):
     def execute(self, context) -> Set[str]:
         socket = context.operator_socket
         socket.property_unset("tmy_explanation")
+        # Unsetting doesn't run property update callbacks
+        tree_versions.bump(socket.id_data)
         return {"FINISHED"}
 
 
@@ -70,35 +78,131 @@ class ApplyFormula(Operator):
         return {"FINISHED"}
 
 
+class InsertFormulaName(Operator):
+    """Search the variables and functions formulas can use, and add one to the formula (completing the name being
+    typed at the end of it)"""
+    bl_idname = "tell_me_why.insert_formula_name"
+    bl_label = "Insert Name"
+    bl_options = {"UNDO"}
+    bl_property = "insert_name"
+
+    component_index: IntProperty(name="component_index", default=0)
+    insert_name: EnumProperty(name="Name", items=completion_lib.enum_items)
+    # Where the socket is, since the search popup doesn't keep the button's context
+    owner_type: StringProperty(options={"HIDDEN"})
+    owner_name: StringProperty(options={"HIDDEN"})
+    node_name: StringProperty(options={"HIDDEN"})
+    socket_identifier: StringProperty(options={"HIDDEN"})
+
+    def invoke(self, context, event) -> Set[str]:
+        locator = node_lib.SocketLocator.find(context.operator_socket)
+        if locator is None:
+            return {"CANCELLED"}
+        self.owner_type, self.owner_name = locator.owner_type, locator.owner_name
+        self.node_name, self.socket_identifier = locator.node_name, locator.socket_identifier
+        context.window_manager.invoke_search_popup(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context) -> Set[str]:
+        socket = node_lib.SocketLocator(self.owner_type, self.owner_name, self.node_name,
+                                        self.socket_identifier).socket()
+        if socket is None:
+            self.report({"WARNING"}, f"{self.owner_name} > {self.node_name} no longer exists.")
+            return {"CANCELLED"}
+        component = socket.tmy_explanation.components[self.component_index]
+        component.formula = completion_lib.complete(component.formula, self.insert_name)
+        return {"FINISHED"}
+
+
+def _edit_tree(context):
+    space = getattr(context, "space_data", None)
+    return getattr(space, "edit_tree", None) if space is not None and space.type == "NODE_EDITOR" else None
+
+
 class ApplyAllFormulas(Operator):
-    """Apply all Tell Me Why formulas in the file"""
+    """Apply all Tell Me Why formulas in the file, or in part of it"""
     bl_idname = "tell_me_why.apply_all"
     bl_label = "Apply All Formulas"
-    bl_options = {"UNDO"}
-
+    bl_options = {"REGISTER", "UNDO"}
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ("FILE", "Whole File", "Apply every formula in the file"),
+            ("SCENE", "Scene", "Apply formulas in the node trees the current scene uses (its materials, lights, world, "
+                               "compositor, and Geometry Nodes) and the node groups in them"),
+            ("TREE_AND_GROUPS", "Node Tree and Groups", "Apply formulas in the node tree being edited and the node "
+                                                        "groups in it"),
+            ("TREE", "Node Tree", "Apply formulas in the node tree being edited"),
+            ("SELECTED", "Selected Nodes", "Apply formulas on the selected nodes"),
+        ],
+        default="FILE",
+        # Don't remember the last scope, so File > Apply All Formulas always applies to the whole file
+        options={"SKIP_SAVE"}
+    )
+
+    def _find_sockets(self, context) -> set | None:
+        """The sockets with formulas in the scope, found without scanning the whole file unless the scope is. None if
+        the scope needs a Node Editor and there isn't one."""
+        if self.scope == "FILE":
+            return evaluation_lib.find_formula_sockets()
+        if self.scope == "SCENE":
+            return evaluation_lib.find_formula_sockets_in_trees(
+                node_lib.iter_nested_trees(node_lib.scene_node_trees(context.scene)))
+        tree = _edit_tree(context)
+        if tree is None:
+            return None
+        if self.scope == "TREE_AND_GROUPS":
+            return evaluation_lib.find_formula_sockets_in_trees(node_lib.iter_nested_trees([tree]))
+        if self.scope == "TREE":
+            return evaluation_lib.find_formula_sockets_in_trees([tree])
+        return set() if node_lib.is_library_data(tree) else evaluation_lib.find_formula_sockets_in_nodes(
+            context.selected_nodes)
+
+    @instrument.timed
     def execute(self, context) -> Set[str]:
-        sockets = evaluation_lib.find_formula_sockets()
-        successes = 0
+        sockets = self._find_sockets(context)
+        if sockets is None:
+            self.report({"ERROR"}, "There is no node tree open in a Node Editor to apply formulas to")
+            return {"CANCELLED"}
         failures = 0
+
+        # Evaluate everything up front (in worker processes if enabled), so the loop below only has to read the cache.
+        # Formulas are evaluated together, so parts they share are only evaluated once.
+        formulas = [c.formula for s in sockets for c in s.tmy_explanation.components if c.use_formula]
+        if bpy.context.preferences.addons[package_name].preferences.parallel_apply_all:
+            pool_lib.prime_cache(formulas)
+        formula_lib.eval_batch(formulas)
+
+        # Each socket's components are combined into one value, and written in one batch per node tree
+        formula_lib.eval_all_variables()
+        batch = write_batch.SocketWriteBatch()
         for socket in sockets:
+            evaluated = evaluation_lib.Evaluation(socket)
+            value = socket.default_value
             for index, component in enumerate(socket.tmy_explanation.components):
-                if component.use_formula:
-                    try:
-                        new_value = _update_socket(socket, index)
-                        if not util.compare(new_value, socket.default_value):
-                            successes += 1
-                            socket.default_value = new_value
-                    except:
-                        failures += 1
+                if not component.use_formula:
+                    continue
+                if evaluated.is_error(index):
+                    failures += 1
+                    continue
+                value = evaluated.apply_result(value, index)
+            batch.set(socket, value)
+        successes, write_failures = batch.commit()
+        failures += write_failures
+
+        # Linked library data is skipped, since it can't be changed in this file
+        library_formulas = sum(library_lib.count_library_formulas().values()) if self.scope == "FILE" else 0
+        skipped = f" {library_formulas} formulas in linked libraries skipped." if library_formulas else ""
 
         if failures:
-            self.report({"WARNING"}, f"{failures} failed. {successes} values updated.")
+            self.report({"WARNING"}, f"{failures} failed. {successes} values updated.{skipped}")
         elif successes:
-            self.report({"INFO"}, f"{successes} values updated.")
+            self.report({"INFO"}, f"{successes} values updated.{skipped}")
         else:
-            self.report({"WARNING"}, "No values updated.")
+            self.report({"WARNING"}, f"No values updated.{skipped}")
 
         return {"FINISHED"}
 
 
-REGISTER_CLASSES = [CreateSocketExplanation, RemoveSocketExplanation, ApplyFormula, ApplyAllFormulas]
+REGISTER_CLASSES = [CreateSocketExplanation, RemoveSocketExplanation, ApplyFormula, InsertFormulaName, ApplyAllFormulas]
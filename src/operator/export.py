@@ -0,0 +1,57 @@
+import os
+from typing import Set
+
+from bpy.props import StringProperty, EnumProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..lib import export as export_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (export_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class ExportAnnotations(Operator, ExportHelper):
+    """Save a report of all annotations, with the results of their formulas and whether they match"""
+    bl_idname = "tell_me_why.export_annotations"
+    bl_label = "Export Annotations"
+
+    filename_ext = ".jsonl"
+    filter_glob: StringProperty(default="*.jsonl;*.csv;*.md", options={"HIDDEN"})
+    format: EnumProperty(
+        name="Format",
+        items=[(key, label, f"Save as {label} ({ext})") for key, (label, ext) in export_lib.FORMATS.items()],
+        default="JSONL"
+    )
+
+    def _with_extension(self, filepath: str) -> str:
+        ext = export_lib.FORMATS[self.format][1]
+        root, current = os.path.splitext(filepath)
+        if current.lower() in {e for _, e in export_lib.FORMATS.values()}:
+            filepath = root
+        return filepath + ext
+
+    def check(self, context) -> bool:
+        # Keep the file extension in line with the chosen format
+        filepath = self._with_extension(self.filepath)
+        if filepath == self.filepath:
+            return False
+        self.filepath = filepath
+        return True
+
+    def execute(self, context) -> Set[str]:
+        filepath = self._with_extension(self.filepath)
+        try:
+            count = export_lib.export(filepath, self.format)
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not save annotations: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"{count} annotated socket{'' if count == 1 else 's'} saved to {filepath}")
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [ExportAnnotations]
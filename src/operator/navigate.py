@@ -0,0 +1,49 @@
+from typing import Set
+
+from bpy.props import StringProperty
+from bpy.types import Operator
+
+from ..lib import node as node_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class JumpToNode(Operator):
+    """Show the node in the Node Editor"""
+    bl_idname = "tell_me_why.jump_to_node"
+    bl_label = "Jump to Node"
+
+    owner_type: StringProperty()
+    owner_name: StringProperty()
+    node_name: StringProperty()
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.space_data is not None and context.space_data.type == "NODE_EDITOR"
+
+    def execute(self, context) -> Set[str]:
+        locator = node_lib.SocketLocator(self.owner_type, self.owner_name, self.node_name, "")
+        tree = locator.tree()
+        node = locator.node()
+        if node is None:
+            self.report({"WARNING"}, f"{self.owner_name} > {self.node_name} no longer exists.")
+            return {"CANCELLED"}
+        node_lib.frame_node(context, tree, node)
+        return {"FINISHED"}
+
+
+def draw_jump_operator(layout, location, **kwargs) -> None:
+    """Draw a JumpToNode button. location is anything with owner_type, owner_name, and node_name, like a
+    SocketLocator."""
+    jump_op = layout.operator(JumpToNode.bl_idname, **kwargs)
+    jump_op.owner_type = location.owner_type
+    jump_op.owner_name = location.owner_name
+    jump_op.node_name = location.node_name
+
+
+REGISTER_CLASSES = [JumpToNode]
@@ -0,0 +1,55 @@
+from typing import Set
+
+from bpy.props import IntProperty
+from bpy.types import Operator
+
+from ..lib import profile as profile_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (profile_lib,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class ProfileFormulas(Operator):
+    """Time every formula in the file, to find the slowest"""
+    bl_idname = "tell_me_why.profile_formulas"
+    bl_label = "Profile Formulas"
+
+    repeat: IntProperty(
+        name="Runs",
+        description="How many times to evaluate each formula. More runs give steadier times",
+        default=5,
+        min=1,
+        soft_max=50
+    )
+
+    def execute(self, context) -> Set[str]:
+        tmy = context.window_manager.tell_me_why_globals
+        profiles = profile_lib.profile_formulas(self.repeat)
+
+        tmy.profile_entries.clear()
+        for profile in profiles:
+            entry = tmy.profile_entries.add()
+            entry.owner_type = profile.locator.owner_type
+            entry.owner_name = profile.locator.owner_name
+            entry.node_name = profile.locator.node_name
+            entry.socket_identifier = profile.locator.socket_identifier
+            entry.component_index = profile.component_index
+            entry.formula = profile.formula
+            entry.mean_ms = profile.mean * 1000
+            entry.max_ms = profile.max * 1000
+            entry.result_size = profile.result_size
+            entry.error = profile.error
+        tmy.profile_selected_index = 0
+
+        if not profiles:
+            self.report({"WARNING"}, "No formulas to profile.")
+        else:
+            self.report({"INFO"}, f"Profiled {len(profiles)} formulas. Slowest: {profiles[0].mean * 1000:.2f} ms")
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [ProfileFormulas]
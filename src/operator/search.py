@@ -0,0 +1,45 @@
+from typing import Set
+
+from bpy.props import StringProperty
+from bpy.types import Operator
+
+from ..lib import node as node_lib, search as search_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (node_lib, search_lib):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class SearchAnnotations(Operator):
+    """Search annotation descriptions and formulas throughout the file"""
+    bl_idname = "tell_me_why.search_annotations"
+    bl_label = "Search Annotations"
+
+    query: StringProperty(name="Search", description="Words (or the starts of words) to look for")
+
+    def invoke(self, context, event) -> Set[str]:
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context) -> Set[str]:
+        # Show the results in the Search panel
+        context.window_manager.tell_me_why_globals.search_query = self.query
+
+        count = search_lib.count_matches(self.query)
+        if not count:
+            self.report({"WARNING"}, f"Nothing matches \"{self.query}\".")
+            return {"CANCELLED"}
+
+        # With only one match, there's nothing to choose from, so go straight to it
+        if count == 1 and context.space_data is not None and context.space_data.type == "NODE_EDITOR":
+            locator = search_lib.search(self.query, limit=1)[0].locator
+            if node := locator.node():
+                node_lib.frame_node(context, locator.tree(), node)
+
+        self.report({"INFO"}, f"{count} matches for \"{self.query}\". See the Search section of the Tell Me Why panel.")
+        return {"FINISHED"}
+
+
+REGISTER_CLASSES = [SearchAnnotations]
@@ -4,12 +4,13 @@ import bpy
 from bpy.types import Operator
 
 from ..lib import pkginfo
-from ..lib import variable as variable_lib
+from ..lib import variable as variable_lib, variable_usage as variable_usage_lib, formula as formula_lib
+from ..props import variable as variable_props
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (variable_lib,):  # list all imports here
+    for mod in (variable_lib, variable_usage_lib, formula_lib, variable_props):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -44,6 +45,65 @@ class RemoveVariable(Operator):
         return {"FINISHED"}
 
 
+class RenameVariableEverywhere(Operator):
+    """Rename the scene variable, and change every formula that uses it to use the new name"""
+    bl_idname = "tell_me_why.rename_variable_everywhere"
+    bl_label = "Rename Everywhere"
+    bl_options = {"REGISTER", "UNDO"}
+
+    old_name: bpy.props.StringProperty(name="Variable", options={"HIDDEN"})
+    new_name: bpy.props.StringProperty(name="New Name")
+
+    def invoke(self, context, event) -> Set[str]:
+        tmy = context.window_manager.tell_me_why_globals
+        variables = variable_lib.get_scene_variables()
+        if not 0 <= tmy.variable_selected_index < len(variables):
+            return {"CANCELLED"}
+        self.old_name = self.new_name = variables[tmy.variable_selected_index].name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context) -> Set[str]:
+        variables = context.scene.tmy_variables
+        old_name = self.old_name
+        new_name = variable_props.valid_name(self.new_name)
+        if old_name not in variables:
+            self.report({"ERROR"}, f"There is no variable named \"{old_name}\".")
+            return {"CANCELLED"}
+        if not new_name or new_name == old_name:
+            return {"CANCELLED"}
+        if new_name in variables:
+            self.report({"ERROR"}, f"There is already a variable named \"{new_name}\".")
+            return {"CANCELLED"}
+        allowed = formula_lib.default_allowed()
+        if new_name in allowed["names"] or new_name in allowed["functions"]:
+            self.report({"ERROR"}, f"\"{new_name}\" is a built-in name, and can't be used for a variable.")
+            return {"CANCELLED"}
+
+        changed, conflicts = variable_usage_lib.rename_everywhere(old_name, new_name)
+        # Derived variables can use the variable too
+        for variable in variables:
+            if not variable.derived:
+                continue
+            try:
+                renamed = variable_usage_lib.rename_in_formula(variable.formula, old_name, new_name)
+            except variable_usage_lib.NameCaptureException:
+                self.report({"WARNING"}, f"Couldn't rename \"{old_name}\" in the variable \"{variable.name}\", "
+                                         f"which already uses \"{new_name}\"")
+                continue
+            if renamed != variable.formula:
+                variable.formula = renamed
+                changed += 1
+        variables[old_name].name = new_name
+        formula_lib.reset_variable_cache()
+        if conflicts:
+            places = ", ".join(f"{use.locator.owner_name} > {use.locator.node_name}" for use in conflicts)
+            self.report({"WARNING"}, f"Renamed \"{old_name}\" to \"{new_name}\" in {changed} formulas, but not in "
+                                     f"{len(conflicts)} that already use \"{new_name}\": {places}")
+        else:
+            self.report({"INFO"}, f"Renamed \"{old_name}\" to \"{new_name}\" in {changed} formulas.")
+        return {"FINISHED"}
+
+
 class AddGlobalLibVariable(Operator):
     """Add a variable to the global library"""
     bl_idname = "tell_me_why.add_global_lib_variable"
@@ -111,5 +171,5 @@ class ImportVariablesFromGlobalLib(ImportVariablesOperator):
         return {"FINISHED"}
 
 
-REGISTER_CLASSES = [AddVariable, RemoveVariable, AddGlobalLibVariable, RemoveGlobalLibVariable,
+REGISTER_CLASSES = [AddVariable, RemoveVariable, RenameVariableEverywhere, AddGlobalLibVariable, RemoveGlobalLibVariable,
                     ImportVariablesFromScene, ImportVariablesFromGlobalLib]
@@ -0,0 +1,82 @@
+import bpy
+from bpy.types import Panel
+
+from ..lib import pkginfo
+from ..core import instrument
+from ..operator import diagnostics as diagnostics_op
+
+package_name = pkginfo.package_name()
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (pkginfo, instrument, diagnostics_op):
+        importlib.reload(mod)
+_LOADED = True
+
+
+def _diagnostics_enabled() -> bool:
+    try:
+        return bpy.context.preferences.addons[package_name].preferences.enable_diagnostics
+    except (AttributeError, KeyError):
+        return False
+
+
+def sync_enabled_from_prefs() -> None:
+    """Turn collection on or off to match the enable_diagnostics preference"""
+    instrument.set_enabled(_diagnostics_enabled())
+
+
+def disable() -> None:
+    instrument.set_enabled(False)
+
+
+class NODE_PT_TMYDiagnostics(Panel):
+    bl_idname = "NODE_PT_tmy_diagnostics"
+    bl_parent_id = "NODE_PT_tell_me_why"
+    bl_category = "Tell Me Why"
+    bl_label = "Diagnostics"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    @classmethod
+    def poll(cls, context):
+        return _diagnostics_enabled()
+
+    def draw(self, context):
+        layout = self.layout
+        data = instrument.snapshot()
+
+        ops_row = layout.row(align=True)
+        ops_row.operator(diagnostics_op.ResetDiagnostics.bl_idname, text="Reset", icon="LOOP_BACK")
+        ops_row.operator(diagnostics_op.ExportDiagnostics.bl_idname, text="Export JSON", icon="EXPORT")
+
+        if not (data["timers"] or data["counters"]):
+            layout.label(text="Nothing recorded yet.")
+            return
+
+        if data["timers"]:
+            timers_box = layout.box()
+            header = timers_box.row()
+            header.label(text="Function")
+            header.label(text="Calls / Total / Max (ms)")
+            for name, stats in data["timers"].items():
+                row = timers_box.row()
+                row.label(text=name)
+                row.label(text=f"{stats['calls']} / {stats['total_ms']:.1f} / {stats['max_ms']:.2f}")
+
+        if data["counters"]:
+            counters_box = layout.box()
+            for name, events in data["counters"].items():
+                row = counters_box.row()
+                row.label(text=name)
+                summary = ", ".join(f"{event} {number}" for event, number in events.items())
+                if lookups := events.get("hit", 0) + events.get("miss", 0):
+                    summary += f" ({events.get('hit', 0) / lookups:.0%} hits)"
+                row.label(text=summary)
+
+
+REGISTER_CLASSES = [NODE_PT_TMYDiagnostics]
+REGISTER_FUNCTIONS = [sync_enabled_from_prefs]
+UNREGISTER_FUNCTIONS = [disable]
@@ -1,8 +1,10 @@
 import bpy
 from bpy.types import Panel, UILayout, NodeSocket
+from . import diagnostics as diagnostics_panel, profile as profile_panel, search as search_panel
 from ..lib import pkginfo, util, node as node_lib, formula as formula_lib, addon as addon_lib, \
     evaluation as evaluation_lib, icons as icons_lib
-from ..operator import explanation as explanation_op
+from ..core import instrument
+from ..operator import explanation as explanation_op, clipboard as clipboard_op
 from ..props.explanation import TMYExplanation, ComponentValueExplanation
 
 package_name = pkginfo.package_name()
@@ -11,7 +13,8 @@ icon_value = icons_lib.icon_value
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (explanation_op, node_lib, formula_lib, addon_lib, util, evaluation_lib):  # list all imports here
+    for mod in (explanation_op, clipboard_op, node_lib, formula_lib, addon_lib, util, evaluation_lib, instrument,
+                diagnostics_panel, profile_panel, search_panel):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -30,10 +33,15 @@ icons = {
     "bad_formula": "ERROR",
     "mismatch": "icon_not_equal",
     "node_value": "NODE",
+    "pending": "SORTTIME",
     "remove": "X",
     "security": "DECORATE_LOCKED"
 }
 
+# Panels shown inside the main panel, which follow it to whichever tab it is in
+sub_panels = [search_panel.NODE_PT_TMYSearch, profile_panel.NODE_PT_TMYProfile,
+              diagnostics_panel.NODE_PT_TMYDiagnostics]
+
 # Do NOT use this for anything except equality checking!
 last_seen_node = None
 
@@ -42,7 +50,8 @@ def set_panel_category_from_prefs():
     """Set the panel's category (tab) from the n_panel_location preference"""
     try:
         location = bpy.context.preferences.addons[package_name].preferences.n_panel_location
-        NODE_PT_TellMeWhy.bl_category = location
+        for panel in [NODE_PT_TellMeWhy, *sub_panels]:
+            panel.bl_category = location
     except AttributeError:
         # This means the preferences aren't set up, so just pass and use the default
         pass
@@ -50,9 +59,14 @@ def set_panel_category_from_prefs():
 
 def update_panel_category():
     """Set the panel's category (tab) from the n_panel_location preference and unregister/reregister the panel"""
+    # Sub-panels have to be unregistered before, and registered after, their parent
+    for panel in sub_panels[::-1]:
+        bpy.utils.unregister_class(panel)
     bpy.utils.unregister_class(NODE_PT_TellMeWhy)
     set_panel_category_from_prefs()
     bpy.utils.register_class(NODE_PT_TellMeWhy)
+    for panel in sub_panels:
+        bpy.utils.register_class(panel)
 
 
 class NODE_PT_TellMeWhy(Panel):
@@ -62,6 +76,7 @@ class NODE_PT_TellMeWhy(Panel):
     bl_space_type = "NODE_EDITOR"
     bl_region_type = "UI"
 
+    @instrument.timed
     def draw(self, context):
         tmy = context.window_manager.tell_me_why_globals
         prefs = bpy.context.preferences.addons[package_name].preferences
@@ -85,6 +100,13 @@ class NODE_PT_TellMeWhy(Panel):
 
         node_state = node_lib.get_node_explanation_state(node)
 
+        if node_state.can_explain:
+            row = layout.row(align=True)
+            row.operator(clipboard_op.CopyAnnotations.bl_idname, text="Copy", icon="COPYDOWN")
+            row.operator(clipboard_op.PasteAnnotations.bl_idname, text="Paste", icon="PASTEDOWN")
+            row.operator_menu_enum(explanation_op.ApplyAllFormulas.bl_idname, "scope", text="Apply",
+                                   icon="FILE_REFRESH")
+
         if not node_state.can_explain:
             addon_lib.multiline_label(context, layout, text="Nothing to annotate.")
         elif node_state.has_unexplained:
@@ -127,18 +149,15 @@ class NODE_PT_TellMeWhy(Panel):
         if not hasattr(socket, "default_value"):
             return
 
-        if edit_mode and len(node_lib.get_value_types(socket)) > 1:
-            abbr_map = {
-                socket.type: "",
-                "VECTOR": "XYZ",
-                "RGBA": "RGBA"
-            }
-            label = f"Split {abbr_map[socket.type]} Components"
+        socket_type = node_lib.socket_type(socket)
+        if edit_mode and len(socket_type.component_types) > 1:
+            abbreviation = f"{socket_type.component_abbreviation} " if socket_type.component_abbreviation else ""
+            label = f"Split {abbreviation}Components"
             socket_layout.prop(data=explanation, property="split_components", text=label, toggle=True)
 
         components = explanation.components if explanation.split_components else [explanation.components[0]]
         component_labels = _get_component_labels(socket)
-        evaluated = evaluation_lib.Evaluation(socket)
+        evaluated = evaluation_lib.Evaluation(socket, background=True)
 
         for c_idx, component in enumerate(components):
             self._draw_component_edit(socket_layout, socket, evaluated, c_idx, component,
@@ -182,6 +201,8 @@ class NODE_PT_TellMeWhy(Panel):
 
         if not component.use_formula:
             icon_id = icons["node_value"]
+        elif evaluated.is_pending(index):
+            icon_id = icons["pending"]
         elif evaluated.is_error(index):
             icon_id = icons["bad_formula"]
         elif evaluated.is_index_matching(index):
@@ -217,11 +238,18 @@ class NODE_PT_TellMeWhy(Panel):
         formula_layout = component_layout.split(factor=0.2, align=True)
         formula_layout.prop(data=component, property="use_formula", text="", icon_value=icon_value(icons["formula"]))
         if component.use_formula:
-            formula_layout.prop(data=component, property="formula", text="")
+            formula_row = formula_layout.row(align=True)
+            formula_row.prop(data=component, property="formula", text="")
+            formula_row.context_pointer_set(name="operator_socket", data=socket)
+            formula_row.operator(explanation_op.InsertFormulaName.bl_idname, text="",
+                                 icon="VIEWZOOM").component_index = index
             result_layout = component_layout.column(align=True)
 
-            if evaluated.is_error(index):
-                result_layout.label(icon=icons["error"], text="Missing/Invalid Formula")
+            if evaluated.is_pending(index):
+                result_layout.label(icon=icons["pending"], text="Computing…")
+            elif evaluated.is_error(index):
+                result_layout.label(icon=icons["error"],
+                                    text=evaluated.error_message(index) or "Missing/Invalid Formula")
             elif evaluated.is_index_matching(index):
                 result_layout.label(icon=icons["check"], text="Value Applied")
             else:
@@ -246,6 +274,7 @@ class NODE_PT_TellMeWhyPopover(Panel):
     bl_space_type = "NODE_EDITOR"
     bl_region_type = "HEADER"
 
+    @instrument.timed
     def draw(self, context):
         tmy = context.window_manager.tell_me_why_globals
         prefs = bpy.context.preferences.addons[package_name].preferences
@@ -287,7 +316,7 @@ class NODE_PT_TellMeWhyPopover(Panel):
                 components: list[ComponentValueExplanation] = explanation.components if explanation.split_components else explanation.components[0:]
                 default_values = socket.default_value if util.is_iterable(socket.default_value) else [socket.default_value]
                 components = zip(_get_component_labels(socket), components, default_values)
-                evaluated = evaluation_lib.Evaluation(socket)
+                evaluated = evaluation_lib.Evaluation(socket, background=True)
 
                 for index, zipped in enumerate(components):
                     component_label, component, default_value = zipped
@@ -314,7 +343,9 @@ class NODE_PT_TellMeWhyPopover(Panel):
                         component_box.label(text=util.format_prop_value(default_value),
                                             icon_value=icon_value(icons["node_value"]))
 
-                    if eval_error:
+                    if evaluated.is_pending(index):
+                        component_box.label(text="Computing…", icon_value=icon_value(icons["pending"]))
+                    elif eval_error:
                         component_box.label(text="Formula is invalid", icon_value=icon_value(icons["bad_formula"]))
                     elif not eval_match:
                         component_box.context_pointer_set(name="operator_socket", data=socket)
@@ -342,17 +373,10 @@ def _node_invalid_label(node: bpy.types.NodeInternal) -> str | None:
 
 def _get_component_labels(socket: NodeSocket) -> tuple[str]:
     """Return a tuple of labels for socket value components"""
-    explanation = socket.tmy_explanation
-    if not explanation.split_components:
-        return (f"{socket.name} ({node_lib.socket_type_label(socket)})",)
-
-    labels = {
-                 "VECTOR": ("X", "Y", "Z"),
-                 "ROTATION": ("W", "X", "Y", "Z"),
-                 "RGBA": ("Red", "Green", "Blue", "Alpha")
-             }.get(socket.type, None) or tuple([f"{socket.name} {i}" for i, _ in explanation.components])
-
-    return labels
+    socket_type = node_lib.socket_type(socket)
+    if not socket.tmy_explanation.split_components:
+        return (f"{socket.name} ({socket_type.label})",)
+    return socket_type.split_labels(socket.name)
 
 
 def _has_any_explanation(explanation: TMYExplanation) -> bool:
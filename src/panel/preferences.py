@@ -2,13 +2,14 @@ import bpy
 
 from . import n_panel, ul_variables, variables as variables_panel
 from ..lib import pkginfo, addon as addon_lib, variable as variable_lib, util
+from ..core import instrument
 from ..operator import variable as variable_op
 from ..props import variable as variable_props
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (pkginfo, variable_props, addon_lib, variable_lib, util, n_panel):
+    for mod in (pkginfo, variable_props, addon_lib, variable_lib, util, instrument, n_panel):
         importlib.reload(mod)
 _LOADED = True
 
@@ -26,6 +27,10 @@ def set_location(self, value):
         n_panel.update_panel_category()
 
 
+def update_diagnostics(self, context):
+    instrument.set_enabled(self.enable_diagnostics)
+
+
 class TMYPrefsPanel(bpy.types.AddonPreferences):
     bl_idname = package_name
 
@@ -47,12 +52,49 @@ class TMYPrefsPanel(bpy.types.AddonPreferences):
         set=set_location
     )
 
+    formula_timeout: bpy.props.FloatProperty(
+        name="Formula time limit",
+        description="Slow formulas are evaluated in the background while drawing. Formulas that take longer than "
+                    "this many seconds are marked as errors",
+        default=5.0,
+        min=0.1,
+        soft_max=60.0,
+        subtype="TIME_ABSOLUTE",
+        unit="TIME_ABSOLUTE"
+    )
+
+    parallel_apply_all: bpy.props.BoolProperty(
+        name="Apply All in parallel",
+        description="Use multiple processes to evaluate formulas for \"Apply All Formulas\". This speeds up files with "
+                    "many different formulas, but takes a moment to start up",
+        default=False
+    )
+
+    save_results: bpy.props.BoolProperty(
+        name="Save formula results in file",
+        description="Save the results of formulas with the file, so they don't all have to be evaluated again when "
+                    "it's opened. Results are only reused if the formula and its variables are unchanged",
+        default=True
+    )
+
+    enable_diagnostics: bpy.props.BoolProperty(
+        name="Collect diagnostics",
+        description="Record how long formulas and panels take and how well caches are working, and show the results "
+                    "in a Diagnostics panel. This slows things down slightly",
+        default=False,
+        update=update_diagnostics
+    )
+
     global_variables_library: bpy.props.CollectionProperty(type=variable_props.TMYVariable)
 
     def draw(self, context) -> None:
         layout = self.layout
         layout.prop(self, "start_expanded")
         layout.prop(self, "n_panel_location")
+        layout.prop(self, "formula_timeout")
+        layout.prop(self, "parallel_apply_all")
+        layout.prop(self, "save_results")
+        layout.prop(self, "enable_diagnostics")
 
         tmy = context.window_manager.tell_me_why_globals
 
@@ -82,6 +124,7 @@ class TMYPrefsPanel(bpy.types.AddonPreferences):
             edit_box = list_col.box()
             edit_box.prop(variables[tmy.variable_selected_index_prefs], "name")
             edit_box.prop(variables[tmy.variable_selected_index_prefs], "formula", text="Value")
+            edit_box.prop(variables[tmy.variable_selected_index_prefs], "derived")
 
         ops_col = list_row.column(align=True)
         ops_col.operator(variable_op.AddGlobalLibVariable.bl_idname, icon="ADD", text="")
@@ -0,0 +1,51 @@
+import bpy
+from bpy.types import Panel
+
+from . import ul_profile
+from ..lib import addon as addon_lib
+from ..operator import profile as profile_op, navigate as navigate_op
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (ul_profile, addon_lib, profile_op, navigate_op):
+        importlib.reload(mod)
+_LOADED = True
+
+
+class NODE_PT_TMYProfile(Panel):
+    bl_idname = "NODE_PT_tmy_profile"
+    bl_parent_id = "NODE_PT_tell_me_why"
+    bl_category = "Tell Me Why"
+    bl_label = "Formula Profiler"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        tmy = context.window_manager.tell_me_why_globals
+
+        layout.operator(profile_op.ProfileFormulas.bl_idname, icon="TIME")
+        if not tmy.profile_entries:
+            addon_lib.multiline_label(context, layout, text="Profile the file to list formulas by how long they take.")
+            return
+
+        layout.template_list(ul_profile.TMY_UL_ProfileEntries.bl_idname, "profile_entries", tmy, "profile_entries",
+                             tmy, "profile_selected_index")
+
+        if not 0 <= tmy.profile_selected_index < len(tmy.profile_entries):
+            return
+        entry = tmy.profile_entries[tmy.profile_selected_index]
+        detail_box = layout.box()
+        detail_box.label(text=f"{entry.owner_name} > {entry.node_name} > {entry.socket_identifier}", icon="NODE")
+        addon_lib.multiline_label(context, detail_box, text=entry.formula)
+        if entry.error:
+            addon_lib.multiline_label(context, detail_box, text=entry.error, icon="ERROR")
+        else:
+            detail_box.label(text=f"Mean {entry.mean_ms:.3f} ms, max {entry.max_ms:.3f} ms")
+            detail_box.label(text=f"Result size: {entry.result_size}")
+        navigate_op.draw_jump_operator(detail_box, entry, icon="VIEWZOOM")
+
+
+REGISTER_CLASSES = [NODE_PT_TMYProfile]
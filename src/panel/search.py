@@ -0,0 +1,53 @@
+from bpy.types import Panel
+
+from ..lib import search as search_lib
+from ..operator import navigate as navigate_op
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (search_lib, navigate_op):
+        importlib.reload(mod)
+_LOADED = True
+
+# Drawing more results than this slows the panel down without being much use
+RESULT_LIMIT = 50
+PREVIEW_LENGTH = 60
+
+
+class NODE_PT_TMYSearch(Panel):
+    bl_idname = "NODE_PT_tmy_search"
+    bl_parent_id = "NODE_PT_tell_me_why"
+    bl_category = "Tell Me Why"
+    bl_label = "Search"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        tmy = context.window_manager.tell_me_why_globals
+
+        layout.prop(tmy, "search_query", text="", icon="VIEWZOOM")
+        if not search_lib.tokenize(tmy.search_query):
+            return
+
+        results = search_lib.search(tmy.search_query, RESULT_LIMIT)
+        if not results:
+            layout.label(text="No matches.")
+            return
+
+        for result in results:
+            result_layout = layout.box().column(align=True)
+            title_row = result_layout.row()
+            title_row.label(text=f"{result.locator.owner_name} > {result.locator.node_name}", icon="NODE")
+            navigate_op.draw_jump_operator(title_row, result.locator, text="", icon="VIEWZOOM", emboss=False)
+            preview = result.preview if len(result.preview) <= PREVIEW_LENGTH \
+                else result.preview[:PREVIEW_LENGTH - 1] + "…"
+            result_layout.label(text=f"{result.socket_name}: {preview}")
+
+        if len(results) == RESULT_LIMIT:
+            layout.label(text=f"Showing the first {RESULT_LIMIT} matches.")
+
+
+REGISTER_CLASSES = [NODE_PT_TMYSearch]
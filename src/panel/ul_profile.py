@@ -0,0 +1,58 @@
+import bpy
+from bpy.types import UIList
+
+from ..lib import util
+from ..operator import navigate as navigate_op
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (util, navigate_op):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+SORT_PROPERTIES = {
+    "MEAN": "mean_ms",
+    "MAX": "max_ms",
+    "SIZE": "result_size",
+}
+
+
+class TMY_UL_ProfileEntries(UIList):
+    bl_idname = "TMY_UL_ProfileEntries"
+
+    sort_by: bpy.props.EnumProperty(
+        name="Sort by",
+        items=[
+            ("MEAN", "Mean Time", "Sort by the average time to evaluate the formula"),
+            ("MAX", "Max Time", "Sort by the longest time to evaluate the formula"),
+            ("SIZE", "Result Size", "Sort by the number of items in the formula's result"),
+        ],
+        default="MEAN"
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
+        row = layout.row()
+        row.label(text="", icon="ERROR" if item.error else "TIME")
+        row.label(text=f"{item.mean_ms:.2f} ms")
+        row.label(text=item.formula)
+        navigate_op.draw_jump_operator(row, item, text="", icon="VIEWZOOM", emboss=False)
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "sort_by", text="")
+        row.prop(self, "use_filter_sort_reverse", text="", icon="SORT_ASC")
+
+    def filter_items(self, context, data, propname):
+        entries = getattr(data, propname)
+        flags = bpy.types.UI_UL_list.filter_items_by_name(self.filter_name, self.bitflag_filter_item, entries,
+                                                          "formula")
+        sort_property = SORT_PROPERTIES[self.sort_by]
+        # Slowest/largest first, unless reversed
+        direction = 1 if self.use_filter_sort_reverse else -1
+        order = util.uilist_sort(list(entries), lambda entry: getattr(entry, sort_property) * direction)
+        return flags, order
+
+
+REGISTER_CLASSES = [TMY_UL_ProfileEntries]
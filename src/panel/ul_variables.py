@@ -17,10 +17,16 @@ class TMY_UL_Variables(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
         split = layout.row()
         evaled_ok = True
-        try:
-            formula_lib.eval_variable(item.name, item.formula)
-        except formula_lib.FormulaExecutionException:
-            evaled_ok = False
+        if item.derived:
+            # Derived variables use other variables, so they can only be checked in the Scene they belong to. The
+            # panel evaluates the Scene's variables once before drawing the list, and errors come from that.
+            if data == context.scene:
+                evaled_ok = formula_lib.derived_error(item.name) is None
+        else:
+            try:
+                formula_lib.eval_variable(item.name, item.formula)
+            except formula_lib.FormulaExecutionException:
+                evaled_ok = False
 
         split.label(text="", icon="ERROR" if not evaled_ok else "CHECKMARK")
         split.label(text=item.name)
@@ -2,18 +2,24 @@ import bpy
 from bpy.types import Panel, Menu
 
 from . import ul_variables
-from ..lib import pkginfo, addon as addon_lib, variable as variable_lib, formula as formula_lib
-from ..operator import variable as variable_op
+from ..lib import pkginfo, addon as addon_lib, variable as variable_lib, formula as formula_lib, driver as driver_lib, \
+    variable_usage as variable_usage_lib
+from ..core import instrument
+from ..operator import variable as variable_op, driver as driver_op, navigate as navigate_op
 
 package_name = pkginfo.package_name()
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (pkginfo, addon_lib, variable_op, formula_lib):
+    for mod in (pkginfo, addon_lib, variable_op, formula_lib, driver_lib, driver_op, instrument, variable_usage_lib,
+                navigate_op):
         importlib.reload(mod)
 _LOADED = True
 
+# Drawing more uses than this slows the panel down without being much use
+USES_LIMIT = 30
+
 
 class TMY_MT_ImportVariables(Menu):
     bl_idname = "TMY_MT_import_variables"
@@ -37,6 +43,7 @@ class NODE_PT_TMYFileVariables(Panel):
 
     variable_selected_index = 0
 
+    @instrument.timed
     def draw(self, context):
         layout = self.layout
         list_row = layout.row()
@@ -44,6 +51,8 @@ class NODE_PT_TMYFileVariables(Panel):
         tmy = context.window_manager.tell_me_why_globals
         pointer = variable_lib.get_scene_variables_pointer()
 
+        # Once for the whole list, which shows derived variables' errors from the latest evaluation
+        formula_lib.eval_all_variables()
         list_col = list_row.column()
         list_col.template_list(ul_variables.TMY_UL_Variables.bl_idname, "variables_list", pointer[0], pointer[1],
                                tmy, "variable_selected_index")
@@ -53,6 +62,10 @@ class NODE_PT_TMYFileVariables(Panel):
             edit_box = list_col.box()
             edit_box.prop(variables[tmy.variable_selected_index], "name")
             edit_box.prop(variables[tmy.variable_selected_index], "formula", text="Value")
+            edit_box.prop(variables[tmy.variable_selected_index], "derived")
+            if error := formula_lib.derived_error(variables[tmy.variable_selected_index].name):
+                addon_lib.multiline_label(context, edit_box, f"Can't evaluate: {error}", icon="ERROR")
+            self._draw_uses(list_col, variables[tmy.variable_selected_index], tmy)
 
         ops_col = list_row.column(align=True)
         ops_col.operator("tell_me_why.add_scene_variable", icon="ADD", text="")
@@ -60,6 +73,10 @@ class NODE_PT_TMYFileVariables(Panel):
 
         layout.menu(TMY_MT_ImportVariables.bl_idname)
 
+        # Drivers converted from formulas read variables from scene properties, which need updating on change
+        if any(key.startswith(driver_lib.PROPERTY_PREFIX) for key in context.scene.keys()):
+            layout.operator(driver_op.SyncDriverVariables.bl_idname, icon="DRIVER")
+
         if len(bpy.data.scenes) > 1:
             scene_box = layout.box()
             addon_lib.multiline_label(context, scene_box,
@@ -68,4 +85,26 @@ class NODE_PT_TMYFileVariables(Panel):
                                       "to function.", icon="INFO")
 
 
+    def _draw_uses(self, layout, variable, tmy):
+        """Draw the "Where Used" list of formulas using the variable, and the Rename Everywhere button"""
+        uses_box = layout.box()
+        header_row = uses_box.row()
+        header_row.prop(tmy, "show_variable_uses", emboss=False,
+                        icon="TRIA_DOWN" if tmy.show_variable_uses else "TRIA_RIGHT")
+        header_row.operator(variable_op.RenameVariableEverywhere.bl_idname, text="", icon="SORTALPHA")
+        if not tmy.show_variable_uses:
+            return
+
+        uses = variable_usage_lib.where_used(variable.name)
+        if not uses:
+            uses_box.label(text="Not used in any formulas.")
+            return
+        for use in uses[:USES_LIMIT]:
+            use_row = uses_box.row()
+            use_row.label(text=f"{use.locator.owner_name} > {use.locator.node_name}: {use.formula}")
+            navigate_op.draw_jump_operator(use_row, use.locator, text="", icon="VIEWZOOM", emboss=False)
+        if len(uses) > USES_LIMIT:
+            uses_box.label(text=f"...and {len(uses) - USES_LIMIT} more.")
+
+
 REGISTER_CLASSES = [NODE_PT_TMYFileVariables, TMY_MT_ImportVariables]
@@ -2,10 +2,24 @@ import bpy
 from bpy.props import StringProperty, BoolProperty, FloatProperty, IntProperty, CollectionProperty
 from bpy.types import NodeSocket, PropertyGroup
 
+from ..lib import tree_versions, completion as completion_lib
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (tree_versions, completion_lib):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+def annotation_updated(self, context):
+    tree_versions.bump(self.id_data)
+
 
 def set_split_components(self, value):
-    # Collapse existing formulas to a tuple if we are turning off split_components and all are used
-    if not (value or [c for c in self.components if not (c and c["use_formula"])]):
+    # Collapse existing formulas to a tuple if we are turning off split_components and all are used. There's nothing to
+    # collapse if there are no components, e.g., when an imported annotation is being set up.
+    if self.components and not (value or [c for c in self.components if not (c and c["use_formula"])]):
         formulas = [c["formula"] for c in self.components]
         for c in self.components[1:]:
             c["formula"] = ""
@@ -18,6 +32,7 @@ def set_split_components(self, value):
             c["description"] = ""
             c["use_formula"] = False
     self["split_components"] = value
+    tree_versions.bump(self.id_data)
 
 
 def get_split_components(self):
@@ -27,9 +42,10 @@ def get_split_components(self):
 class ComponentValueExplanation(PropertyGroup):
     """A formula (or value). The formula may return a tuple or a single value, depending on whether the Explanation
     is single-value, split, or combined"""
-    description: StringProperty(name="description", default="")
-    use_formula: BoolProperty(name="Use Value/Formula", default=False)
-    formula: StringProperty(name="formula", default="")
+    description: StringProperty(name="description", default="", update=annotation_updated)
+    use_formula: BoolProperty(name="Use Value/Formula", default=False, update=annotation_updated)
+    # Suggests completions for the name being typed at the end of the formula
+    formula: StringProperty(name="formula", default="", update=annotation_updated, search=completion_lib.search_formula)
     # TODO: Make this an ENUM type
     type: StringProperty(name="type", default="float")
     # If the value has been collapsed to a single formula (in the Explanation properties),
@@ -51,8 +67,8 @@ bpy.utils.register_class(ExplanationVariable)
 
 
 class TMYExplanation(PropertyGroup):
-    active: BoolProperty(name="active", default=False)
-    description: StringProperty(name="Description", default="")
+    active: BoolProperty(name="active", default=False, update=annotation_updated)
+    description: StringProperty(name="Description", default="", update=annotation_updated)
     components: CollectionProperty(type=ComponentValueExplanation)
     variables: CollectionProperty(type=ExplanationVariable)
     split_components: BoolProperty(name="Split components", default=True, set=set_split_components,
@@ -1,13 +1,20 @@
+import keyword
 import re
 
-from bpy.props import StringProperty, CollectionProperty
+from bpy.props import StringProperty, BoolProperty, CollectionProperty
 from bpy.types import PropertyGroup, Scene
 
 
+def valid_name(value: str) -> str:
+    """Make the value usable as a variable name in formulas"""
+    valid = re.sub(r"[^A-Za-z0-9]", "_", value)
+    valid = re.sub(r"^([0-9])", r"_\1", valid)
+    # Formulas using a keyword as a name can't be parsed
+    return f"{valid}_" if keyword.iskeyword(valid) else valid
+
+
 def set_valid_name(self, value):
-    valid_name = re.sub(r"[^A-Za-z0-9]", "_", value)
-    valid_name = re.sub(r"^([0-9])", r"_\1", valid_name)
-    self["name"] = valid_name
+    self["name"] = valid_name(value)
 
 
 def get_name(self):
@@ -31,6 +38,13 @@ class TMYVariable(PropertyGroup):
         default="0"
     )
 
+    derived: BoolProperty(
+        name="Derived",
+        description="Let the formula use other variables. It's evaluated once whenever they change, so formulas can "
+                    "share a value that's slow to work out by using this variable's name",
+        default=False
+    )
+
     @classmethod
     def post_register(cls):
         Scene.tmy_variables = CollectionProperty(type=cls)
@@ -6,15 +6,37 @@ class SocketState(bpy.types.PropertyGroup):
     rgba: bpy.props.FloatVectorProperty(subtype="COLOR", size=4)
 
 
+class ProfileEntry(bpy.types.PropertyGroup):
+    """One formula in the formula profiler's report"""
+    owner_type: bpy.props.StringProperty()
+    owner_name: bpy.props.StringProperty()
+    node_name: bpy.props.StringProperty()
+    socket_identifier: bpy.props.StringProperty()
+    component_index: bpy.props.IntProperty()
+    formula: bpy.props.StringProperty()
+    mean_ms: bpy.props.FloatProperty()
+    max_ms: bpy.props.FloatProperty()
+    result_size: bpy.props.IntProperty()
+    error: bpy.props.StringProperty()
+
+
 class TellMeWhyGlobals(bpy.types.PropertyGroup):
     socket_states: bpy.props.CollectionProperty(type=SocketState)
     show_unexplained: bpy.props.BoolProperty(default=False)
     variable_selected_index: bpy.props.IntProperty()
     variable_selected_index_prefs: bpy.props.IntProperty()
+    show_variable_uses: bpy.props.BoolProperty(name="Where Used", default=False)
+    profile_entries: bpy.props.CollectionProperty(type=ProfileEntry)
+    profile_selected_index: bpy.props.IntProperty()
+    search_query: bpy.props.StringProperty(
+        name="Search",
+        description="Find annotations whose descriptions or formulas contain these words (or the starts of them)",
+        options={"TEXTEDIT_UPDATE"}
+    )
 
 
 WM_PROPS: dict[str, tuple[bpy.types.AnyType, dict[str, any]]] = {
     "tell_me_why_globals": (bpy.props.PointerProperty, {"type": TellMeWhyGlobals}),
 }
 
-REGISTER_CLASSES = [SocketState, TellMeWhyGlobals]
+REGISTER_CLASSES = [SocketState, ProfileEntry, TellMeWhyGlobals]
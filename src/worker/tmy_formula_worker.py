@@ -0,0 +1,53 @@
+"""
+Formula evaluation for worker processes. Worker processes can't import bpy, so they can't import the addon package
+either. This module is imported as a top-level module (its directory is added to sys.path), and loads the addon's
+bpy-free formula engine (core/formula) under a stand-in package that skips the addon's __init__.py.
+"""
+
+import importlib
+import sys
+import types
+
+_PACKAGE = "_tmy_worker_addon"
+
+_formula = None
+_variables = {}
+
+
+def load_core(addon_path: str) -> types.ModuleType:
+    """Import core.formula from the addon at addon_path, without importing the addon itself"""
+    if _PACKAGE not in sys.modules:
+        package = types.ModuleType(_PACKAGE)
+        package.__path__ = [addon_path]
+        sys.modules[_PACKAGE] = package
+    return importlib.import_module(f"{_PACKAGE}.core.formula")
+
+
+def load(addon_path: str) -> None:
+    """Set up the formula engine, for workers given their variables with each formula (see evaluate_one)"""
+    global _formula
+    _formula = load_core(addon_path)
+
+
+def initialize(addon_path: str, variables: dict, frame: float, fps: float) -> None:
+    """Set up the formula engine with the main process's variables and time. Called once as each worker starts."""
+    global _variables
+    load(addon_path)
+    _formula.set_time(frame, fps)
+    _variables = variables
+
+
+def evaluate(formulas: list[str]) -> list[tuple[bool, any]]:
+    """Evaluate a batch of formulas, returning (True, result) or (False, error message) for each. Parts the formulas
+    share are only evaluated once."""
+    return _formula.eval_uncached_batch(formulas, _variables)
+
+
+def evaluate_one(formula: str, variables: dict, budget: float) -> tuple[bool, any]:
+    """Evaluate a formula with the variables (including the time names), giving up after budget seconds unless it's
+    stuck in a long function call. Returns (True, result) or (False, error message), since the addon's exceptions can't
+    be unpickled in the main process."""
+    try:
+        return True, _formula.eval_uncached(formula, variables, budget=budget)
+    except _formula.FormulaExecutionException as e:
+        return False, str(e)
@@ -0,0 +1,27 @@
+"""
+Tests run under plain CPython, with the stand-in bpy from benchmarks/fake_bpy, so lib modules can be imported too.
+
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "benchmarks"))
+
+import fake_bpy  # noqa: E402
+
+_bpy = fake_bpy.install()
+_addon = fake_bpy.load_addon(_bpy)
+
+
+@pytest.fixture(scope="session")
+def bpy():
+    return _bpy
+
+
+@pytest.fixture(scope="session")
+def addon():
+    return _addon
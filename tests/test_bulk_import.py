@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def bulk_import(addon):
+    return addon.lib.bulk_import
+
+
+@pytest.fixture
+def node(bpy):
+    import fake_bpy
+
+    tree = fake_bpy.NodeTree("Import Test")
+    bpy.data.node_groups.append(tree)
+    yield tree.add_node("Node")
+    bpy.data.node_groups.remove(tree)
+
+
+def _import(bulk_import, tmp_path, annotations):
+    path = tmp_path / "annotations.jsonl"
+    path.write_text("\n".join(json.dumps(annotation) for annotation in annotations), encoding="utf-8")
+    return bulk_import.import_annotations(str(path))
+
+
+def _annotation(**kwargs):
+    return {"owner": "Import Test", "node": "Node", "socket": "Vector"} | kwargs
+
+
+def test_split_components(bulk_import, node, tmp_path):
+    socket = node.add_input("Vector", "VECTOR", [0.0, 0.0, 0.0])
+    result = _import(bulk_import, tmp_path, [_annotation(description="Offset", components=[
+        {"use_formula": True, "formula": "1", "description": "X"}, {}, {"use_formula": True, "formula": "3"}, {}])])
+    assert (result.imported, result.unmatched) == (1, [])
+    explanation = socket.tmy_explanation
+    assert explanation.active and explanation.description == "Offset"
+    assert [(c.use_formula, c.formula, c.description, c.type) for c in explanation.components] \
+        == [(True, "1", "X", "float"), (False, "", "", "float"), (True, "3", "", "float")]
+
+
+def test_unsplit_components_use_only_the_first(addon, bulk_import, node, tmp_path):
+    socket = node.add_input("Vector", "VECTOR", [0.0, 0.0, 0.0])
+    _import(bulk_import, tmp_path, [_annotation(split_components=False, components=[
+        {"use_formula": True, "formula": "(1, 2, 3)"}, {"use_formula": True, "formula": "1", "description": "Y"}])])
+    assert [(c.use_formula, c.formula, c.description) for c in socket.tmy_explanation.components] \
+        == [(True, "(1, 2, 3)", ""), (False, "", ""), (False, "", "")]
+    # As Apply All checks each component with a formula
+    evaluation = addon.lib.evaluation.Evaluation(socket)
+    for index, component in enumerate(socket.tmy_explanation.components):
+        if component.use_formula:
+            assert not evaluation.is_error(index)
+    assert evaluation.get_results() == (1.0, 2.0, 3.0)
+
+
+def test_unmatched_annotations(bulk_import, node, tmp_path):
+    node.add_input("Vector", "VECTOR", [0.0, 0.0, 0.0])
+    result = _import(bulk_import, tmp_path, [_annotation(node="Missing"), {"owner": "Import Test"},
+                                             _annotation(components={}), _annotation()])
+    assert result.imported == 1
+    assert [reason for _, reason in result.unmatched] \
+        == [result.unmatched[0][1], "missing node, socket", "components must be a list of objects"]
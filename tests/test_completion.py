@@ -0,0 +1,71 @@
+import pytest
+
+NAMES = ["sin", "sinh", "sqrt", "sum", "scale", "scale_x", "Scale", "frame", "time"]
+
+
+@pytest.fixture
+def completion(addon):
+    return addon.core.completion
+
+
+@pytest.fixture
+def trie(completion):
+    return completion.NameTrie(NAMES)
+
+
+def test_names_are_added_once(completion, trie):
+    assert len(trie) == len(NAMES)
+    trie.add("sin")
+    assert len(trie) == len(NAMES)
+    assert "sinh" in trie and "si" not in trie and "cos" not in trie
+
+
+def test_with_prefix_is_alphabetical(trie):
+    assert trie.with_prefix("s") == ["scale", "scale_x", "sin", "sinh", "sqrt", "sum"]
+    assert trie.with_prefix("sin") == ["sin", "sinh"]
+    assert trie.with_prefix("S") == ["Scale"]
+    assert trie.with_prefix("cos") == []
+    assert trie.with_prefix("") == sorted(NAMES)
+
+
+def test_with_prefix_limit(trie):
+    assert trie.with_prefix("s", limit=2) == ["scale", "scale_x"]
+
+
+def test_close_matches(trie):
+    assert trie.close_matches("sqr", max_distance=1) == ["sqrt"]
+    assert trie.close_matches("sqr") == ["sqrt", "sin", "sum"]
+    assert trie.close_matches("scael", max_distance=2)[0] == "scale"
+    assert trie.close_matches("frame", max_distance=0) == ["frame"]
+    assert trie.close_matches("xyzzy") == []
+
+
+def test_close_matches_agrees_with_edit_distance(completion):
+    def distance(a, b):
+        row = list(range(len(b) + 1))
+        for i, char in enumerate(a, 1):
+            previous, row[0] = row[0], i
+            for j in range(1, len(b) + 1):
+                previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+        return row[-1]
+
+    names = ["alpha", "alpine", "alp", "beta", "bet", "gamma", "gam", "a", "ab", "abc", "al_pha"]
+    trie = completion.NameTrie(names)
+    for word in ["alpha", "alhpa", "bta", "gama", "", "x", "abcd", "alpha_"]:
+        for max_distance in range(4):
+            expected = {name for name in names if distance(word, name) <= max_distance}
+            assert set(trie.close_matches(word, max_distance, limit=len(names))) == expected, (word, max_distance)
+
+
+def test_did_you_mean(completion, trie):
+    assert completion.did_you_mean("sqr", trie) == "Did you mean \"sqrt\"?"
+    # Names differing only in case come first
+    assert completion.did_you_mean("Sqrt", completion.NameTrie(["Sort", "sqrt"])) == "Did you mean \"sqrt\" or \"Sort\"?"
+    assert completion.did_you_mean("xyzzy", trie) == ""
+
+
+def test_trie_cache_rebuilds_on_change(completion):
+    cache = completion.TrieCache()
+    first = cache.get(["a", "b"])
+    assert cache.get(["a", "b"]) is first
+    assert "c" in cache.get(["a", "b", "c"])
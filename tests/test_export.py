@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def export(addon):
+    return addon.lib.export
+
+
+@pytest.fixture
+def node(bpy):
+    import fake_bpy
+
+    tree = fake_bpy.NodeTree("Export Test")
+    bpy.data.node_groups.append(tree)
+    yield tree.add_node("Node")
+    bpy.data.node_groups.remove(tree)
+
+
+def _annotate(socket, description="", formulas=()):
+    """Annotate the socket as Create Explanation does, with a component per value, using the formulas in order"""
+    explanation = socket.tmy_explanation
+    explanation.active = True
+    explanation.description = description
+    if socket.type == "SHADER":
+        del socket.default_value
+        return socket
+    for index in range(len(socket.default_value) if isinstance(socket.default_value, list) else 1):
+        component = explanation.components.add()
+        component.use_formula = index < len(formulas)
+        component.formula = formulas[index] if component.use_formula else ""
+    return socket
+
+
+def _records(export):
+    return [export.socket_record(locator, socket) for locator, socket in export.node_lib.iter_annotated_sockets()]
+
+
+def test_formula_results(export, node):
+    _annotate(node.add_input("Value", default_value=2.0), formulas=["1 + 1"])
+    _annotate(node.add_input("Wrong", default_value=1.0), formulas=["3"])
+    records = _records(export)
+    assert [record["value"] for record in records] == [[2.0], [1.0]]
+    assert [(c["result"], c["status"]) for record in records for c in record["components"]] \
+        == [([2.0], "match"), ([3.0], "mismatch")]
+
+
+def test_socket_without_value(export, node):
+    _annotate(node.add_input("Shader", type="SHADER"), description="Surface")
+    record, = _records(export)
+    assert (record["value"], record["description"], record["components"]) == (None, "Surface", [])
+
+
+def test_datablock_socket(export, node):
+    import fake_bpy
+
+    _annotate(node.add_input("Object", type="OBJECT", default_value=fake_bpy.ID("Cube")), description="Target")
+    _annotate(node.add_input("Empty", type="OBJECT", default_value=None), description="Nothing")
+    _annotate(node.add_input("Named", type="OBJECT", default_value=fake_bpy.ID("Cube")), formulas=["'Cube'"])
+    records = _records(export)
+    assert [record["value"] for record in records] == [["Cube"], [None], ["Cube"]]
+    assert [c["status"] for record in records for c in record["components"]] == ["value", "value", "match"]
+
+
+@pytest.mark.parametrize("file_format", ["JSONL", "CSV", "MARKDOWN"])
+def test_export_every_kind_of_socket(export, node, tmp_path, file_format):
+    import fake_bpy
+
+    _annotate(node.add_input("Value", default_value=2.0), description="Two", formulas=["1 + 1"])
+    _annotate(node.add_input("Shader", type="SHADER"), description="Surface")
+    _annotate(node.add_input("Object", type="OBJECT", default_value=fake_bpy.ID("Cube")), description="Target")
+    path = tmp_path / f"report{export.FORMATS[file_format][1]}"
+    assert export.export(str(path), file_format) == 3
+
+    text = path.read_text(encoding="utf-8")
+    if file_format == "JSONL":
+        assert [json.loads(line)["value"] for line in text.splitlines()] == [[2.0], None, ["Cube"]]
+    elif file_format == "CSV":
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert [(row["socket"], row["value"], row["status"]) for row in rows] \
+            == [("Value", "2.0", "match"), ("Object", "Cube", "value")]
+    else:
+        assert "| Object | Target | Cube |" in text
@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.parametrize("text", [
+    "pow(x, 2)", "x ** k", "x ** -0.5", "pow(x, k, 7)", "sum(range(4))", "prod((1, 2, 3))", "factorial(5)",
+    "comb(10, 3)",
+])
+def test_everyday_formulas_use_the_inline_budget(addon, text):
+    assert not addon.core.formula.may_block(text)
+
+
+@pytest.mark.parametrize("text", [
+    "factorial(n)", "factorial(5000)", "comb(n, 2)", "range(n)", "sum(range(10 ** 6))", "10 ** 10000000",
+    "pow(10, 4000000)", "pow(10, pow(10, 7))", "x ** (k + 5000)",
+])
+def test_formulas_that_may_block(addon, text):
+    assert addon.core.formula.may_block(text)
@@ -0,0 +1,119 @@
+import random
+import re
+
+import pytest
+
+VARIABLES = {"a": 2.0, "c": (1.0, 2.0, 3.0), "d": (1.0, 2.0), "s": 5, "one": (4.0,), "name": "x"}
+
+
+@pytest.fixture
+def formula(addon):
+    # Inferred shapes are cached until the variables change
+    addon.core.formula.reset_variable_cache({})
+    return addon.core.formula
+
+
+@pytest.fixture
+def shape(addon):
+    return addon.core.shape
+
+
+@pytest.mark.parametrize("text, kind, length, vector", [
+    ("a + 1", "number", None, False),
+    ("c * 2", "number", 3, True),
+    ("c + a", "number", 3, True),
+    ("c[0]", "number", None, True),
+    ("dot(c, c)", "number", None, False),
+    ("cross(c, c)", "number", 3, True),
+    ("lerp(c, c, 0.5)", "number", 3, True),
+    ("vec(1, 2)", "number", 2, True),
+    ("(1, 2) + (3,)", "number", 3, False),
+    ("name + 'y'", "text", None, False),
+    ("frame", "number", None, False),
+])
+def test_known_shapes(formula, text, kind, length, vector):
+    inferred = formula.infer_shape(text, VARIABLES)
+    assert (inferred.kind, inferred.length, inferred.vector) == (kind, length, vector)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("c + d", "Can't combine vectors of length 3 and 2"),
+    ("sqrt(c)", "sqrt() takes numbers, not a vector of length 3"),
+    ("name + 1", "Can't combine text and a number"),
+    ("nope + 1", "Unknown name \"nope\""),
+    ("sqr(a)", "Unknown function \"sqr\". Did you mean \"sqrt\"?"),
+])
+def test_certain_failures_are_rejected(formula, text, message):
+    with pytest.raises(formula.FormulaShapeException, match=re.escape(message)):
+        formula.infer_shape(text, VARIABLES)
+
+
+def test_unsure_shapes_are_unknown(formula):
+    assert formula.infer_shape("cross(d, d)", VARIABLES) is None
+
+
+def test_shape_follows_variables(formula):
+    assert formula.infer_shape("c * 2", VARIABLES).length == 3
+    formula.reset_variable_cache({"c": "(1, 2)"})
+    assert formula.infer_shape("c * 2", VARIABLES | {"c": (1.0, 2.0)}).length == 2
+
+
+_ATOMS = ["a", "c", "d", "s", "one", "1", "2.5", "'t'", "(1,2)", "(1,2,3)", "pi", "frame", "[x*2 for x in c]",
+          "vec(1,2,3)", "True"]
+_FUNCTIONS = ["sin", "abs", "round", "max", "min", "sum", "dot", "cross", "normalize", "lerp", "clamp", "vec", "pow",
+              "divmod", "frexp", "sqrt", "hypot", "fsum", "dist", "floor"]
+
+
+def _random_formula(rng: random.Random, depth: int = 0) -> str:
+    r = rng.random()
+    if depth > 3 or r < 0.3:
+        return rng.choice(_ATOMS)
+    if r < 0.55:
+        operator = rng.choice(["+", "-", "*", "/", "**", "%", "//"])
+        return f"({_random_formula(rng, depth + 1)} {operator} {_random_formula(rng, depth + 1)})"
+    if r < 0.6:
+        return f"-{_random_formula(rng, depth + 1)}"
+    if r < 0.65:
+        return f"{_random_formula(rng, depth + 1)}[{rng.choice(['0', '1', '2', '-1', '5'])}]"
+    if r < 0.7:
+        parts = (_random_formula(rng, depth + 1) for _ in range(3))
+        return "({} if {} else {})".format(*parts)
+    if r < 0.75:
+        return f"({_random_formula(rng, depth + 1)} < {_random_formula(rng, depth + 1)})"
+    args = ", ".join(_random_formula(rng, depth + 1) for _ in range(rng.choice([1, 1, 2, 2, 3])))
+    return f"{rng.choice(_FUNCTIONS)}({args})"
+
+
+def _matches(value: any, inferred, shape) -> bool:
+    numeric = (int, float, bool, complex)
+    is_sequence = hasattr(value, "__len__") and type(value) is not str
+    if inferred.is_scalar:
+        if is_sequence:
+            return False
+        if inferred.kind == shape.TEXT:
+            return type(value) is str
+        return inferred.kind != shape.NUMBER or type(value) in numeric
+    if not is_sequence or len(value) != inferred.length:
+        return False
+    return inferred.kind != shape.NUMBER or all(type(v) in numeric for v in value)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_inference_agrees_with_evaluation(formula, shape, seed):
+    """Random formulas are never rejected if they evaluate, and known shapes match the evaluated result"""
+    rng = random.Random(seed)
+    for _ in range(2000):
+        text = _random_formula(rng)
+        try:
+            inferred = formula.infer_shape(text, VARIABLES)
+            rejected = None
+        except formula.FormulaShapeException as e:
+            inferred, rejected = None, e
+        try:
+            value = formula.vector.to_plain(formula._do_eval(text, VARIABLES))
+        except Exception:
+            # Failures the analysis didn't predict are left to evaluation, which is fine
+            continue
+        assert rejected is None, f"{text} gave {value!r} but was rejected: {rejected}"
+        if inferred is not None:
+            assert _matches(value, inferred, shape), f"{text} gave {value!r}, not {inferred}"
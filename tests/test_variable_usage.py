@@ -0,0 +1,52 @@
+import pytest
+
+
+@pytest.fixture
+def variable_usage(addon):
+    return addon.lib.variable_usage
+
+
+def test_name_spans(variable_usage):
+    assert variable_usage.name_spans("a + ab * sin(a)") == {"a": [(1, 0, 1), (1, 13, 14)], "ab": [(1, 4, 6)],
+                                                            "sin": [(1, 9, 12)]}
+
+
+def test_name_spans_skip_comprehension_variables(variable_usage):
+    spans = variable_usage.name_spans("a + [a * b for a in c if a] + 'a'")
+    assert spans == {"a": [(1, 0, 1)], "b": [(1, 9, 10)], "c": [(1, 20, 21)]}
+
+
+def test_name_spans_of_invalid_formula(variable_usage):
+    assert variable_usage.name_spans("a +") == {}
+
+
+@pytest.mark.parametrize("formula, renamed", [
+    ("a", "b"),
+    ("  a+ a_2 * 'a' + a.real ", "  b+ a_2 * 'a' + b.real "),
+    ("\"é\" + a", "\"é\" + b"),
+    ("(a +\n a)", "(b +\n b)"),
+    ("[x * a for x in a]", "[x * b for x in b]"),
+    ("a + [b for b in c]", "b + [b for b in c]"),
+    ("x + 1", "x + 1"),
+])
+def test_rename_in_formula(variable_usage, formula, renamed):
+    assert variable_usage.rename_in_formula(formula, "a", "b") == renamed
+
+
+@pytest.mark.parametrize("formula", ["a + b", "[a for b in c]", "[a + b for b in a]"])
+def test_rename_refuses_to_capture(variable_usage, formula):
+    with pytest.raises(variable_usage.NameCaptureException):
+        variable_usage.rename_in_formula(formula, "a", "b")
+
+
+@pytest.mark.parametrize("name, valid", [
+    ("speed", "speed"),
+    ("top speed", "top_speed"),
+    ("2x", "_2x"),
+    ("for", "for_"),
+    ("lambda", "lambda_"),
+    ("None", "None_"),
+    ("format", "format"),
+])
+def test_valid_name(addon, name, valid):
+    assert addon.props.variable.valid_name(name) == valid
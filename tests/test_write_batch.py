@@ -0,0 +1,68 @@
+import pytest
+
+
+class _ReadOnlySocket:
+    def __init__(self, socket):
+        self._socket = socket
+        self.id_data = socket.id_data
+
+    def as_pointer(self):
+        return self._socket.as_pointer()
+
+    @property
+    def default_value(self):
+        return self._socket.default_value
+
+    @default_value.setter
+    def default_value(self, value):
+        raise AttributeError("read-only")
+
+
+@pytest.fixture
+def write_batch(addon):
+    return addon.lib.write_batch
+
+
+@pytest.fixture
+def sockets(bpy):
+    import fake_bpy
+
+    trees = [fake_bpy.NodeTree("First"), fake_bpy.NodeTree("Second")]
+    return [tree.add_node(f"Node {i}").add_input("Value") for tree in trees for i in range(2)]
+
+
+def test_unchanged_values_are_skipped(write_batch, sockets):
+    batch = write_batch.SocketWriteBatch()
+    assert not batch.set(sockets[0], 0.0)
+    # Compared at the precision floats are stored with
+    sockets[1].default_value = 0.10000000149011612
+    assert not batch.set(sockets[1], 0.1)
+    assert len(batch) == 0
+    assert batch.commit() == (0, 0)
+
+
+def test_one_write_per_socket(write_batch, sockets):
+    batch = write_batch.SocketWriteBatch()
+    for socket in sockets:
+        assert batch.set(socket, 1.0)
+    assert batch.set(sockets[0], 2.0)
+    assert len(batch) == len(sockets)
+    assert batch.commit() == (len(sockets), 0)
+    assert [socket.default_value for socket in sockets] == [2.0, 1.0, 1.0, 1.0]
+    assert len(batch) == 0
+
+
+def test_setting_back_to_stored_value_drops_queued_write(write_batch, sockets):
+    batch = write_batch.SocketWriteBatch()
+    batch.set(sockets[0], 1.0)
+    assert not batch.set(sockets[0], 0.0)
+    assert batch.commit() == (0, 0)
+    assert sockets[0].default_value == 0.0
+
+
+def test_failed_writes_are_counted(write_batch, sockets):
+    batch = write_batch.SocketWriteBatch()
+    batch.set(_ReadOnlySocket(sockets[0]), 1.0)
+    batch.set(sockets[1], 1.0)
+    assert batch.commit() == (1, 1)
+    assert sockets[1].default_value == 1.0